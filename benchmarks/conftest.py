@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from functools import cache
+from typing import TYPE_CHECKING
+
+import pytest
+
+import ilpy
+from ilpy.solver_backends import create_solver_backend
+
+from .models import MODELS
+
+if TYPE_CHECKING:
+    from .models import SyntheticModel
+
+
+@cache
+def _backend_error(preference: ilpy.Preference) -> str | None:
+    try:
+        create_solver_backend(preference)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+BACKENDS = [
+    pytest.param(ilpy.Preference.Scip, id="scip"),
+    pytest.param(ilpy.Preference.Gurobi, id="gurobi"),
+    pytest.param(ilpy.Preference.GurobiRestricted, id="gurobi-restricted"),
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def preference(request: pytest.FixtureRequest) -> ilpy.Preference:
+    """Every backend that can be created in this environment."""
+    pref: ilpy.Preference = request.param
+    if (error := _backend_error(pref)) is not None:
+        pytest.skip(f"{pref.name} unavailable: {error}")
+    return pref
+
+
+@cache
+def _model(name: str) -> SyntheticModel:
+    return MODELS[name]()
+
+
+@pytest.fixture(params=sorted(MODELS))
+def model(request: pytest.FixtureRequest) -> SyntheticModel:
+    """Every synthetic model, generated once per session."""
+    return _model(request.param)
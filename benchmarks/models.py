@@ -0,0 +1,220 @@
+"""Synthetic models used by the benchmark suite.
+
+Each generator returns a `SyntheticModel`, a backend-neutral description of a
+problem that the benchmarks can turn into `ilpy.Constraint` objects,
+`ilpy.Expression` objects, or load into a `Solver`.  All generators are seeded
+so that repeated runs (and runs on different machines) benchmark the same
+models.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+import ilpy
+from ilpy.expressions import Expression, Variable
+
+Row = tuple[dict[int, float], ilpy.Relation, float]
+
+
+class SyntheticModel(NamedTuple):
+    name: str
+    num_variables: int
+    variable_type: ilpy.VariableType
+    objective: ilpy.Objective
+    rows: list[Row]
+
+    @property
+    def nnz(self) -> int:
+        return sum(len(coefs) for coefs, _, _ in self.rows)
+
+    def variables(self) -> list[Variable]:
+        return [Variable(f"x{i}", index=i) for i in range(self.num_variables)]
+
+    def constraints(self) -> list[ilpy.Constraint]:
+        return [
+            ilpy.Constraint.from_coefficients(coefs, relation=rel, value=value)
+            for coefs, rel, value in self.rows
+        ]
+
+    def expressions(self) -> list[Expression]:
+        x = self.variables()
+        exprs: list[Expression] = []
+        for coefs, rel, value in self.rows:
+            lhs = sum(coef * x[i] for i, coef in coefs.items())
+            if rel == ilpy.Relation.LessEqual:
+                exprs.append(lhs <= value)
+            elif rel == ilpy.Relation.GreaterEqual:
+                exprs.append(lhs >= value)
+            else:
+                exprs.append(lhs == value)
+        return exprs
+
+    def solver(self, preference: ilpy.Preference) -> ilpy.Solver:
+        solver = ilpy.Solver(
+            self.num_variables, self.variable_type, preference=preference
+        )
+        solver.set_objective(self.objective)
+        for constraint in self.constraints():
+            solver.add_constraint(constraint)
+        return solver
+
+
+def dense_lp(num_variables: int, num_rows: int, seed: int = 0) -> SyntheticModel:
+    """A dense covering LP: every row touches every variable."""
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(0.5, 2.0, size=(num_rows, num_variables))
+    b = rng.uniform(1.0, 10.0, size=num_rows)
+    c = rng.uniform(1.0, 5.0, size=num_variables)
+    rows: list[Row] = [
+        (dict(enumerate(A[r].tolist())), ilpy.Relation.GreaterEqual, float(b[r]))
+        for r in range(num_rows)
+    ]
+    # keep the LP bounded (ilpy variables are free by default)
+    rows += [({i: 1.0}, ilpy.Relation.GreaterEqual, 0.0) for i in range(num_variables)]
+    return SyntheticModel(
+        f"dense_lp-{num_variables}x{num_rows}",
+        num_variables,
+        ilpy.VariableType.Continuous,
+        ilpy.Objective.from_coefficients(c.tolist()),
+        rows,
+    )
+
+
+def sparse_lp(
+    num_variables: int, num_rows: int, row_nnz: int = 5, seed: int = 0
+) -> SyntheticModel:
+    """A sparse covering LP with `row_nnz` nonzeros per row."""
+    rng = np.random.default_rng(seed)
+    rows: list[Row] = []
+    for _ in range(num_rows):
+        idx = rng.choice(num_variables, size=row_nnz, replace=False)
+        coefs = rng.uniform(0.5, 2.0, size=row_nnz)
+        rows.append(
+            (
+                dict(zip(idx.tolist(), coefs.tolist())),
+                ilpy.Relation.GreaterEqual,
+                float(rng.uniform(1.0, 10.0)),
+            )
+        )
+    rows += [({i: 1.0}, ilpy.Relation.GreaterEqual, 0.0) for i in range(num_variables)]
+    c = rng.uniform(1.0, 5.0, size=num_variables)
+    return SyntheticModel(
+        f"sparse_lp-{num_variables}x{num_rows}",
+        num_variables,
+        ilpy.VariableType.Continuous,
+        ilpy.Objective.from_coefficients(c.tolist()),
+        rows,
+    )
+
+
+def set_partitioning(
+    num_elements: int, num_subsets: int, subset_size: int = 4, seed: int = 0
+) -> SyntheticModel:
+    """A set-partitioning ILP that is feasible by construction.
+
+    The elements are first split into disjoint "planted" subsets (guaranteeing
+    a feasible partition), and the remaining subsets are drawn at random.
+    """
+    rng = np.random.default_rng(seed)
+    perm = rng.permutation(num_elements)
+    subsets = [perm[i : i + subset_size] for i in range(0, num_elements, subset_size)]
+    while len(subsets) < num_subsets:
+        subsets.append(rng.choice(num_elements, size=subset_size, replace=False))
+    members: list[dict[int, float]] = [{} for _ in range(num_elements)]
+    for j, subset in enumerate(subsets):
+        for e in subset.tolist():
+            members[e][j] = 1.0
+    rows: list[Row] = [(m, ilpy.Relation.Equal, 1.0) for m in members]
+    c = rng.uniform(1.0, 10.0, size=len(subsets))
+    return SyntheticModel(
+        f"set_partitioning-{num_elements}x{len(subsets)}",
+        len(subsets),
+        ilpy.VariableType.Binary,
+        ilpy.Objective.from_coefficients(c.tolist()),
+        rows,
+    )
+
+
+def quadratic(num_variables: int, seed: int = 0) -> SyntheticModel:
+    """A convex separable QP: minimize sum((x_i - t_i)^2) over a simplex."""
+    rng = np.random.default_rng(seed)
+    target = rng.uniform(-1.0, 1.0, size=num_variables)
+    obj = ilpy.Objective.from_coefficients(
+        coefficients=(-2 * target).tolist(),
+        quadratic_coefficients={(i, i): 1.0 for i in range(num_variables)},
+        constant=float(target @ target),
+    )
+    rows: list[Row] = [
+        (dict.fromkeys(range(num_variables), 1.0), ilpy.Relation.Equal, 1.0)
+    ]
+    rows += [({i: 1.0}, ilpy.Relation.GreaterEqual, 0.0) for i in range(num_variables)]
+    return SyntheticModel(
+        f"quadratic-{num_variables}",
+        num_variables,
+        ilpy.VariableType.Continuous,
+        obj,
+        rows,
+    )
+
+
+def tracking_graph(
+    num_frames: int, nodes_per_frame: int, max_edges: int = 3, seed: int = 0
+) -> SyntheticModel:
+    """A motile-like tracking model on a random candidate graph.
+
+    There is one binary variable per node and one per edge (connecting nodes
+    in consecutive frames).  Edges may only be selected if both endpoints are,
+    each node has at most one incoming edge and at most two outgoing edges
+    (divisions).  Costs favour selecting nodes and edges.
+    """
+    rng = np.random.default_rng(seed)
+    num_nodes = num_frames * nodes_per_frame
+    edges: list[tuple[int, int]] = []
+    for t in range(num_frames - 1):
+        for n in range(nodes_per_frame):
+            u = t * nodes_per_frame + n
+            k = int(rng.integers(1, max_edges + 1))
+            targets = rng.choice(nodes_per_frame, size=k, replace=False)
+            edges.extend((u, (t + 1) * nodes_per_frame + int(v)) for v in targets)
+
+    num_variables = num_nodes + len(edges)
+    costs = np.concatenate(
+        [rng.uniform(-2.0, 0.5, size=num_nodes), rng.uniform(-1.0, 1.0, len(edges))]
+    )
+    incoming: list[dict[int, float]] = [{} for _ in range(num_nodes)]
+    outgoing: list[dict[int, float]] = [{} for _ in range(num_nodes)]
+    rows: list[Row] = []
+    for e, (u, v) in enumerate(edges):
+        ei = num_nodes + e
+        outgoing[u][ei] = 1.0
+        incoming[v][ei] = 1.0
+        # edge => both endpoints
+        rows.append(({ei: 1.0, u: -1.0}, ilpy.Relation.LessEqual, 0.0))
+        rows.append(({ei: 1.0, v: -1.0}, ilpy.Relation.LessEqual, 0.0))
+    for n in range(num_nodes):
+        if incoming[n]:
+            rows.append(({**incoming[n], n: -1.0}, ilpy.Relation.LessEqual, 0.0))
+        if outgoing[n]:
+            rows.append(({**outgoing[n], n: -2.0}, ilpy.Relation.LessEqual, 0.0))
+    return SyntheticModel(
+        f"tracking-{num_frames}x{nodes_per_frame}",
+        num_variables,
+        ilpy.VariableType.Binary,
+        ilpy.Objective.from_coefficients(costs.tolist()),
+        rows,
+    )
+
+
+# Sizes are kept below the limits of the size-restricted Gurobi license that
+# ships with the gurobipy wheel (2000 variables, 2000 linear constraints, 200
+# variables for quadratic models), so that every backend can run every model.
+MODELS = {
+    "dense_lp": lambda: dense_lp(200, 100),
+    "sparse_lp": lambda: sparse_lp(800, 800),
+    "set_partitioning": lambda: set_partitioning(120, 240),
+    "quadratic": lambda: quadratic(150),
+    "tracking": lambda: tracking_graph(12, 20),
+}
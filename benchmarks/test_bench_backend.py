@@ -0,0 +1,117 @@
+"""Transfer of ilpy components into each native backend."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+import ilpy
+from ilpy.solver_backends import create_solver_backend
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+    from ilpy.solver_backends import SolverBackend
+
+    from .models import SyntheticModel
+
+ROUNDS = 5
+
+
+def _fresh_backend(model: SyntheticModel, preference: ilpy.Preference) -> SolverBackend:
+    backend = create_solver_backend(preference)
+    backend.initialize(model.num_variables, model.variable_type, {})
+    return backend
+
+
+def test_backend_add_constraint(
+    benchmark: BenchmarkFixture, model: SyntheticModel, preference: ilpy.Preference
+) -> None:
+    constraints = model.constraints()
+    benchmark.extra_info["rows"] = len(constraints)
+    benchmark.extra_info["nnz"] = model.nnz
+
+    def setup() -> tuple[tuple[SolverBackend], dict]:
+        return (_fresh_backend(model, preference),), {}
+
+    def transfer(backend: SolverBackend) -> None:
+        for constraint in constraints:
+            backend.add_constraint(constraint)
+
+    benchmark.pedantic(transfer, setup=setup, rounds=ROUNDS)
+
+
+def test_backend_add_constraint_block(
+    benchmark: BenchmarkFixture, model: SyntheticModel, preference: ilpy.Preference
+) -> None:
+    constraints = ilpy.Constraints()
+    for constraint in model.constraints():
+        constraints.add(constraint)
+    block = constraints.to_block()
+    benchmark.extra_info["rows"] = len(block)
+    benchmark.extra_info["nnz"] = block.nnz
+
+    def setup() -> tuple[tuple[SolverBackend], dict]:
+        return (_fresh_backend(model, preference),), {}
+
+    def transfer(backend: SolverBackend) -> None:
+        backend.add_constraint_block(block)
+
+    benchmark.pedantic(transfer, setup=setup, rounds=ROUNDS)
+
+
+def test_backend_set_objective(
+    benchmark: BenchmarkFixture, model: SyntheticModel, preference: ilpy.Preference
+) -> None:
+    def setup() -> tuple[tuple[SolverBackend], dict]:
+        return (_fresh_backend(model, preference),), {}
+
+    def transfer(backend: SolverBackend) -> None:
+        backend.set_objective(model.objective)
+
+    benchmark.pedantic(transfer, setup=setup, rounds=ROUNDS)
+
+
+def test_backend_set_variable_bounds(
+    benchmark: BenchmarkFixture, model: SyntheticModel, preference: ilpy.Preference
+) -> None:
+    """Bounds on every variable, set in one call instead of as 2n rows."""
+    indices = np.arange(model.num_variables)
+    lower, upper = np.zeros(model.num_variables), np.ones(model.num_variables)
+    benchmark.extra_info["columns"] = model.num_variables
+
+    def setup() -> tuple[tuple[SolverBackend], dict]:
+        return (_fresh_backend(model, preference),), {}
+
+    def transfer(backend: SolverBackend) -> None:
+        backend.set_variable_bounds(indices, lower, upper)
+
+    benchmark.pedantic(transfer, setup=setup, rounds=ROUNDS)
+
+
+def test_backend_set_quadratic_objective(
+    benchmark: BenchmarkFixture, preference: ilpy.Preference
+) -> None:
+    """An objective with many (off-diagonal) quadratic terms."""
+    num_variables, num_terms = 1000, 50_000
+    rng = np.random.default_rng(0)
+    rows = rng.integers(num_variables, size=num_terms)
+    cols = rng.integers(num_variables, size=num_terms)
+    objective = ilpy.Objective.from_coefficients(
+        coefficients=rng.uniform(-1, 1, num_variables).tolist(),
+        quadratic_coefficients=dict(
+            zip(zip(rows.tolist(), cols.tolist()), rng.uniform(0, 1, num_terms))
+        ),
+    )
+    benchmark.extra_info["quadratic_nnz"] = len(objective.get_quadratic_coefficients())
+
+    def setup() -> tuple[tuple[SolverBackend], dict]:
+        backend = create_solver_backend(preference)
+        backend.initialize(num_variables, ilpy.Continuous, {})
+        return (backend,), {}
+
+    def transfer(backend: SolverBackend) -> None:
+        backend.set_objective(objective)
+
+    benchmark.pedantic(transfer, setup=setup, rounds=ROUNDS)
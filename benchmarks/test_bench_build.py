@@ -0,0 +1,181 @@
+"""Python-side model building: expressions and component objects."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+import ilpy
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+    from ilpy.expressions import Expression
+
+    from .models import SyntheticModel
+
+
+def test_expression_as_constraint(
+    benchmark: BenchmarkFixture, model: SyntheticModel
+) -> None:
+    expressions = model.expressions()
+    benchmark.extra_info["rows"] = len(expressions)
+    benchmark.extra_info["nnz"] = model.nnz
+    benchmark(lambda: [expr.as_constraint() for expr in expressions])
+
+
+def test_constraint_from_coefficients(
+    benchmark: BenchmarkFixture, model: SyntheticModel
+) -> None:
+    rows = model.rows
+    benchmark.extra_info["rows"] = len(rows)
+    benchmark.extra_info["nnz"] = model.nnz
+
+    def build() -> list[ilpy.Constraint]:
+        return [
+            ilpy.Constraint.from_coefficients(coefs, relation=rel, value=value)
+            for coefs, rel, value in rows
+        ]
+
+    benchmark(build)
+
+
+def test_objective_from_coefficients(
+    benchmark: BenchmarkFixture, model: SyntheticModel
+) -> None:
+    obj = model.objective
+    coefs = obj.get_coefficients()
+    quad = dict(obj.get_quadratic_coefficients())
+    benchmark(
+        ilpy.Objective.from_coefficients,
+        coefficients=coefs,
+        quadratic_coefficients=quad,
+        constant=obj.get_constant(),
+    )
+
+
+@pytest.mark.parametrize("builder", ["sum", "LinearExpression", "quicksum", "dot"])
+def test_objective_from_expression(
+    benchmark: BenchmarkFixture, model: SyntheticModel, builder: str
+) -> None:
+    x = model.variables()
+    coefs = model.objective.get_coefficients()
+    benchmark.extra_info["terms"] = len(coefs)
+
+    def build() -> ilpy.Objective:
+        expr: Expression
+        if builder == "sum":
+            expr = sum(c * x[i] for i, c in enumerate(coefs))  # type: ignore
+        elif builder == "LinearExpression":
+            expr = ilpy.LinearExpression()
+            for i, c in enumerate(coefs):
+                expr += c * x[i]
+        elif builder == "quicksum":
+            expr = ilpy.quicksum(c * x[i] for i, c in enumerate(coefs))
+        else:
+            expr = ilpy.dot(coefs, x)
+        return expr.as_objective()
+
+    benchmark(build)
+
+
+SHARED_TERMS = 1_000
+SHARED_CONSTRAINTS = 10_000
+
+
+def test_shared_subexpression_as_constraint(benchmark: BenchmarkFixture) -> None:
+    """A 1k-term subexpression reused in 10k constraints (e.g. a budget sum)."""
+    x = [ilpy.Variable(f"x{i}", index=i) for i in range(SHARED_TERMS)]
+    y = [
+        ilpy.Variable(f"y{k}", index=SHARED_TERMS + k)
+        for k in range(SHARED_CONSTRAINTS)
+    ]
+    benchmark.extra_info["rows"] = SHARED_CONSTRAINTS
+    benchmark.extra_info["nnz"] = SHARED_CONSTRAINTS * (SHARED_TERMS + 1)
+
+    def setup() -> tuple[tuple[Expression], dict]:
+        # a fresh tree for every round, so nothing is memoized up front
+        shared = sum((i % 7 + 1) * xi for i, xi in enumerate(x))
+        return (shared,), {}  # type: ignore
+
+    def build(shared: Expression) -> list[ilpy.Constraint]:
+        return [(shared + yk <= k).as_constraint() for k, yk in enumerate(y)]
+
+    benchmark.pedantic(build, setup=setup, rounds=3)
+
+
+TEMPLATE_ROWS = 100_000
+
+
+@pytest.mark.parametrize("builder", ["Expression", "ConstraintTemplate"])
+def test_edge_capacity_constraints(benchmark: BenchmarkFixture, builder: str) -> None:
+    """`x[i] + x[j] <= cap[k]` over many index pairs."""
+    rng = np.random.default_rng(0)
+    sources = rng.integers(0, 1_000, TEMPLATE_ROWS)
+    targets = rng.integers(0, 1_000, TEMPLATE_ROWS)
+    caps = rng.random(TEMPLATE_ROWS)
+    benchmark.extra_info["rows"] = TEMPLATE_ROWS
+
+    if builder == "Expression":
+        x = [ilpy.Variable(f"x{i}", index=i) for i in range(1_000)]
+
+        def build() -> object:
+            return [
+                (x[i] + x[j] <= c).as_constraint()
+                for i, j, c in zip(sources.tolist(), targets.tolist(), caps.tolist())
+            ]
+
+    else:
+        i, j, cap = ilpy.Variable("i"), ilpy.Variable("j"), ilpy.Parameter("cap")
+        template = ilpy.ConstraintTemplate(i + j <= cap)
+
+        def build() -> object:
+            return template.instantiate(i=sources, j=targets, cap=caps)
+
+    benchmark.pedantic(build, rounds=3)
+
+
+def test_deduplicate_exclusion_constraints(benchmark: BenchmarkFixture) -> None:
+    """Pairwise exclusions `x[i] + x[j] <= 1`, generated from both endpoints."""
+    rng = np.random.default_rng(0)
+    sources = rng.integers(0, 10_000, TEMPLATE_ROWS // 2)
+    targets = rng.integers(0, 10_000, TEMPLATE_ROWS // 2)
+    indices = np.stack(
+        [np.concatenate([sources, targets]), np.concatenate([targets, sources])],
+        axis=1,
+    ).ravel()
+    indptr = np.arange(0, len(indices) + 1, 2)
+    block = ilpy.ConstraintBlock(indptr, indices, np.ones(len(indices)), values=1.0)
+    benchmark.extra_info["rows"] = len(block)
+
+    _, stats = benchmark.pedantic(block.deduplicate, rounds=3)
+    benchmark.extra_info["removed"] = stats.removed_rows
+
+
+def test_analyze_and_scale(benchmark: BenchmarkFixture, model: SyntheticModel) -> None:
+    from ilpy._scaling import scaling_factors
+
+    constraints = ilpy.Constraints()
+    for constraint in model.constraints():
+        constraints.add(constraint)
+    block = constraints.to_block()
+    types = np.full(model.num_variables, model.variable_type, dtype=np.int8)
+    benchmark.extra_info["rows"] = len(block)
+    benchmark.extra_info["nnz"] = block.nnz
+
+    def analyze_and_scale() -> None:
+        ilpy.analyze_numerics(block, model.num_variables, model.objective)
+        scaling_factors(block, types)
+
+    benchmark(analyze_and_scale)
+
+
+def test_constraints_stats(benchmark: BenchmarkFixture, model: SyntheticModel) -> None:
+    constraints = ilpy.Constraints()
+    for constraint in model.constraints():
+        constraints.add(constraint)
+    constraints.add(constraints.to_block())
+    benchmark.extra_info["rows"] = len(constraints)
+    benchmark(constraints.stats)
@@ -0,0 +1,326 @@
+"""End-to-end solves, split into native solve time and ilpy overhead."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+import ilpy
+
+from .models import quadratic
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+    from .models import SyntheticModel
+
+ROUNDS = 3
+
+
+def test_solve_overhead(
+    benchmark: BenchmarkFixture, model: SyntheticModel, preference: ilpy.Preference
+) -> None:
+    """Time `Solver.solve()` and record how much of it is not native solve time.
+
+    The benchmark itself times the full call; `extra_info["overhead"]` stores
+    the mean of (wall time - `Solution.time`) across rounds, i.e. the time
+    spent in ilpy and in the Python bindings rather than in the solver, and
+    `extra_info["timings"]` the per-phase breakdown of the last round.
+    """
+    overheads: list[float] = []
+
+    def setup() -> tuple[tuple[ilpy.Solver], dict]:
+        return (model.solver(preference),), {}
+
+    def solve(solver: ilpy.Solver) -> ilpy.Solution:
+        t0 = time.perf_counter()
+        solution = solver.solve()
+        overheads.append(time.perf_counter() - t0 - solution.time)
+        return solution
+
+    solution = benchmark.pedantic(solve, setup=setup, rounds=ROUNDS)
+    benchmark.extra_info["status"] = solution.status.name
+    benchmark.extra_info["overhead"] = float(np.mean(overheads))
+    benchmark.extra_info["timings"] = asdict(solution.timings)
+
+
+def test_solution_extraction(
+    benchmark: BenchmarkFixture, model: SyntheticModel, preference: ilpy.Preference
+) -> None:
+    """Time converting a `Solution` into the array form most callers use.
+
+    The time the backend took to read the values out of the native model is
+    stored in `extra_info["native_extraction"]`.
+    """
+    solution = model.solver(preference).solve()
+    benchmark.extra_info["native_extraction"] = solution.timings.solution_extraction
+    benchmark(np.asarray, solution)
+
+
+def test_lazy_nonzero_extraction(
+    benchmark: BenchmarkFixture, model: SyntheticModel, preference: ilpy.Preference
+) -> None:
+    """Time reading only the nonzero values of a lazy solution."""
+    solver = model.solver(preference)
+
+    def setup() -> tuple[tuple[ilpy.Solution], dict]:
+        return (solver.solve(lazy=True),), {}
+
+    def extract(solution: ilpy.Solution) -> tuple[np.ndarray, np.ndarray]:
+        return solution.nonzero()
+
+    indices, _ = benchmark.pedantic(extract, setup=setup, rounds=ROUNDS)
+    benchmark.extra_info["nonzero"] = len(indices)
+
+
+def test_quadratic_objective_updates(
+    benchmark: BenchmarkFixture, preference: ilpy.Preference
+) -> None:
+    """Re-solve a QP after each of 100 objective updates.
+
+    The mean solve times of the first and the last ten updates are stored in
+    `extra_info["first_10"]` and `extra_info["last_10"]`; they should be about
+    equal, i.e. updating the objective must not make the model grow.
+    """
+    model = quadratic(50)
+    rng = np.random.default_rng(0)
+    targets = rng.uniform(-1, 1, size=(100, model.num_variables))
+    rows, cols, values = model.objective.get_quadratic_terms()
+    times: list[float] = []
+
+    def update_and_solve(solver: ilpy.Solver) -> None:
+        times.clear()
+        for target in targets:
+            objective = ilpy.Objective.from_coefficients((-2 * target).tolist())
+            objective.set_quadratic_terms(rows, cols, values)
+            solver.set_objective(objective)
+            t0 = time.perf_counter()
+            solver.solve()
+            times.append(time.perf_counter() - t0)
+
+    def setup() -> tuple[tuple[ilpy.Solver], dict]:
+        return (model.solver(preference),), {}
+
+    benchmark.pedantic(update_and_solve, setup=setup, rounds=1)
+    benchmark.extra_info["first_10"] = float(np.mean(times[:10]))
+    benchmark.extra_info["last_10"] = float(np.mean(times[-10:]))
+
+
+@pytest.mark.parametrize("decompose", [False, True], ids=["whole", "decomposed"])
+def test_solve_decomposed(
+    benchmark: BenchmarkFixture,
+    model: SyntheticModel,
+    preference: ilpy.Preference,
+    decompose: bool,
+) -> None:
+    """Time `ilpy.solve` with and without solving components separately."""
+    constraints = model.constraints()
+    kwargs = {
+        "variable_type": model.variable_type,
+        "preference": preference,
+        "decompose": decompose,
+    }
+    solution = benchmark.pedantic(
+        ilpy.solve, args=(model.objective, constraints), kwargs=kwargs, rounds=ROUNDS
+    )
+    benchmark.extra_info["status"] = solution.status.name
+
+
+@pytest.mark.parametrize("processes", [0, 4], ids=["sequential", "processes"])
+def test_solve_components(
+    benchmark: BenchmarkFixture, preference: ilpy.Preference, processes: int
+) -> None:
+    """Time solving independent components one by one or in a process pool.
+
+    Components are solved sequentially unless an executor is passed; this
+    records whether a pool pays for pickling the components and starting the
+    workers.
+    """
+    sp = pytest.importorskip("scipy.sparse")
+    num_components, n = 4, 1_000
+    rng = np.random.default_rng(0)
+    # independent covering LPs, each large enough to be a group of its own
+    blocks = [
+        sp.identity(n) + sp.random(n, n, density=0.01, random_state=rng)
+        for _ in range(num_components)
+    ]
+    costs = rng.uniform(1, 10, num_components * n)
+    kwargs = {
+        "A_ub": -sp.block_diag(blocks, format="csr"),
+        "b_ub": -np.ones(num_components * n),
+        "bounds": (0, None),
+        "preference": preference,
+        "decompose": True,
+    }
+
+    def solve() -> ilpy.Solution:
+        if not processes:
+            return ilpy.solve(costs, [], **kwargs)
+        with ProcessPoolExecutor(processes) as executor:
+            return ilpy.solve(costs, [], executor=executor, **kwargs)
+
+    solution = benchmark.pedantic(solve, rounds=ROUNDS)
+    benchmark.extra_info["status"] = solution.status.name
+    benchmark.extra_info["components"] = len(solution.native_status)
+
+
+@pytest.mark.parametrize("presolve", [False, True], ids=["direct", "presolved"])
+def test_build_and_solve_presolved(
+    benchmark: BenchmarkFixture,
+    model: SyntheticModel,
+    preference: ilpy.Preference,
+    presolve: bool,
+) -> None:
+    """Time adding a model's constraints and solving, with and without presolve.
+
+    The number of rows presolve removed is stored in `extra_info["removed"]`.
+    """
+    constraints = model.constraints()
+
+    def build_and_solve() -> ilpy.Solver:
+        solver = ilpy.Solver(
+            model.num_variables,
+            model.variable_type,
+            preference=preference,
+            presolve=presolve,
+        )
+        solver.set_objective(model.objective)
+        for constraint in constraints:
+            solver.add_constraint(constraint)
+        solver.solve()
+        return solver
+
+    solver = benchmark.pedantic(build_and_solve, rounds=ROUNDS)
+    benchmark.extra_info["removed"] = solver.presolve_stats.removed_rows
+
+
+@pytest.mark.parametrize("indicators", [False, True], ids=["big_m", "indicator"])
+def test_fixed_charge(
+    benchmark: BenchmarkFixture, preference: ilpy.Preference, indicators: bool
+) -> None:
+    """A fixed-charge model, with `y[i] == 0 -> x[i] <= 0` as big-M or indicator."""
+    n = 200
+    rng = np.random.default_rng(0)
+    capacity = rng.uniform(10, 1_000, n)
+    fixed_cost = rng.uniform(100, 1_000, n)
+    unit_cost = rng.uniform(1, 10, n)
+    # x[i] is the flow through facility i, y[n + i] whether it is open
+    objective = ilpy.Objective.from_coefficients([*unit_cost, *fixed_cost])
+    demand = ilpy.ConstraintBlock(
+        [0, n], np.arange(n), np.ones(n), ilpy.GreaterEqual, capacity.sum() / 4
+    )
+    switched = ilpy.ConstraintBlock(np.arange(n + 1), np.arange(n), np.ones(n))
+    big_m = ilpy.ConstraintBlock(
+        np.arange(0, 2 * n + 1, 2),
+        np.stack([np.arange(n), np.arange(n, 2 * n)], axis=1).ravel(),
+        np.stack([np.ones(n), -capacity], axis=1).ravel(),
+    )
+
+    def build_and_solve() -> ilpy.Solution:
+        solver = ilpy.Solver(
+            2 * n,
+            ilpy.Continuous,
+            np.repeat([ilpy.Continuous, ilpy.Binary], n),
+            preference=preference,
+            lower_bounds=0,
+            upper_bounds=[*capacity, *np.ones(n)],
+        )
+        solver.set_objective(objective)
+        solver.add_constraint(demand)
+        if indicators:
+            solver.add_indicator_constraints(np.arange(n, 2 * n), False, switched)
+        else:
+            solver.add_constraint(big_m)
+        return solver.solve()
+
+    solution = benchmark.pedantic(build_and_solve, rounds=ROUNDS)
+    benchmark.extra_info["objective"] = solution.get_value()
+    benchmark.extra_info["status"] = solution.status.name
+
+
+@pytest.mark.parametrize("sos", [False, True], ids=["binaries", "sos2"])
+def test_piecewise_linear(
+    benchmark: BenchmarkFixture, preference: ilpy.Preference, sos: bool
+) -> None:
+    """Maximize a sum of nonconcave piecewise-linear functions under a budget.
+
+    Each function is interpolated by weights `l` on its breakpoints, which
+    form an SOS2, or are tied to segment binaries `z` by `l[k] <= z[k - 1] +
+    z[k]` and `sum(z) == 1`.
+    """
+    m, k = 50, 10
+    rng = np.random.default_rng(0)
+    points = np.cumsum(rng.uniform(0.5, 2, (m, k)), axis=1) - 0.5
+    points[:, 0] = 0
+    values = rng.uniform(0, 10, (m, k))
+    values[:, 0] = 0
+    num_weights, num_segments = m * k, m * (k - 1)
+    weights = np.arange(num_weights).reshape(m, k)
+    segments = num_weights + np.arange(num_segments).reshape(m, k - 1)
+    objective = ilpy.Objective.from_coefficients(
+        values.ravel().tolist(), sense=ilpy.Maximize
+    )
+    # sum(l) == 1 per function, and a budget on sum(x)
+    rows = [
+        ilpy.ConstraintBlock(
+            np.arange(0, num_weights + 1, k),
+            weights.ravel(),
+            np.ones(num_weights),
+            ilpy.Equal,
+            1.0,
+        ),
+        ilpy.ConstraintBlock(
+            [0, num_weights], weights.ravel(), points.ravel(), values=points.sum() / 4
+        ),
+    ]
+    if not sos:
+        # sum(z) == 1 and l[j] - z[j - 1] - z[j] <= 0 per function
+        rows.append(
+            ilpy.ConstraintBlock(
+                np.arange(0, num_segments + 1, k - 1),
+                segments.ravel(),
+                np.ones(num_segments),
+                ilpy.Equal,
+                1.0,
+            )
+        )
+        neighbours = np.full((m, k, 2), -1)
+        neighbours[:, 1:, 0] = segments
+        neighbours[:, :-1, 1] = segments
+        columns = np.concatenate([weights[..., None], neighbours], axis=2)
+        entries = columns.reshape(-1, 3)
+        coefs = np.where(entries >= 0, [1.0, -1.0, -1.0], 0.0)
+        keep = (entries >= 0).ravel()
+        rows.append(
+            ilpy.ConstraintBlock(
+                np.concatenate([[0], np.cumsum((entries >= 0).sum(axis=1))]),
+                entries.ravel()[keep],
+                coefs.ravel()[keep],
+            )
+        )
+
+    def build_and_solve() -> ilpy.Solution:
+        solver = ilpy.Solver(
+            num_weights + (0 if sos else num_segments),
+            ilpy.Continuous,
+            None if sos else {int(s): ilpy.Binary for s in segments.ravel()},
+            preference=preference,
+            lower_bounds=0,
+        )
+        solver.set_objective(objective)
+        for block in rows:
+            solver.add_constraint(block)
+        if sos:
+            solver.add_sos_constraints(
+                2, np.arange(0, num_weights + 1, k), weights.ravel(), points.ravel()
+            )
+        return solver.solve()
+
+    solution = benchmark.pedantic(build_and_solve, rounds=ROUNDS)
+    benchmark.extra_info["objective"] = solution.get_value()
+    benchmark.extra_info["status"] = solution.status.name
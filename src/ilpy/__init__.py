@@ -13,14 +13,35 @@ try:
 except PackageNotFoundError:  # pragma: no cover
     __version__ = "uninstalled"
 
-from ._components import Constraint, Constraints, Objective
+from ._arrays import LinearExpressionArray, VariableArray
+from ._components import (
+    Constraint,
+    ConstraintBlock,
+    Constraints,
+    DeduplicationStats,
+    ModelStats,
+    Objective,
+)
 from ._constants import Relation, Sense, SolverStatus, VariableType
+from ._event_recorder import EventRecorder
 from ._functional import solve
-from ._solver import Solution, Solver
+from ._model import Model
+from ._presolve import PresolveStats
+from ._scaling import NumericsReport, analyze_numerics
+from ._solver import Solution, Solver, SolveTimings
 from .event_data import EventData as EventData
 from .event_data import GurobiData as GurobiData
 from .event_data import SCIPData as SCIPData
-from .expressions import Expression, Variable
+from .expressions import (
+    ConstraintTemplate,
+    Expression,
+    LinearExpression,
+    Parameter,
+    QuadraticExpression,
+    Variable,
+    dot,
+    quicksum,
+)
 from .solver_backends import Preference, SolverBackend
 
 # make enums available at the module level
@@ -38,20 +59,37 @@ GreaterEqual = Relation.GreaterEqual
 
 __all__ = [
     "Constraint",
+    "ConstraintBlock",
+    "ConstraintTemplate",
     "Constraints",
+    "DeduplicationStats",
+    "EventRecorder",
     "Expression",
+    "LinearExpression",
+    "LinearExpressionArray",
     "Maximize",
     "Minimize",
+    "Model",
+    "ModelStats",
+    "NumericsReport",
     "Objective",
+    "Parameter",
     "Preference",
+    "PresolveStats",
+    "QuadraticExpression",
     "Relation",
     "Sense",
     "Solution",
+    "SolveTimings",
     "Solver",
     "SolverBackend",
     "SolverStatus",
     "Variable",
+    "VariableArray",
     "VariableType",
+    "analyze_numerics",
+    "dot",
+    "quicksum",
     "solve",
 ]
 
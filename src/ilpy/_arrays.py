@@ -0,0 +1,483 @@
+"""Vectorized variables and linear expressions backed by NumPy arrays.
+
+A `VariableArray` is an n-dimensional array of variable indices, and a
+`LinearExpressionArray` an array of linear expressions stored (like a sparse
+matrix) as one set of CSR arrays.  Arithmetic on them, matrix products with
+NumPy or scipy.sparse matrices, and reductions are all vectorized; comparing
+an expression array produces a [`ConstraintBlock`][ilpy.ConstraintBlock] that
+is loaded into the solver in bulk.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from ._components import ConstraintBlock, _as_csr
+from ._constants import Relation
+from .expressions import Expression, LinearExpression, Variable
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    import numpy.typing as npt
+
+__all__ = ["LinearExpressionArray", "VariableArray"]
+
+
+class VariableArray:
+    """An n-dimensional array of variables, stored as an array of indices.
+
+    Indexing returns a `Variable` (for a single element) or another
+    `VariableArray` (a view of the same variables).  Arithmetic returns a
+    [`LinearExpressionArray`][ilpy.LinearExpressionArray], so constraints on
+    many variables can be written at once:
+
+    ```python
+    x = ilpy.VariableArray((num_edges,))
+    solver.add_constraint(incidence @ x == demand)  # one row per node
+    solver.add_constraint(x.sum() <= 10)
+    ```
+
+    Parameters
+    ----------
+    shape : int | tuple[int, ...]
+        The shape of the array.
+    start : int
+        Index of the first variable.  Variables are numbered consecutively
+        (in C order) from here.
+    name : str
+        Prefix for the names of the variables (e.g. "x" gives `x0`, `x1`, ...).
+    """
+
+    # opt out of NumPy ufuncs, so that `A @ x`, `c * x` or `b <= x` with a
+    # NumPy array on the left use the reflected operators defined here.
+    __array_ufunc__ = None
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        # convert to a 0D object array rather than an array of Variables, so
+        # that scipy.sparse defers `A @ x` to `__rmatmul__`.
+        return _as_object_scalar(self)
+
+    def __init__(
+        self, shape: int | tuple[int, ...], start: int = 0, name: str = "x"
+    ) -> None:
+        size = int(np.prod(shape))
+        self._indices = np.arange(start, start + size, dtype=np.int64).reshape(shape)
+        self._indices.flags.writeable = False
+        self.name = name
+
+    @classmethod
+    def from_indices(cls, indices: npt.ArrayLike, name: str = "x") -> VariableArray:
+        """Create an array of the variables with the given `indices`."""
+        obj = cls.__new__(cls)
+        obj._indices = np.array(indices, dtype=np.int64)
+        if obj._indices.size and obj._indices.min() < 0:
+            raise ValueError("Variable indices must be non-negative")
+        obj._indices.flags.writeable = False
+        obj.name = name
+        return obj
+
+    @property
+    def indices(self) -> np.ndarray:
+        """The (read-only) array of variable indices."""
+        return self._indices
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """The shape of the array."""
+        return self._indices.shape
+
+    @property
+    def ndim(self) -> int:
+        """The number of dimensions."""
+        return self._indices.ndim
+
+    @property
+    def size(self) -> int:
+        """The number of variables."""
+        return self._indices.size
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, key: Any) -> Variable | VariableArray:
+        indices = self._indices[key]
+        if np.ndim(indices) == 0:
+            return Variable(f"{self.name}{int(indices)}", index=int(indices))
+        return VariableArray.from_indices(indices, self.name)
+
+    def __iter__(self) -> Iterator[Variable | VariableArray]:
+        return (self[i] for i in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"VariableArray(shape={self.shape}, name={self.name!r})"
+
+    def as_expression(self) -> LinearExpressionArray:
+        """Return the expression array with one `1 * x[i]` term per element."""
+        size = self.size
+        return LinearExpressionArray(
+            np.arange(size + 1, dtype=np.int64),
+            self._indices.ravel(),
+            np.ones(size),
+            np.zeros(size),
+            self.shape,
+        )
+
+    def sum(self, axis: int | None = None) -> LinearExpression | LinearExpressionArray:
+        """Sum the variables over `axis` (all of them, if None)."""
+        return self.as_expression().sum(axis)
+
+    # arithmetic is delegated to LinearExpressionArray
+
+    def __add__(self, other: Any) -> LinearExpressionArray:
+        return self.as_expression().__add__(other)
+
+    def __radd__(self, other: Any) -> LinearExpressionArray:
+        return self.as_expression().__add__(other)
+
+    def __sub__(self, other: Any) -> LinearExpressionArray:
+        return self.as_expression().__sub__(other)
+
+    def __rsub__(self, other: Any) -> LinearExpressionArray:
+        return self.as_expression().__rsub__(other)
+
+    def __mul__(self, other: Any) -> LinearExpressionArray:
+        return self.as_expression().__mul__(other)
+
+    def __rmul__(self, other: Any) -> LinearExpressionArray:
+        return self.as_expression().__mul__(other)
+
+    def __truediv__(self, other: Any) -> LinearExpressionArray:
+        return self.as_expression().__truediv__(other)
+
+    def __neg__(self) -> LinearExpressionArray:
+        return -self.as_expression()
+
+    def __matmul__(self, other: Any) -> LinearExpression | LinearExpressionArray:
+        return self.as_expression().__matmul__(other)
+
+    def __rmatmul__(self, other: Any) -> LinearExpression | LinearExpressionArray:
+        return self.as_expression().__rmatmul__(other)
+
+    def __le__(self, other: Any) -> ConstraintBlock:
+        return self.as_expression().__le__(other)
+
+    def __ge__(self, other: Any) -> ConstraintBlock:
+        return self.as_expression().__ge__(other)
+
+    def __eq__(self, other: Any) -> ConstraintBlock:  # type: ignore[override]
+        return self.as_expression().__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class LinearExpressionArray:
+    """An n-dimensional array of linear expressions.
+
+    Element `r` (in C order) is
+    `sum(data[k] * x[indices[k]] for k in range(indptr[r], indptr[r + 1]))`
+    `+ constant[r]`.  Expression arrays are created from a
+    [`VariableArray`][ilpy.VariableArray] (e.g. `c * x`, `A @ x`, `x.sum(0)`),
+    support elementwise `+`, `-`, `*` and `/` with numbers, NumPy arrays,
+    variables and other expressions (with NumPy broadcasting), and matrix
+    products with dense or scipy.sparse matrices.
+
+    Comparing with `<=`, `>=` or `==` returns a
+    [`ConstraintBlock`][ilpy.ConstraintBlock] with one row per element.
+    """
+
+    __array_ufunc__ = None
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        return _as_object_scalar(self)
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        constant: np.ndarray,
+        shape: tuple[int, ...],
+    ) -> None:
+        self._indptr = indptr
+        self._indices = indices
+        self._data = data
+        self._constant = constant
+        self._shape = tuple(shape)
+
+    @classmethod
+    def _from_scalar(cls, expr: Expression | Variable) -> LinearExpressionArray:
+        """Return a 0-dimensional array holding the (linear) `expr`."""
+        if not isinstance(expr, LinearExpression):
+            expr = LinearExpression() + expr
+        if expr.get_quadratic_coefficients():
+            raise TypeError("Expression arrays cannot hold quadratic terms")
+        coefs = expr.get_coefficients()
+        return cls(
+            np.array([0, len(coefs)], dtype=np.int64),
+            np.fromiter(coefs.keys(), np.int64, len(coefs)),
+            np.fromiter(coefs.values(), np.float64, len(coefs)),
+            np.array([expr.get_constant()]),
+            (),
+        )
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """The shape of the array."""
+        return self._shape
+
+    @property
+    def ndim(self) -> int:
+        """The number of dimensions."""
+        return len(self._shape)
+
+    @property
+    def size(self) -> int:
+        """The number of expressions."""
+        return len(self._constant)
+
+    @property
+    def nnz(self) -> int:
+        """The number of stored terms (duplicates included)."""
+        return len(self._data)
+
+    def __len__(self) -> int:
+        if not self._shape:
+            raise TypeError("len() of a 0-dimensional expression array")
+        return self._shape[0]
+
+    def __repr__(self) -> str:
+        return f"LinearExpressionArray(shape={self._shape}, nnz={self.nnz})"
+
+    # row gathering
+
+    def _take(
+        self, rows: np.ndarray, weights: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Gather (and scale) `rows`: return indptr, indices, data, constant."""
+        starts = self._indptr[rows]
+        lengths = self._indptr[rows + 1] - starts
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        pos = np.arange(indptr[-1]) + np.repeat(starts - indptr[:-1], lengths)
+        data = self._data[pos]
+        constant = self._constant[rows]
+        if weights is not None:
+            data = data * np.repeat(weights, lengths)
+            constant = constant * weights
+        return indptr, self._indices[pos], data, constant
+
+    def _combine(
+        self,
+        groups: np.ndarray,
+        rows: np.ndarray,
+        weights: np.ndarray | None,
+        shape: tuple[int, ...],
+    ) -> LinearExpressionArray:
+        """Return the array whose element `g` is the weighted sum of
+        `rows[groups[g]:groups[g + 1]]` of this array.
+        """
+        indptr, indices, data, constant = self._take(rows, weights)
+        num_groups = len(groups) - 1
+        group_of = np.repeat(np.arange(num_groups), np.diff(groups))
+        return LinearExpressionArray(
+            indptr[groups],
+            indices,
+            data,
+            np.bincount(group_of, weights=constant, minlength=num_groups),
+            shape,
+        )
+
+    def _broadcast_to(self, shape: tuple[int, ...]) -> LinearExpressionArray:
+        if shape == self._shape:
+            return self
+        rows = np.broadcast_to(np.arange(self.size).reshape(self._shape), shape)
+        return LinearExpressionArray(*self._take(rows.ravel()), shape)
+
+    def __getitem__(self, key: Any) -> LinearExpression | LinearExpressionArray:
+        rows = np.arange(self.size).reshape(self._shape)[key]
+        if np.ndim(rows) == 0:
+            return self._element(int(rows))
+        return LinearExpressionArray(*self._take(rows.ravel()), rows.shape)
+
+    def __iter__(self) -> Iterator[LinearExpression | LinearExpressionArray]:
+        return (self[i] for i in range(len(self)))
+
+    def _element(self, row: int) -> LinearExpression:
+        start, stop = self._indptr[row], self._indptr[row + 1]
+        return LinearExpression(
+            (
+                (Variable(f"x{i}", index=i), coef)
+                for i, coef in zip(
+                    self._indices[start:stop].tolist(),
+                    self._data[start:stop].tolist(),
+                )
+            ),
+            constant=float(self._constant[row]),
+        )
+
+    def sum(self, axis: int | None = None) -> LinearExpression | LinearExpressionArray:
+        """Sum the expressions over `axis` (all of them, if None)."""
+        if axis is None:
+            total = LinearExpressionArray(
+                np.array([0, self.nnz], dtype=np.int64),
+                self._indices,
+                self._data,
+                np.array([self._constant.sum()]),
+                (),
+            )
+            return total._element(0)
+        axis = range(self.ndim)[axis]  # normalize negative axes
+        rows = np.moveaxis(np.arange(self.size).reshape(self._shape), axis, -1)
+        shape = rows.shape[:-1]
+        k = self._shape[axis]
+        groups = (
+            np.arange(0, rows.size + 1, k)
+            if k
+            else np.zeros(1 + int(np.prod(shape)), dtype=np.int64)
+        )
+        return self._combine(groups, rows.ravel(), None, shape)
+
+    # arithmetic
+
+    def _coerce(self, other: Any) -> LinearExpressionArray | np.ndarray | None:
+        """Convert `other` to an expression array, or a float array of constants."""
+        if isinstance(other, LinearExpressionArray):
+            return other
+        if isinstance(other, VariableArray):
+            return other.as_expression()
+        if isinstance(other, Expression):
+            return LinearExpressionArray._from_scalar(other)
+        try:
+            return np.asarray(other, dtype=np.float64)
+        except (TypeError, ValueError):
+            return None
+
+    def _add(self, other: Any, sign: float) -> LinearExpressionArray:
+        coerced = self._coerce(other)
+        if coerced is None:
+            return NotImplemented  # type: ignore[no-any-return]
+        if isinstance(coerced, np.ndarray):
+            shape = np.broadcast_shapes(self._shape, coerced.shape)
+            lhs = self._broadcast_to(shape)
+            constant = lhs._constant + sign * np.broadcast_to(coerced, shape).ravel()
+            return LinearExpressionArray(
+                lhs._indptr, lhs._indices, lhs._data, constant, shape
+            )
+
+        shape = np.broadcast_shapes(self._shape, coerced._shape)
+        a, b = self._broadcast_to(shape), coerced._broadcast_to(shape)
+        # interleave the terms of each row of `a` with those of the same row of `b`
+        a_len, b_len = np.diff(a._indptr), np.diff(b._indptr)
+        indptr = np.zeros(len(a_len) + 1, dtype=np.int64)
+        np.cumsum(a_len + b_len, out=indptr[1:])
+        a_pos = np.arange(a.nnz) + np.repeat(indptr[:-1] - a._indptr[:-1], a_len)
+        b_pos = np.arange(b.nnz) + np.repeat(
+            indptr[:-1] + a_len - b._indptr[:-1], b_len
+        )
+        indices = np.empty(indptr[-1], dtype=np.int64)
+        data = np.empty(indptr[-1], dtype=np.float64)
+        indices[a_pos], indices[b_pos] = a._indices, b._indices
+        data[a_pos], data[b_pos] = a._data, sign * b._data
+        return LinearExpressionArray(
+            indptr, indices, data, a._constant + sign * b._constant, shape
+        )
+
+    def _scale(self, factor: Any) -> LinearExpressionArray:
+        if isinstance(factor, (Expression, VariableArray, LinearExpressionArray)):
+            raise TypeError("Expression arrays cannot hold quadratic terms")
+        try:
+            factor = np.asarray(factor, dtype=np.float64)
+        except (TypeError, ValueError):
+            return NotImplemented  # type: ignore[no-any-return]
+        shape = np.broadcast_shapes(self._shape, factor.shape)
+        lhs = self._broadcast_to(shape)
+        weights = np.broadcast_to(factor, shape).ravel()
+        return LinearExpressionArray(
+            lhs._indptr,
+            lhs._indices,
+            lhs._data * np.repeat(weights, np.diff(lhs._indptr)),
+            lhs._constant * weights,
+            shape,
+        )
+
+    def __add__(self, other: Any) -> LinearExpressionArray:
+        return self._add(other, 1.0)
+
+    def __radd__(self, other: Any) -> LinearExpressionArray:
+        return self._add(other, 1.0)
+
+    def __sub__(self, other: Any) -> LinearExpressionArray:
+        return self._add(other, -1.0)
+
+    def __rsub__(self, other: Any) -> LinearExpressionArray:
+        return self._scale(-1.0)._add(other, 1.0)
+
+    def __mul__(self, other: Any) -> LinearExpressionArray:
+        return self._scale(other)
+
+    def __rmul__(self, other: Any) -> LinearExpressionArray:
+        return self._scale(other)
+
+    def __truediv__(self, other: Any) -> LinearExpressionArray:
+        if isinstance(other, (Expression, VariableArray, LinearExpressionArray)):
+            return NotImplemented
+        return self._scale(1 / np.asarray(other, dtype=np.float64))
+
+    def __neg__(self) -> LinearExpressionArray:
+        return self._scale(-1.0)
+
+    def __rmatmul__(self, matrix: Any) -> LinearExpression | LinearExpressionArray:
+        """`matrix @ self`, for a 1D array `self` and a 1D/2D (sparse) matrix."""
+        if self.ndim != 1:
+            raise ValueError("Matrix products require a 1D expression array")
+        if isinstance(matrix, (Expression, VariableArray, LinearExpressionArray)):
+            return NotImplemented
+        vector = not hasattr(matrix, "tocsr") and np.ndim(matrix) == 1
+        indptr, indices, data, shape = _as_csr(
+            np.atleast_2d(matrix) if vector else matrix
+        )
+        if shape[1] != self._shape[0]:
+            raise ValueError(
+                f"matmul: shape mismatch {shape} @ {self._shape} "
+                f"({shape[1]} != {self._shape[0]})"
+            )
+        result = self._combine(indptr, indices, data, (shape[0],))
+        return result[0] if vector else result
+
+    def __matmul__(self, matrix: Any) -> LinearExpression | LinearExpressionArray:
+        """`self @ matrix`, i.e. `matrix.T @ self`."""
+        if isinstance(matrix, (Expression, VariableArray, LinearExpressionArray)):
+            return NotImplemented
+        if not hasattr(matrix, "tocsr"):
+            matrix = np.asarray(matrix, dtype=np.float64)
+        return self.__rmatmul__(matrix.T)
+
+    # comparisons
+
+    def _compare(self, other: Any, relation: Relation) -> ConstraintBlock:
+        diff = self - other
+        if diff is NotImplemented:
+            return NotImplemented  # type: ignore[no-any-return]
+        return ConstraintBlock(
+            diff._indptr, diff._indices, diff._data, relation, -diff._constant
+        )
+
+    def __le__(self, other: Any) -> ConstraintBlock:
+        return self._compare(other, Relation.LessEqual)
+
+    def __ge__(self, other: Any) -> ConstraintBlock:
+        return self._compare(other, Relation.GreaterEqual)
+
+    def __eq__(self, other: Any) -> ConstraintBlock:  # type: ignore[override]
+        return self._compare(other, Relation.Equal)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+def _as_object_scalar(obj: Any) -> np.ndarray:
+    array = np.empty((), dtype=object)
+    array[()] = obj
+    return array
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import itertools
 from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
 from types import MappingProxyType
-from typing import TYPE_CHECKING, SupportsIndex
+from typing import TYPE_CHECKING, Any, SupportsIndex, cast
+
+import numpy as np
 
 from ilpy._constants import Sense
 
-from ._constants import Relation
+from ._constants import Relation, VariableType
 from .expressions import Expression
 
 if TYPE_CHECKING:
+    import numpy.typing as npt
+
     from ._solver import Solution
 
     LinearCoeffs = Sequence[float] | Mapping[int, float]
@@ -22,7 +28,8 @@ class Constraint:
     def __init__(self) -> None:
         """Create an empty `<= 0` constraint with no coefficients."""
         self._coefs: dict[int, float] = {}
-        self._quad_coefs: dict[tuple[int, int], float] = {}
+        # created on the first quadratic term (most constraints are linear)
+        self._quad_coefs: _QuadraticTerms | None = None
         self._relation: Relation = Relation.LessEqual
         self._value: float = 0.0
 
@@ -40,16 +47,43 @@ class Constraint:
     def set_quadratic_coefficient(
         self, i: SupportsIndex, j: SupportsIndex, value: float
     ) -> None:
-        """Set the quadratic coefficient for the term `x_i * x_j`."""
-        key = (int(i), int(j))
-        if value == 0:
-            self._quad_coefs.pop(key, None)
-        else:
-            self._quad_coefs[key] = value
+        """Set the quadratic coefficient for the term `x_i * x_j`.
+
+        Coefficients set for `(i, j)` and for `(j, i)` are summed.
+        """
+        if self._quad_coefs is None:
+            self._quad_coefs = _QuadraticTerms()
+        self._quad_coefs.set(int(i), int(j), value)
 
     def get_quadratic_coefficients(self) -> Mapping[tuple[int, int], float]:
-        """Return the quadratic coefficients, keyed by variable-index pairs."""
-        return MappingProxyType(self._quad_coefs)
+        """Return the quadratic coefficients, keyed by pairs `(i, j)` with `i <= j`."""
+        if self._quad_coefs is None:
+            return _NO_QUADRATIC_COEFFICIENTS
+        return MappingProxyType(self._quad_coefs.mapping())
+
+    def set_quadratic_terms(
+        self, rows: npt.ArrayLike, cols: npt.ArrayLike, values: npt.ArrayLike
+    ) -> None:
+        """Replace all quadratic terms by `sum(values[k] * x[rows[k]] * x[cols[k]])`.
+
+        Repeated and mirrored pairs (`(i, j)` and `(j, i)`) are summed.
+        """
+        if self._quad_coefs is None:
+            self._quad_coefs = _QuadraticTerms()
+        self._quad_coefs.set_all(rows, cols, values)
+
+    def set_quadratic_matrix(self, matrix: Any) -> None:
+        """Replace all quadratic terms by `x @ Q @ x` (a dense or scipy.sparse `Q`)."""
+        self.set_quadratic_terms(*_as_coo(matrix))
+
+    def get_quadratic_terms(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the quadratic terms as (read-only) `(rows, cols, values)` arrays.
+
+        Pairs are unique, with `rows[k] <= cols[k]`, sorted, and no value is zero.
+        """
+        if self._quad_coefs is None:
+            return _NO_QUADRATIC_TERMS
+        return self._quad_coefs.arrays()
 
     def set_relation(self, relation: Relation) -> None:
         """Set the relation (`<=`, `=`, `>=`) used by this constraint."""
@@ -86,7 +120,10 @@ class Constraint:
         relation: Relation = Relation.LessEqual,
         value: float = 0,
     ) -> Constraint:
-        """Build a `Constraint` from coefficients, a relation, and a value."""
+        """Build a `Constraint` from coefficients, a relation, and a value.
+
+        Repeated and mirrored pairs in `quadratic_coefficients` are summed.
+        """
         constraint = cls()
         iter_coeffs = (
             coefficients.items()
@@ -95,32 +132,788 @@ class Constraint:
         )
         for i, coeff in iter_coeffs:
             constraint.set_coefficient(i, coeff)
-        iter_quadratic_coeffs = (
-            quadratic_coefficients.items()
-            if isinstance(quadratic_coefficients, Mapping)
-            else quadratic_coefficients
-        )
-        for (i, j), coeff in iter_quadratic_coeffs:
-            constraint.set_quadratic_coefficient(i, j, coeff)
+        if quadratic_coefficients:
+            constraint.set_quadratic_terms(*_qcoeffs_to_coo(quadratic_coefficients))
 
         constraint.set_relation(relation)
         constraint.set_value(value)
         return constraint
 
 
+class ConstraintBlock:
+    """A block of linear constraints `A x [<=|=|>=] b`, stored as arrays.
+
+    Row `r` of the block is the constraint
+    `sum(data[k] * x[indices[k]] for k in range(indptr[r], indptr[r + 1]))`
+    `relations[r]` `values[r]`, i.e. `A` is stored in compressed sparse row
+    (CSR) form.  Blocks are usually created by comparing a
+    [`LinearExpressionArray`][ilpy.LinearExpressionArray] (e.g. `A @ x <= b`),
+    or with `from_matrix`, and are passed to the solver backend in bulk.
+
+    Entries are canonical: the column indices within each row are sorted and
+    unique, and no stored coefficient is zero.
+
+    Parameters
+    ----------
+    indptr, indices, data : array-like
+        The CSR arrays of the coefficient matrix.
+    relations : Relation | array-like of Relation
+        The relation of every row (or one relation for all rows).
+    values : float | array-like of float
+        The right-hand side of every row (or one value for all rows).
+    """
+
+    def __init__(
+        self,
+        indptr: npt.ArrayLike,
+        indices: npt.ArrayLike,
+        data: npt.ArrayLike,
+        relations: Relation | npt.ArrayLike = Relation.LessEqual,
+        values: float | npt.ArrayLike = 0.0,
+    ) -> None:
+        indptr, indices, data = _canonical_csr(
+            np.asarray(indptr, dtype=np.int64),
+            np.asarray(indices, dtype=np.int64),
+            np.asarray(data, dtype=np.float64),
+        )
+        num_rows = len(indptr) - 1
+        self._indptr = indptr
+        self._indices = indices
+        self._data = data
+        self._relations = np.broadcast_to(
+            np.asarray(relations, dtype=np.int8), (num_rows,)
+        ).copy()
+        self._values = np.broadcast_to(
+            np.asarray(values, dtype=np.float64), (num_rows,)
+        ).copy()
+        for array in (self._indptr, self._indices, self._data):
+            array.flags.writeable = False
+        if len(self._relations) and not np.isin(self._relations, list(Relation)).all():
+            raise ValueError("relations must be ilpy.Relation values")
+
+    @classmethod
+    def from_matrix(
+        cls,
+        matrix: Any,
+        relations: Relation | npt.ArrayLike = Relation.LessEqual,
+        values: float | npt.ArrayLike = 0.0,
+    ) -> ConstraintBlock:
+        """Create a block from a dense 2D array or a scipy.sparse matrix."""
+        indptr, indices, data, _ = _as_csr(matrix)
+        return cls(indptr, indices, data, relations, values)
+
+    @property
+    def indptr(self) -> np.ndarray:
+        """Row pointers into `indices` and `data` (length `len(self) + 1`)."""
+        return self._indptr
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Variable index of every stored coefficient."""
+        return self._indices
+
+    @property
+    def data(self) -> np.ndarray:
+        """Value of every stored coefficient."""
+        return self._data
+
+    @property
+    def relations(self) -> np.ndarray:
+        """The relation of every row, as `Relation` integer values."""
+        return self._relations
+
+    @property
+    def values(self) -> np.ndarray:
+        """The right-hand side of every row."""
+        return self._values
+
+    @property
+    def nnz(self) -> int:
+        """The number of stored coefficients."""
+        return len(self._data)
+
+    def __len__(self) -> int:
+        return len(self._indptr) - 1
+
+    def __getitem__(self, row: SupportsIndex) -> Constraint:
+        row = int(row)
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("constraint index out of range")
+        start, stop = self._indptr[row], self._indptr[row + 1]
+        constraint = Constraint()
+        constraint._coefs = dict(
+            zip(self._indices[start:stop].tolist(), self._data[start:stop].tolist())
+        )
+        constraint.set_relation(Relation(self._relations[row]))
+        constraint.set_value(float(self._values[row]))
+        return constraint
+
+    def __iter__(self) -> Iterator[Constraint]:
+        return (self[row] for row in range(len(self)))
+
+    def is_violated(self, solution: Solution | npt.ArrayLike) -> np.ndarray:
+        """Return a boolean array: True for every row `solution` violates."""
+        x = np.asarray(solution, dtype=np.float64)
+        row = np.repeat(np.arange(len(self)), np.diff(self._indptr))
+        lhs = np.bincount(
+            row, weights=self._data * x[self._indices], minlength=len(self)
+        )
+        rel, val = self._relations, self._values
+        return np.where(
+            rel == Relation.LessEqual,
+            lhs > val,
+            np.where(rel == Relation.GreaterEqual, lhs < val, lhs != val),
+        )
+
+    def to_scipy(self, num_variables: int | None = None) -> Any:
+        """Return the coefficient matrix as a `scipy.sparse.csr_matrix`."""
+        from scipy.sparse import csr_matrix  # type: ignore[import-untyped]
+
+        if num_variables is None:
+            num_variables = int(self._indices.max()) + 1 if self.nnz else 0
+        return csr_matrix(
+            (self._data, self._indices, self._indptr),
+            shape=(len(self), num_variables),
+        )
+
+    @classmethod
+    def concatenate(cls, blocks: Sequence[ConstraintBlock]) -> ConstraintBlock:
+        """Stack the rows of several blocks into one block."""
+        if not blocks:
+            return cls(np.zeros(1, dtype=np.int64), [], [])
+        offsets = np.cumsum([0] + [b.nnz for b in blocks[:-1]])
+        indptr = np.concatenate(
+            [[0]] + [b._indptr[1:] + off for b, off in zip(blocks, offsets)]
+        )
+        return cls(
+            indptr,
+            np.concatenate([b._indices for b in blocks]),
+            np.concatenate([b._data for b in blocks]),
+            np.concatenate([b._relations for b in blocks]),
+            np.concatenate([b._values for b in blocks]),
+        )
+
+    def canonicalize(self) -> ConstraintBlock:
+        """Return the rows scaled to a canonical form.
+
+        Every row is divided by its largest coefficient (in absolute value),
+        and its relation is flipped if that makes its first coefficient
+        positive, so that rows that are multiples of each other become equal.
+        Column indices are always sorted.
+        """
+        data, relations, values = _normalized_rows(self)
+        return ConstraintBlock(self._indptr, self._indices, data, relations, values)
+
+    def deduplicate(
+        self, normalize: bool = True
+    ) -> tuple[ConstraintBlock, DeduplicationStats]:
+        """Return the rows without duplicates, and how many were dropped.
+
+        Of rows with the same coefficients and relation, only the tightest is
+        kept: the one with the smallest right-hand side for `<=`, the largest
+        for `>=`.  Equality rows are only merged if their right-hand sides are
+        equal as well.
+
+        Parameters
+        ----------
+        normalize : bool
+            If True, rows are compared in their canonical form (see
+            `canonicalize`), so rows that are multiples of each other (e.g.
+            `x + y <= 2` and `-2x - 2y >= -3`) are merged as well.  The kept
+            rows are returned as they were given.  By default, True.
+        """
+        return _merge_duplicate_rows(self, normalize)
+
+    def __repr__(self) -> str:
+        return f"ConstraintBlock(rows={len(self)}, nnz={self.nnz})"
+
+
+@dataclass
+class DeduplicationStats:
+    """How many rows were dropped by `Constraints.deduplicate`.
+
+    Attributes
+    ----------
+    rows : int
+        The number of linear rows before deduplication.
+    duplicate_rows : int
+        Rows that were equal to a kept row, apart from a looser right-hand side.
+    parallel_rows : int
+        Rows that were a multiple of a kept row, apart from a looser
+        right-hand side (only when normalizing).
+    """
+
+    rows: int = 0
+    duplicate_rows: int = 0
+    parallel_rows: int = 0
+
+    @property
+    def removed_rows(self) -> int:
+        """The total number of rows that were dropped."""
+        return self.duplicate_rows + self.parallel_rows
+
+
+@dataclass
+class ModelStats:
+    """The size and shape of a model, e.g. to log it or to decide how to solve it.
+
+    Coefficient ranges are over absolute values, ignoring zeros (and infinite
+    bounds), and are NaN if there is nothing to report.
+
+    Attributes
+    ----------
+    rows : int
+        The number of constraints (linear and quadratic).
+    columns : int
+        The number of variables.
+    nnz : int
+        The number of linear coefficients in the constraints.
+    relations : dict[Relation, int]
+        The number of constraints with each relation.
+    variable_types : dict[VariableType, int]
+        The number of variables of each type (empty if unknown).
+    quadratic_constraints : int
+        The number of constraints with quadratic terms.
+    quadratic_terms : int
+        The number of quadratic terms in all constraints.
+    indicator_constraints : int
+        The number of indicator constraints (see
+        `Solver.add_indicator_constraint`), not included in `rows`.
+    sos_constraints : int
+        The number of special ordered sets (see `Solver.add_sos`), not
+        included in `rows`.
+    objective_nnz : int
+        The number of nonzero linear objective coefficients.
+    objective_quadratic_terms : int
+        The number of quadratic terms in the objective.
+    row_lengths : np.ndarray
+        A histogram of row lengths: `row_lengths[k]` constraints have `k`
+        linear coefficients.
+    matrix_range, rhs_range, objective_range, bounds_range : tuple[float, float]
+        The smallest and largest constraint coefficient, right-hand side,
+        linear objective coefficient, and finite variable bound.
+    """
+
+    rows: int = 0
+    columns: int = 0
+    nnz: int = 0
+    relations: dict[Relation, int] = field(default_factory=dict)
+    variable_types: dict[VariableType, int] = field(default_factory=dict)
+    quadratic_constraints: int = 0
+    quadratic_terms: int = 0
+    indicator_constraints: int = 0
+    sos_constraints: int = 0
+    objective_nnz: int = 0
+    objective_quadratic_terms: int = 0
+    row_lengths: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int64))
+    matrix_range: tuple[float, float] = (np.nan, np.nan)
+    rhs_range: tuple[float, float] = (np.nan, np.nan)
+    objective_range: tuple[float, float] = (np.nan, np.nan)
+    bounds_range: tuple[float, float] = (np.nan, np.nan)
+
+    @property
+    def max_row_length(self) -> int:
+        """The largest number of linear coefficients in a constraint."""
+        return max(len(self.row_lengths) - 1, 0)
+
+    def __str__(self) -> str:
+        relations = ", ".join(f"{r.name}: {n}" for r, n in self.relations.items())
+        types = ", ".join(f"{t.name}: {n}" for t, n in self.variable_types.items())
+        ranges = ", ".join(
+            f"{name} [{low:.0e}, {high:.0e}]"
+            for name, (low, high) in (
+                ("matrix", self.matrix_range),
+                ("objective", self.objective_range),
+                ("bounds", self.bounds_range),
+                ("rhs", self.rhs_range),
+            )
+        )
+        return (
+            f"{self.rows} rows, {self.columns} columns, {self.nnz} nonzeros "
+            f"({self.quadratic_constraints} quadratic constraints, "
+            f"{self.objective_quadratic_terms} quadratic objective terms)\n"
+            f"  relations: {relations}\n"
+            f"  variables: {types}\n"
+            f"  ranges: {ranges}"
+        )
+
+
+class _StatsCollector:
+    """Running totals of the constraints and the objective of a model.
+
+    Blocks are counted in vectorized passes as they are added.  Single
+    constraints are only buffered, and counted together in one pass when the
+    totals are next needed, so that adding a row costs a list append.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+        self.set_objective(None)
+        self.indicator_constraints = self.sos_constraints = 0
+
+    def clear(self) -> None:
+        """Forget all constraints (but not the objective)."""
+        self.rows = self.nnz = 0
+        self.relations = np.zeros(max(Relation) + 1, dtype=np.int64)
+        self.quadratic_constraints = self.quadratic_terms = 0
+        self.num_columns = 0
+        self.lengths = np.zeros(0, dtype=np.int64)
+        self.matrix = self.rhs = (np.inf, -np.inf)
+        self.pending: list[Constraint] = []
+
+    def set_objective(self, objective: Objective | None) -> None:
+        self.objective_nnz = self.objective_quadratic_terms = 0
+        self.objective = (np.inf, -np.inf)
+        if objective is None:
+            return
+        coefficients = np.asarray(objective.get_coefficients(), dtype=np.float64)
+        self.objective_nnz = int(np.count_nonzero(coefficients))
+        self.objective_quadratic_terms = len(objective.get_quadratic_terms()[2])
+        self.objective = _magnitudes(coefficients)
+
+    def add(self, item: Constraint | ConstraintBlock) -> None:
+        if isinstance(item, ConstraintBlock):
+            self._count(
+                item.indptr, item.indices, item.data, item.relations, item.values
+            )
+        else:
+            self.pending.append(item)
+
+    def _count(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        relations: np.ndarray,
+        values: np.ndarray,
+    ) -> None:
+        self.rows += len(relations)
+        self.nnz += len(data)
+        self.relations += np.bincount(relations, minlength=len(self.relations))
+        lengths = np.bincount(np.diff(indptr))
+        if len(lengths) > len(self.lengths):
+            self.lengths = np.pad(self.lengths, (0, len(lengths) - len(self.lengths)))
+        self.lengths[: len(lengths)] += lengths
+        self.num_columns = max(self.num_columns, int(indices.max(initial=-1)) + 1)
+        self.matrix = _merged(self.matrix, _magnitudes(data))
+        self.rhs = _merged(self.rhs, _magnitudes(values))
+
+    def _count_pending(self) -> None:
+        """Count the buffered single constraints, as if they were one block."""
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+        coefs = [c._coefs for c in pending]
+        indptr = np.zeros(len(pending) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, coefs), np.int64, len(coefs)), out=indptr[1:])
+        chain = itertools.chain.from_iterable
+        self._count(
+            indptr,
+            np.fromiter(chain(coefs), np.int64, indptr[-1]),
+            np.fromiter(chain(c.values() for c in coefs), np.float64, indptr[-1]),
+            np.fromiter((c._relation for c in pending), np.int64, len(pending)),
+            np.fromiter((c._value for c in pending), np.float64, len(pending)),
+        )
+        for constraint in pending:
+            if quadratic := len(constraint.get_quadratic_terms()[2]):
+                self.quadratic_constraints += 1
+                self.quadratic_terms += quadratic
+
+    def result(
+        self,
+        num_variables: int | None = None,
+        types: np.ndarray | None = None,
+        lower: np.ndarray | None = None,
+        upper: np.ndarray | None = None,
+    ) -> ModelStats:
+        self._count_pending()
+        stats = ModelStats(
+            rows=self.rows,
+            columns=self.num_columns if num_variables is None else num_variables,
+            nnz=self.nnz,
+            relations={r: int(self.relations[r]) for r in Relation},
+            quadratic_constraints=self.quadratic_constraints,
+            quadratic_terms=self.quadratic_terms,
+            indicator_constraints=self.indicator_constraints,
+            sos_constraints=self.sos_constraints,
+            objective_nnz=self.objective_nnz,
+            objective_quadratic_terms=self.objective_quadratic_terms,
+            row_lengths=self.lengths.copy(),
+            matrix_range=_finite(self.matrix),
+            rhs_range=_finite(self.rhs),
+            objective_range=_finite(self.objective),
+        )
+        if types is not None:
+            counts = np.bincount(types, minlength=max(VariableType) + 1)
+            stats.variable_types = {t: int(counts[t]) for t in VariableType}
+        if given := [np.ravel(b) for b in (lower, upper) if b is not None]:
+            bounds = np.concatenate(given)
+            stats.bounds_range = _finite(_magnitudes(bounds[np.isfinite(bounds)]))
+        return stats
+
+
+def _magnitudes(values: np.ndarray) -> tuple[float, float]:
+    """Return the smallest and largest nonzero `|values|` (inf, -inf if none)."""
+    magnitudes = np.abs(values)
+    magnitudes = magnitudes[magnitudes != 0]
+    return (
+        float(magnitudes.min(initial=np.inf)),
+        float(magnitudes.max(initial=-np.inf)),
+    )
+
+
+def _merged(a: tuple[float, float], b: tuple[float, float]) -> tuple[float, float]:
+    return (min(a[0], b[0]), max(a[1], b[1]))
+
+
+def _finite(span: tuple[float, float]) -> tuple[float, float]:
+    return span if span[0] <= span[1] else (np.nan, np.nan)
+
+
+def _as_csr(matrix: Any) -> tuple[np.ndarray, np.ndarray, np.ndarray, tuple[int, int]]:
+    """Return (indptr, indices, data, shape) of a dense or scipy.sparse matrix."""
+    if hasattr(matrix, "tocsr"):  # scipy.sparse (without importing scipy)
+        csr = matrix.tocsr()
+        return (
+            np.asarray(csr.indptr, dtype=np.int64),
+            np.asarray(csr.indices, dtype=np.int64),
+            np.asarray(csr.data, dtype=np.float64),
+            csr.shape,
+        )
+    dense = np.asarray(matrix, dtype=np.float64)
+    if dense.ndim != 2:
+        raise ValueError(f"Expected a 2D matrix, got {dense.ndim} dimensions")
+    rows, cols = np.nonzero(dense)
+    indptr = np.zeros(dense.shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=dense.shape[0]), out=indptr[1:])
+    return indptr, cols.astype(np.int64), dense[rows, cols], dense.shape
+
+
+def _canonical_csr(
+    indptr: np.ndarray, indices: np.ndarray, data: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sort the indices of each row, summing duplicates and dropping zeros."""
+    num_rows = len(indptr) - 1
+    if _is_canonical(indptr, indices, data):
+        return indptr.copy(), indices.copy(), data.copy()
+    row = np.repeat(np.arange(num_rows), np.diff(indptr))
+    order = np.lexsort((indices, row))
+    row, indices, data = row[order], indices[order], data[order]
+    if len(row):
+        first = np.ones(len(row), dtype=bool)
+        first[1:] = (row[1:] != row[:-1]) | (indices[1:] != indices[:-1])
+        if not first.all():
+            starts = np.flatnonzero(first)
+            data = np.add.reduceat(data, starts)
+            row, indices = row[starts], indices[starts]
+        nonzero = data != 0
+        if not nonzero.all():
+            row, indices, data = row[nonzero], indices[nonzero], data[nonzero]
+    new_indptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row, minlength=num_rows), out=new_indptr[1:])
+    return new_indptr, indices, data
+
+
+def _compress(
+    block: ConstraintBlock, rows: np.ndarray, entries: np.ndarray, rhs: np.ndarray
+) -> ConstraintBlock:
+    """Return the `rows` of `block`, keeping only the given `entries`."""
+    entry_rows = np.repeat(np.arange(len(block)), np.diff(block.indptr))
+    entries = entries & rows[entry_rows]
+    indptr = np.zeros(rows.sum() + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(entry_rows[entries], minlength=len(block))[rows], out=indptr[1:]
+    )
+    return ConstraintBlock(
+        indptr,
+        block.indices[entries],
+        block.data[entries],
+        block.relations[rows],
+        rhs[rows],
+    )
+
+
+def _normalized_rows(
+    block: ConstraintBlock,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (data, relations, values) of `block` in canonical form."""
+    indptr, data = block.indptr, block.data
+    lengths = np.diff(indptr)
+    nonempty = lengths > 0
+    starts = indptr[:-1][nonempty]
+    scale = np.ones(len(block))
+    if len(starts):
+        scale[nonempty] = np.maximum.reduceat(np.abs(data), starts) * np.sign(
+            data[starts]
+        )
+    relations = block.relations.copy()
+    flip = scale < 0
+    relations[flip & (block.relations == Relation.LessEqual)] = Relation.GreaterEqual
+    relations[flip & (block.relations == Relation.GreaterEqual)] = Relation.LessEqual
+    return data / np.repeat(scale, lengths), relations, block.values / scale
+
+
+def _merge_duplicate_rows(
+    block: ConstraintBlock, normalize: bool
+) -> tuple[ConstraintBlock, DeduplicationStats]:
+    """Merge equal (or, if `normalize`, parallel) rows into the tightest one."""
+    indptr, indices = block.indptr, block.indices
+    relations, values = block.relations, block.values
+    groups = _duplicate_groups(indptr, indices, block.data, relations, values)
+    stats = DeduplicationStats(len(block), len(block) - _count(groups))
+    if normalize:
+        data, relations, values = _normalized_rows(block)
+        # coefficients and right-hand sides that differ only by rounding errors
+        # are considered equal
+        groups = _duplicate_groups(
+            indptr, indices, np.round(data, 12), relations, np.round(values, 12)
+        )
+        stats.parallel_rows = len(block) - _count(groups) - stats.duplicate_rows
+    if not stats.removed_rows:
+        return block, stats
+
+    # order the rows of every group by how tight they are, tightest first
+    tightness = np.where(relations == Relation.GreaterEqual, -values, values)
+    order = np.lexsort((tightness, groups))
+    first = np.ones(len(block), dtype=bool)
+    first[1:] = groups[order][1:] != groups[order][:-1]
+    keep = np.zeros(len(block), dtype=bool)
+    keep[order[first]] = True
+    return _compress(block, keep, np.ones(block.nnz, dtype=bool), block.values), stats
+
+
+def _count(groups: np.ndarray) -> int:
+    return int(groups.max(initial=-1)) + 1
+
+
+def _duplicate_groups(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    data: np.ndarray,
+    relations: np.ndarray,
+    values: np.ndarray,
+) -> np.ndarray:
+    """Number the rows of a CSR block so that equal rows get the same number.
+
+    Rows are equal if they have the same relation and coefficients (and, for
+    equality rows, the same right-hand side).  Rows are hashed, sorted by
+    hash, and neighbours with equal hashes are then compared entry by entry,
+    so hash collisions never merge different rows.
+    """
+    num_rows = len(indptr) - 1
+    lengths = np.diff(indptr)
+    entry_rows = np.repeat(np.arange(num_rows), lengths)
+    entry_hashes = _mix(
+        indices.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        + _mix((data + 0.0).view(np.uint64))  # + 0.0 turns -0.0 into 0.0
+    )
+    hashes = np.zeros(num_rows, dtype=np.uint64)
+    np.add.at(hashes, entry_rows, entry_hashes)
+    equality_values = np.where(relations == Relation.Equal, values, 0.0)
+    order = np.lexsort((equality_values, relations, lengths, hashes))
+
+    # candidate pairs: neighbours in sorted order with equal keys
+    prev, curr = order[:-1], order[1:]
+    same = (
+        (hashes[prev] == hashes[curr])
+        & (lengths[prev] == lengths[curr])
+        & (relations[prev] == relations[curr])
+        & (equality_values[prev] == equality_values[curr])
+    )
+    pairs = np.flatnonzero(same)
+    prev, curr = prev[pairs], curr[pairs]
+    counts = lengths[prev]
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    a = np.repeat(indptr[prev], counts) + offsets
+    b = np.repeat(indptr[curr], counts) + offsets
+    equal_entries = (indices[a] == indices[b]) & (data[a] == data[b])
+    unequal = np.bincount(
+        np.repeat(np.arange(len(pairs)), counts)[~equal_entries],
+        minlength=len(pairs),
+    )
+    same[pairs[unequal > 0]] = False
+
+    groups = np.empty(num_rows, dtype=np.int64)
+    groups[order] = np.concatenate([[0], np.cumsum(~same)]) if num_rows else []
+    return groups
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """Scramble the bits of 64-bit integers (the splitmix64 finalizer)."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return cast("np.ndarray", x ^ (x >> np.uint64(31)))
+
+
+def _is_canonical(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray) -> bool:
+    """Whether the indices of each row are strictly increasing, with no zeros."""
+    if len(indptr) == 0 or indptr[0] != 0 or indptr[-1] != len(indices):
+        return False
+    increasing = np.empty(len(indices), dtype=bool)
+    increasing[1:] = indices[1:] > indices[:-1]
+    increasing[indptr[:-1][indptr[:-1] < len(indices)]] = True  # row starts
+    return bool(increasing.all() and data.all() and (np.diff(indptr) >= 0).all())
+
+
+class _QuadraticTerms:
+    """Quadratic terms `sum(values[k] * x[rows[k]] * x[cols[k]])` as COO arrays.
+
+    Terms are stored per ordered pair `(i, j)`, so that setting `(i, j)` does
+    not overwrite a coefficient set for `(j, i)`; `arrays` and `mapping`
+    return them canonically, with mirrored pairs summed: `rows[k] <= cols[k]`,
+    pairs are sorted and unique, and no value is zero.  Single coefficients
+    set with `set` are buffered, and merged into the arrays when these are
+    next needed.
+    """
+
+    def __init__(self) -> None:
+        self._rows, self._cols, self._values = _NO_QUADRATIC_TERMS
+        self._updates: dict[tuple[int, int], float] = {}
+        # the canonical arrays and dict, built on demand
+        self._canonical: tuple[np.ndarray, np.ndarray, np.ndarray] | None = (
+            _NO_QUADRATIC_TERMS
+        )
+        self._mapping: dict[tuple[int, int], float] | None = None
+
+    def set(self, i: int, j: int, value: float) -> None:
+        self._updates[(i, j)] = value
+        self._canonical = self._mapping = None
+
+    def set_all(
+        self, rows: npt.ArrayLike, cols: npt.ArrayLike, values: npt.ArrayLike
+    ) -> int:
+        """Replace all terms, and return the number of variables they need."""
+        r, c = np.asarray(rows), np.asarray(cols)
+        if r.dtype.kind not in "iu" or c.dtype.kind not in "iu":
+            if r.size or c.size:
+                raise TypeError("Variable indices must be integers")
+        r, c = r.astype(np.int64).ravel(), c.astype(np.int64).ravel()
+        v = np.broadcast_to(np.asarray(values, dtype=np.float64), r.shape)
+        if r.shape != c.shape:
+            raise ValueError("rows and cols must have the same length")
+        if len(r) and min(r.min(), c.min()) < 0:
+            raise ValueError("Variable indices must be non-negative")
+        self._store(*_canonical_coo(r, c, v))
+        self._updates.clear()
+        if not len(self._rows):
+            return 0
+        return int(max(self._rows.max(), self._cols.max())) + 1
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._updates:
+            self._merge_updates()
+        if self._canonical is None:
+            rows, cols = self._rows, self._cols
+            r, c, v = _canonical_coo(
+                np.minimum(rows, cols), np.maximum(rows, cols), self._values
+            )
+            self._canonical = (_readonly(r), _readonly(c), _readonly(v))
+        return self._canonical
+
+    def mapping(self) -> dict[tuple[int, int], float]:
+        if self._mapping is None:
+            rows, cols, values = self.arrays()
+            self._mapping = dict(
+                zip(zip(rows.tolist(), cols.tolist()), values.tolist())
+            )
+        return self._mapping
+
+    def _merge_updates(self) -> None:
+        pairs = np.array(list(self._updates), dtype=np.int64).reshape(-1, 2)
+        values = np.fromiter(self._updates.values(), np.float64, len(pairs))
+        self._updates.clear()
+        rows, cols, old_values = self._rows, self._cols, self._values
+        if len(rows):
+            # drop the existing terms that are overwritten
+            width = int(max(rows.max(), cols.max(), pairs.max())) + 1
+            replaced = np.isin(rows * width + cols, pairs[:, 0] * width + pairs[:, 1])
+            rows, cols = rows[~replaced], cols[~replaced]
+            old_values = old_values[~replaced]
+        self._store(
+            *_canonical_coo(
+                np.concatenate([rows, pairs[:, 0]]),
+                np.concatenate([cols, pairs[:, 1]]),
+                np.concatenate([old_values, values]),
+            )
+        )
+
+    def _store(self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray) -> None:
+        self._rows, self._cols = _readonly(rows), _readonly(cols)
+        self._values = _readonly(values)
+        self._canonical = self._mapping = None
+
+    def __len__(self) -> int:
+        return len(self.arrays()[0])
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+# shared by everything without quadratic terms
+_NO_QUADRATIC_TERMS = (
+    _readonly(np.empty(0, dtype=np.int64)),
+    _readonly(np.empty(0, dtype=np.int64)),
+    _readonly(np.empty(0, dtype=np.float64)),
+)
+_NO_QUADRATIC_COEFFICIENTS: Mapping[tuple[int, int], float] = MappingProxyType({})
+
+
+def _canonical_coo(
+    rows: np.ndarray, cols: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sort (row, col) pairs, summing duplicates and dropping zeros."""
+    order = np.lexsort((cols, rows))
+    rows, cols, values = rows[order], cols[order], values[order]
+    if len(rows):
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        if not first.all():
+            starts = np.flatnonzero(first)
+            values = np.add.reduceat(values, starts)
+            rows, cols = rows[starts], cols[starts]
+        nonzero = values != 0
+        if not nonzero.all():
+            rows, cols, values = rows[nonzero], cols[nonzero], values[nonzero]
+    return rows, cols, values
+
+
+def _as_coo(matrix: Any) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (rows, cols, values) of a dense or scipy.sparse square matrix."""
+    indptr, indices, data, shape = _as_csr(matrix)
+    if shape[0] != shape[1]:
+        raise ValueError(f"Expected a square matrix, got shape {shape}")
+    return np.repeat(np.arange(shape[0]), np.diff(indptr)), indices, data
+
+
+def _qcoeffs_to_coo(
+    qcoeffs: QCoeffs,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (rows, cols, values) of quadratic coefficients keyed by pairs."""
+    items = list(qcoeffs.items() if isinstance(qcoeffs, Mapping) else qcoeffs)
+    pairs = np.array([pair for pair, _ in items], dtype=np.int64).reshape(-1, 2)
+    values = np.array([value for _, value in items], dtype=np.float64)
+    return pairs[:, 0], pairs[:, 1], values
+
+
 class Constraints:
-    """An ordered collection of `Constraint` objects."""
+    """An ordered collection of `Constraint` objects and `ConstraintBlock`s."""
 
     def __init__(self) -> None:
         """Create an empty collection of constraints."""
-        self._constraints: list[Constraint] = []
+        self._constraints: list[Constraint | ConstraintBlock] = []
 
     def clear(self) -> None:
         """Remove all constraints from this collection."""
         self._constraints.clear()
 
-    def add(self, constraint: Constraint | Expression) -> None:
-        """Append a `Constraint` (or an `Expression` convertible to one)."""
+    def add(self, constraint: Constraint | ConstraintBlock | Expression) -> None:
+        """Append a `Constraint`, a `ConstraintBlock` or a convertible `Expression`."""
         if isinstance(constraint, Expression):
             self._constraints.append(constraint.as_constraint())
         else:
@@ -130,11 +923,117 @@ class Constraints:
         """Append every constraint from another `Constraints` instance."""
         self._constraints.extend(constraints._constraints)
 
+    def to_block(self) -> ConstraintBlock:
+        """Return all (linear) constraints as a single `ConstraintBlock`.
+
+        Raises
+        ------
+        ValueError
+            If any constraint has quadratic coefficients.
+        """
+        blocks: list[ConstraintBlock] = []
+        singles: list[Constraint] = []
+
+        def flush() -> None:
+            if not singles:
+                return
+            for c in singles:
+                if c.get_quadratic_coefficients():
+                    raise ValueError("Cannot add quadratic constraints to a block")
+            lengths = [len(c._coefs) for c in singles]
+            indptr = np.zeros(len(singles) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=indptr[1:])
+            blocks.append(
+                ConstraintBlock(
+                    indptr,
+                    np.fromiter(
+                        (i for c in singles for i in c._coefs), np.int64, indptr[-1]
+                    ),
+                    np.fromiter(
+                        (v for c in singles for v in c._coefs.values()),
+                        np.float64,
+                        indptr[-1],
+                    ),
+                    [c.get_relation() for c in singles],
+                    [c.get_value() for c in singles],
+                )
+            )
+            singles.clear()
+
+        for item in self._constraints:
+            if isinstance(item, ConstraintBlock):
+                flush()
+                blocks.append(item)
+            else:
+                singles.append(item)
+        flush()
+        return blocks[0] if len(blocks) == 1 else ConstraintBlock.concatenate(blocks)
+
+    def canonicalize(self) -> None:
+        """Scale all linear constraints to canonical form, in place.
+
+        See `ConstraintBlock.canonicalize`.  Afterwards, the linear constraints
+        are stored as one block, followed by the quadratic constraints.
+        """
+        block, quadratic = self._split()
+        self._constraints = [block.canonicalize(), *quadratic]
+
+    def deduplicate(self, normalize: bool = True) -> DeduplicationStats:
+        """Drop linear constraints that repeat another one, in place.
+
+        Of rows with the same coefficients (and, if `normalize`, of rows that
+        are multiples of each other), only the tightest is kept; see
+        `ConstraintBlock.deduplicate`.  Afterwards, the linear constraints are
+        stored as one block, followed by the quadratic constraints.
+
+        Returns
+        -------
+        DeduplicationStats
+            How many rows were dropped.
+        """
+        block, quadratic = self._split()
+        block, stats = block.deduplicate(normalize)
+        self._constraints = [block, *quadratic]
+        return stats
+
+    def stats(self, num_variables: int | None = None) -> ModelStats:
+        """Return the number of rows, nonzeros, relations, etc. of the constraints.
+
+        Blocks are counted in vectorized passes.  Objective and variable
+        statistics are left empty; see `Solver.stats` for those.
+
+        Parameters
+        ----------
+        num_variables : int, optional
+            The number of columns (by default, the largest variable index + 1).
+        """
+        collector = _StatsCollector()
+        for item in self._constraints:
+            collector.add(item)
+        return collector.result(num_variables)
+
+    def _split(self) -> tuple[ConstraintBlock, list[Constraint]]:
+        """Return all linear constraints as one block, and the quadratic ones."""
+        linear = Constraints()
+        quadratic = []
+        for item in self._constraints:
+            if isinstance(item, Constraint) and item.get_quadratic_coefficients():
+                quadratic.append(item)
+            else:
+                linear._constraints.append(item)
+        return linear.to_block(), quadratic
+
     def __len__(self) -> int:
-        return len(self._constraints)
+        return sum(
+            len(c) if isinstance(c, ConstraintBlock) else 1 for c in self._constraints
+        )
 
     def __iter__(self) -> Iterator[Constraint]:
-        return iter(self._constraints)
+        for item in self._constraints:
+            if isinstance(item, ConstraintBlock):
+                yield from item
+            else:
+                yield item
 
 
 class Objective:
@@ -145,7 +1044,7 @@ class Objective:
         self._sense = Sense.Minimize
         self._constant = 0.0
         self._coeffs: list[float] = []
-        self._quad_coeffs: dict[tuple[int, int], float] = {}
+        self._quad_coeffs = _QuadraticTerms()
 
     def set_constant(self, value: float) -> None:
         """Set the constant term added to the objective."""
@@ -182,18 +1081,41 @@ class Objective:
     def set_quadratic_coefficient(
         self, i: SupportsIndex, j: SupportsIndex, value: float
     ) -> None:
-        """Set the quadratic coefficient for the term `x_i * x_j`."""
+        """Set the quadratic coefficient for the term `x_i * x_j`.
+
+        Coefficients set for `(i, j)` and for `(j, i)` are summed.
+        """
         i, j = int(i), int(j)
         if i >= len(self) or j >= len(self):
             self.resize(max(i, j) + 1)
-        if value == 0:
-            self._quad_coeffs.pop((i, j), None)
-        else:
-            self._quad_coeffs[(i, j)] = value
+        self._quad_coeffs.set(i, j, value)
 
     def get_quadratic_coefficients(self) -> Mapping[tuple[int, int], float]:
-        """Return the quadratic coefficients, keyed by variable-index pairs."""
-        return MappingProxyType(self._quad_coeffs)
+        """Return the quadratic coefficients, keyed by pairs `(i, j)` with `i <= j`."""
+        return MappingProxyType(self._quad_coeffs.mapping())
+
+    def set_quadratic_terms(
+        self, rows: npt.ArrayLike, cols: npt.ArrayLike, values: npt.ArrayLike
+    ) -> None:
+        """Replace all quadratic terms by `sum(values[k] * x[rows[k]] * x[cols[k]])`.
+
+        Repeated and mirrored pairs (`(i, j)` and `(j, i)`) are summed, and the
+        objective is resized to cover all variables.
+        """
+        size = self._quad_coeffs.set_all(rows, cols, values)
+        if size > len(self):
+            self.resize(size)
+
+    def set_quadratic_matrix(self, matrix: Any) -> None:
+        """Replace all quadratic terms by `x @ Q @ x` (a dense or scipy.sparse `Q`)."""
+        self.set_quadratic_terms(*_as_coo(matrix))
+
+    def get_quadratic_terms(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the quadratic terms as (read-only) `(rows, cols, values)` arrays.
+
+        Pairs are unique, with `rows[k] <= cols[k]`, sorted, and no value is zero.
+        """
+        return self._quad_coeffs.arrays()
 
     def set_sense(self, sense: Sense) -> None:
         """Set the sense (`Sense.Minimize` or `Sense.Maximize`)."""
@@ -214,7 +1136,10 @@ class Objective:
         constant: float = 0,
         sense: Sense = Sense.Minimize,
     ) -> Objective:
-        """Build an `Objective` from coefficients, a constant, and a sense."""
+        """Build an `Objective` from coefficients, a constant, and a sense.
+
+        Repeated and mirrored pairs in `quadratic_coefficients` are summed.
+        """
         obj = cls()
         iter_coeffs = (
             coefficients.items()
@@ -223,13 +1148,8 @@ class Objective:
         )
         for i, coeff in iter_coeffs:
             obj.set_coefficient(i, coeff)
-        iter_quadratic_coeffs = (
-            quadratic_coefficients.items()
-            if isinstance(quadratic_coefficients, Mapping)
-            else quadratic_coefficients
-        )
-        for (i, j), coeff in iter_quadratic_coeffs:
-            obj.set_quadratic_coefficient(i, j, coeff)
+        if quadratic_coefficients:
+            obj.set_quadratic_terms(*_qcoeffs_to_coo(quadratic_coefficients))
 
         obj.set_constant(constant)
         obj.set_sense(sense)
@@ -0,0 +1,326 @@
+"""Splitting a problem into independent parts that are solved separately."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import fields
+from typing import TYPE_CHECKING, NamedTuple, cast
+
+import numpy as np
+
+from ._components import Constraint, ConstraintBlock, Constraints, Objective
+from ._constants import SolverStatus, VariableType
+from ._solver import Solution, Solver, SolveTimings
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from concurrent.futures import Executor
+
+    from .solver_backends import Preference
+
+__all__ = ["connected_components", "solve_decomposed"]
+
+# if components disagree, the combined status is the first of these that occurs
+_STATUS_PRIORITY = (
+    SolverStatus.INFEASIBLE,
+    SolverStatus.INF_OR_UNBOUNDED,
+    SolverStatus.UNBOUNDED,
+    SolverStatus.NUMERIC,
+)
+
+# components are packed into groups of at least this many variables and
+# (nonzero) constraint coefficients, to amortize the cost of creating a solver
+MIN_GROUP_SIZE = 10_000
+
+
+class _Component(NamedTuple):
+    """An independent part of a problem, with variables renumbered from 0."""
+
+    variables: np.ndarray  # the original index of each variable
+    types: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    objective: Objective
+    constraints: list[Constraint | ConstraintBlock]
+
+
+def connected_components(
+    num_variables: int, heads: np.ndarray, tails: np.ndarray
+) -> np.ndarray:
+    """Label the connected components of a graph on `num_variables` nodes.
+
+    The graph has an (undirected) edge between `heads[k]` and `tails[k]` for
+    every `k`.  Components are found with a vectorized union-find: in every
+    round, the root of each edge's larger endpoint is hooked under the smaller
+    one, and the trees are then flattened by pointer jumping.
+
+    Returns
+    -------
+    np.ndarray
+        The component of every node, numbered `0, 1, ...` in order of the
+        smallest node of each component.
+    """
+    parent = np.arange(num_variables, dtype=np.int64)
+    heads = np.asarray(heads, dtype=np.int64)
+    tails = np.asarray(tails, dtype=np.int64)
+    while True:
+        roots_h, roots_t = parent[heads], parent[tails]
+        merge = roots_h != roots_t
+        if not merge.any():
+            break
+        low = np.minimum(roots_h[merge], roots_t[merge])
+        high = np.maximum(roots_h[merge], roots_t[merge])
+        np.minimum.at(parent, high, low)
+        while not np.array_equal(grandparent := parent[parent], parent):
+            parent = grandparent
+    _, labels = np.unique(parent, return_inverse=True)
+    return cast("np.ndarray", labels.reshape(-1))
+
+
+def solve_decomposed(
+    objective: Objective,
+    constraints: Sequence[Constraint | ConstraintBlock],
+    types: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    preference: Preference,
+    verbose: bool = False,
+    executor: Executor | None = None,
+) -> Solution:
+    """Solve each connected component of a problem separately.
+
+    Two variables are connected if they appear together in a constraint or in
+    a quadratic term of the objective.  Components are packed into groups of
+    at least `MIN_GROUP_SIZE` variables and coefficients (variables without
+    constraints all go into the last group), every group is solved as a
+    separate problem, and the solutions are stitched back together.
+
+    Parameters
+    ----------
+    objective : Objective
+        The objective to optimize.
+    constraints : Sequence[Constraint | ConstraintBlock]
+        The constraints of the problem.
+    types, lower, upper : np.ndarray
+        The type and bounds of every variable.
+    preference : Preference
+        The backend used to solve every component.
+    verbose : bool
+        Whether the backends print their progress.
+    executor : concurrent.futures.Executor, optional
+        Where the components are solved.  By default they are solved one after
+        the other, in this process.  A `ProcessPoolExecutor` solves them in
+        parallel; threads are not safe, since Gurobi models created in one
+        process share the default environment.
+
+    Returns
+    -------
+    Solution
+        The values of all variables, the summed objective, and a status that is
+        `OPTIMAL` only if every group was solved to optimality.  `native_status`
+        is the list of the native statuses of the groups.
+    """
+    start = time.perf_counter()
+    num_variables = len(types)
+    block, quadratic = _split_constraints(constraints)
+    q_rows, q_cols, q_values = objective.get_quadratic_terms()
+
+    # edges between the first variable of every row and each of its variables
+    indptr, indices = block.indptr, block.indices
+    counts = np.diff(indptr)
+    nonempty = counts > 0
+    firsts = np.full(len(block), -1, dtype=np.int64)
+    firsts[nonempty] = indices[indptr[:-1][nonempty]]
+    heads = [np.repeat(firsts, counts), q_rows]
+    tails = [indices, q_cols]
+    for constraint in quadratic:
+        members = _constraint_variables(constraint)
+        heads.append(np.full(len(members), members[0]))
+        tails.append(members)
+    labels = connected_components(
+        num_variables, np.concatenate(heads), np.concatenate(tails)
+    )
+
+    # components without constraints share one group (the last), and small
+    # components are packed together so that every group is worth a solve
+    row_labels = labels[firsts[nonempty]]
+    quad_labels = np.array(
+        [labels[_constraint_variables(c)[0]] for c in quadratic], dtype=np.int64
+    )
+    constrained = np.zeros(labels.max(initial=-1) + 1, dtype=bool)
+    constrained[row_labels] = constrained[quad_labels] = True
+    group_of = np.where(constrained, np.cumsum(constrained) - 1, constrained.sum())
+    row_components = np.full(len(block), constrained.sum(), dtype=np.int64)
+    row_components[nonempty] = group_of[row_labels]
+    num_components = int(constrained.sum()) + 1
+    sizes = np.bincount(group_of[labels], minlength=num_components) + np.bincount(
+        row_components, weights=counts + 1, minlength=num_components
+    ).astype(np.int64)
+    packed = (np.cumsum(sizes) - sizes) // MIN_GROUP_SIZE
+    packed[sizes == 0] = -1
+    _, packed = np.unique(packed, return_inverse=True)
+    packed = packed.reshape(-1) - (sizes == 0).any()
+    group_of = packed[group_of]
+    variable_groups = group_of[labels]
+    row_groups = packed[row_components]
+    num_groups = int(packed.max(initial=-1)) + 1
+
+    var_order, var_bounds = _group(variable_groups, num_groups)
+    local = np.empty(num_variables, dtype=np.int64)
+    local[var_order] = np.arange(num_variables) - np.repeat(
+        var_bounds[:-1], np.diff(var_bounds)
+    )
+    row_order, row_bounds = _group(row_groups, num_groups)
+    q_order, q_bounds = _group(variable_groups[q_rows], num_groups)
+    quad_groups: list[list[Constraint]] = [[] for _ in range(num_groups)]
+    for label, constraint in zip(quad_labels, quadratic):
+        quad_groups[group_of[label]].append(constraint)
+
+    linear = np.zeros(num_variables)
+    coefficients = objective.get_coefficients()[:num_variables]
+    linear[: len(coefficients)] = coefficients
+
+    components = []
+    for g in range(num_groups):
+        variables = var_order[var_bounds[g] : var_bounds[g + 1]]
+        sub_objective = Objective.from_coefficients(
+            linear[variables].tolist(), sense=objective.get_sense()
+        )
+        terms = q_order[q_bounds[g] : q_bounds[g + 1]]
+        if len(terms):
+            sub_objective.set_quadratic_terms(
+                local[q_rows[terms]], local[q_cols[terms]], q_values[terms]
+            )
+        rows = row_order[row_bounds[g] : row_bounds[g + 1]]
+        sub_constraints: list[Constraint | ConstraintBlock] = []
+        if len(rows):
+            sub_constraints.append(_take_rows(block, rows, local))
+        sub_constraints.extend(_renumber(c, local) for c in quad_groups[g])
+        components.append(
+            _Component(
+                variables,
+                types[variables],
+                lower[variables],
+                upper[variables],
+                sub_objective,
+                sub_constraints,
+            )
+        )
+
+    if executor is None or len(components) == 1:
+        solutions = [_solve_component(c, preference, verbose) for c in components]
+    else:
+        futures = [
+            executor.submit(_solve_component, component, preference, verbose)
+            for component in components
+        ]
+        solutions = [future.result() for future in futures]
+
+    values = np.zeros(num_variables)
+    for component, solution in zip(components, solutions):
+        values[component.variables] = np.asarray(solution.variable_values)
+    timings = SolveTimings(
+        **{
+            f.name: sum(getattr(s.timings, f.name) for s in solutions)
+            for f in fields(SolveTimings)
+        }
+    )
+    return Solution(
+        cast("Sequence[float]", values),
+        sum(s.objective_value for s in solutions) + objective.get_constant(),
+        _combined_status([s.status for s in solutions]),
+        time.perf_counter() - start,
+        native_status=[s.native_status for s in solutions],
+        timings=timings,
+    )
+
+
+def _solve_component(
+    component: _Component, preference: Preference, verbose: bool
+) -> Solution:
+    solver = Solver(
+        len(component.variables),
+        VariableType.Continuous,
+        component.types,
+        preference,
+        lower_bounds=component.lower,
+        upper_bounds=component.upper,
+    )
+    solver.set_verbose(verbose)
+    solver.set_objective(component.objective)
+    for constraint in component.constraints:
+        solver.add_constraint(constraint)
+    return solver.solve()
+
+
+def _split_constraints(
+    constraints: Sequence[Constraint | ConstraintBlock],
+) -> tuple[ConstraintBlock, list[Constraint]]:
+    """Stack all linear constraints into one block, keep quadratic ones apart."""
+    linear = Constraints()
+    quadratic = []
+    for constraint in constraints:
+        if (
+            isinstance(constraint, Constraint)
+            and constraint.get_quadratic_coefficients()
+        ):
+            quadratic.append(constraint)
+        else:
+            linear.add(constraint)
+    if not len(linear):
+        return ConstraintBlock([0], [], []), quadratic
+    return linear.to_block(), quadratic
+
+
+def _constraint_variables(constraint: Constraint) -> np.ndarray:
+    rows, cols, _ = constraint.get_quadratic_terms()
+    return np.concatenate(
+        [np.fromiter(constraint.get_coefficients(), np.int64), rows, cols]
+    )
+
+
+def _group(groups: np.ndarray, num_groups: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the positions sorted by group, and where each group starts."""
+    order = np.argsort(groups, kind="stable")
+    bounds = np.zeros(num_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(groups, minlength=num_groups), out=bounds[1:])
+    return order, bounds
+
+
+def _take_rows(
+    block: ConstraintBlock, rows: np.ndarray, local: np.ndarray
+) -> ConstraintBlock:
+    """Return the given rows of `block`, with variables renumbered by `local`."""
+    counts = np.diff(block.indptr)[rows]
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    positions = np.repeat(block.indptr[rows] - indptr[:-1], counts) + np.arange(
+        indptr[-1]
+    )
+    return ConstraintBlock(
+        indptr,
+        local[block.indices[positions]],
+        block.data[positions],
+        block.relations[rows],
+        block.values[rows],
+    )
+
+
+def _renumber(constraint: Constraint, local: np.ndarray) -> Constraint:
+    rows, cols, values = constraint.get_quadratic_terms()
+    renumbered = Constraint.from_coefficients(
+        {int(local[i]): v for i, v in constraint.get_coefficients().items()},
+        relation=constraint.get_relation(),
+        value=constraint.get_value(),
+    )
+    renumbered.set_quadratic_terms(local[rows], local[cols], values)
+    return renumbered
+
+
+def _combined_status(statuses: list[SolverStatus]) -> SolverStatus:
+    if all(status == statuses[0] for status in statuses):
+        return statuses[0]
+    for status in _STATUS_PRIORITY:
+        if status in statuses:
+            return status
+    return next(s for s in statuses if s != SolverStatus.OPTIMAL)
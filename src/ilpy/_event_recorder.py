@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .event_data import EventType
+
+__all__ = ["EventRecorder"]
+
+_EVENT_DTYPE = np.dtype(
+    [
+        ("time", "f8"),
+        ("primalbound", "f8"),
+        ("dualbound", "f8"),
+        ("nodecount", "f8"),
+        ("solcount", "i8"),
+    ]
+)
+_EPS = np.finfo(np.float64).eps
+
+
+class _RingBuffer:
+    """Fixed-capacity structured array that overwrites its oldest rows."""
+
+    __slots__ = ("count", "data")
+
+    def __init__(self, capacity: int) -> None:
+        self.data = np.zeros(capacity, dtype=_EVENT_DTYPE)
+        self.count = 0
+
+    def append(self, row: tuple[float, float, float, float, int]) -> None:
+        self.data[self.count % len(self.data)] = row
+        self.count += 1
+
+    def ordered(self) -> np.ndarray:
+        """Return the retained rows, oldest first."""
+        capacity = len(self.data)
+        if self.count <= capacity:
+            return self.data[: self.count].copy()
+        start = self.count % capacity
+        return np.concatenate([self.data[start:], self.data[:start]])
+
+
+class EventRecorder:
+    """Record solver progress into preallocated NumPy arrays.
+
+    An alternative to an event callback for collecting convergence data: the
+    backend writes a handful of numbers per event (solver time, primal and
+    dual bound, node count and solution count) straight into a fixed-size
+    ring buffer per event type, without building an event dict or calling
+    back into user code.  After solving, `table()` returns the retained
+    events as columns.
+
+    Parameters
+    ----------
+    capacity : int
+        Number of events retained *per event type*.  Once a buffer is full,
+        the oldest events are overwritten (see `dropped`).
+    events : Iterable[str], optional
+        Event types to record (e.g. `{"MIP", "MIPSOL"}` for Gurobi, or
+        `{"BESTSOLFOUND"}` for SCIP).  By default, every event type emitted by
+        the backend is recorded.
+
+    Examples
+    --------
+    ```python
+    recorder = ilpy.EventRecorder(capacity=1000, events={"MIP", "MIPSOL"})
+    solver.set_event_recorder(recorder)
+    solver.solve()
+    table = recorder.table()
+    plt.plot(table["time"], table["gap"])
+    ```
+    """
+
+    def __init__(
+        self, capacity: int = 10_000, events: Iterable[EventType | str] | None = None
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._capacity = capacity
+        self._events = frozenset(events) if events is not None else None
+        self._buffers: dict[str, _RingBuffer] = {}
+
+    @property
+    def capacity(self) -> int:
+        """The number of events retained per event type."""
+        return self._capacity
+
+    def records(self, event_type: str) -> bool:
+        """Return True if events of `event_type` are recorded."""
+        return self._events is None or event_type in self._events
+
+    def record(
+        self,
+        event_type: str,
+        time: float,
+        primalbound: float = np.nan,
+        dualbound: float = np.nan,
+        nodecount: float = np.nan,
+        solcount: int = -1,
+    ) -> None:
+        """Append one event.  Called by the solver backends."""
+        try:
+            buffer = self._buffers[event_type]
+        except KeyError:
+            buffer = self._buffers[event_type] = _RingBuffer(self._capacity)
+        buffer.append((time, primalbound, dualbound, nodecount, solcount))
+
+    @property
+    def event_types(self) -> list[str]:
+        """The event types recorded so far."""
+        return list(self._buffers)
+
+    def dropped(self, event_type: str | None = None) -> int:
+        """Return how many events were overwritten because a buffer was full."""
+        buffers = (
+            self._buffers.values()
+            if event_type is None
+            else [self._buffers[event_type]]
+            if event_type in self._buffers
+            else []
+        )
+        return sum(max(b.count - self._capacity, 0) for b in buffers)
+
+    def table(self, event_type: str | None = None) -> dict[str, np.ndarray]:
+        """Return the retained events as a columnar table.
+
+        The table is a dict mapping column name to a 1D array (e.g. suitable for
+        `pandas.DataFrame`), with columns "time" (solver runtime, seconds),
+        "primalbound", "dualbound", "gap" (relative, `|primal - dual| /
+        |primal|`), "nodecount" and "solcount".  Values a backend does not
+        report for an event type are NaN (or -1 for "solcount").
+
+        If `event_type` is None, the events of all types are merged and sorted
+        by time, and an additional "event_type" column is included.
+        """
+        if event_type is not None:
+            buffer = self._buffers.get(event_type)
+            rows = buffer.ordered() if buffer else np.zeros(0, _EVENT_DTYPE)
+            return self._columns(rows)
+
+        parts = [buf.ordered() for buf in self._buffers.values()]
+        rows = np.concatenate(parts) if parts else np.zeros(0, _EVENT_DTYPE)
+        types = np.repeat(
+            np.array(list(self._buffers), dtype=str), [len(p) for p in parts]
+        )
+        order = np.argsort(rows["time"], kind="stable")
+        return {"event_type": types[order], **self._columns(rows[order])}
+
+    @staticmethod
+    def _columns(rows: np.ndarray) -> dict[str, np.ndarray]:
+        primal, dual = rows["primalbound"], rows["dualbound"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            gap = np.abs(primal - dual) / np.maximum(np.abs(primal), _EPS)
+        return {
+            "time": rows["time"],
+            "primalbound": primal,
+            "dualbound": dual,
+            "gap": gap,
+            "nodecount": rows["nodecount"],
+            "solcount": rows["solcount"],
+        }
+
+    def clear(self) -> None:
+        """Discard all recorded events."""
+        self._buffers.clear()
+
+    def __len__(self) -> int:
+        return sum(min(b.count, self._capacity) for b in self._buffers.values())
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable, Literal
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Callable, Literal
 
-from ._components import Constraint, Objective
+import numpy as np
+
+from ._components import Constraint, ConstraintBlock, Objective, _as_csr
 from ._constants import Relation, Sense, VariableType
+from ._decomposition import solve_decomposed
+from ._model import _default_bounds
+from ._scaling import scale_model
 from ._solver import Solution, Solver
 from .expressions import Expression
 from .solver_backends import Preference
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Sequence
+    from concurrent.futures import Executor
+
+    import numpy.typing as npt
 
+    from ._scaling import ScalingMethod
     from .event_data import EventData
 
     ConstraintTuple = tuple[list[float], Relation | str, float]
@@ -20,13 +30,23 @@ if TYPE_CHECKING:
 
 
 def solve(
-    objective: Sequence[float] | Expression | Objective,
-    constraints: Iterable[ConstraintTuple | Expression | Constraint],
+    objective: Sequence[float] | np.ndarray | Expression | Objective,
+    constraints: Iterable[ConstraintTuple | Expression | Constraint] = (),
     sense: SenseType = Sense.Minimize,
     variable_type: VariableTypeType = VariableType.Continuous,
     verbose: bool = False,
     preference: PreferenceType = Preference.Any,
     on_event: Callable[[EventData], None] | None = None,
+    *,
+    A_ub: Any = None,
+    b_ub: npt.ArrayLike | None = None,
+    A_eq: Any = None,
+    b_eq: npt.ArrayLike | None = None,
+    bounds: Any = None,
+    integrality: npt.ArrayLike | None = None,
+    decompose: bool = False,
+    executor: Executor | None = None,
+    scaling: ScalingMethod | None = None,
 ) -> Solution:
     """Solve an objective subject to constraints.
 
@@ -34,9 +54,15 @@ def solve(
     and sets the objective and constraints, then solves the problem and returns
     the solution.
 
+    Constraints may also be given in matrix form, in the style of
+    `scipy.optimize.linprog` and `scipy.optimize.milp`, as
+    `A_ub @ x <= b_ub` and `A_eq @ x == b_eq`.  The matrices (NumPy arrays or
+    `scipy.sparse` matrices) are passed to the backend in bulk, without
+    creating a Python object per row.
+
     Parameters
     ----------
-    objective : Sequence[float] | Expression | Objective
+    objective : Sequence[float] | np.ndarray | Expression | Objective
         The objective to solve.  If a sequence of floats is provided, it is
         interpreted as the coefficients of the objective. For example, the objective
         2x + 3y would be provided as [2, 3].
@@ -84,6 +110,40 @@ def solve(
         ilpy.solve(..., on_event=callback)
         ```
 
+    A_ub, A_eq : array-like or scipy.sparse matrix, optional
+        Coefficients of the inequality (`A_ub @ x <= b_ub`) and equality
+        (`A_eq @ x == b_eq`) constraints, with one column per variable.
+    b_ub, b_eq : array-like, optional
+        The right-hand sides, one value per row of `A_ub` / `A_eq` (or a scalar).
+    bounds : tuple | Sequence[tuple] | Bounds, optional
+        Variable bounds: one `(lb, ub)` pair for all variables, a sequence of
+        `(lb, ub)` pairs (one per variable), or an object with `lb` and `ub`
+        arrays such as `scipy.optimize.Bounds`.  `None` means no bound.  Unlike
+        in `scipy.optimize.linprog`, variables are unbounded by default (binary
+        variables are bounded by 0 and 1).
+    integrality : array-like of int, optional
+        As in `scipy.optimize.milp`: 0 for a continuous and 1 for an integer
+        variable, per variable (or a scalar for all).  Overrides
+        `variable_type`.
+    decompose : bool, optional
+        If True, the connected components of the problem (variables that share
+        no constraint and no quadratic objective term are in different
+        components) are solved as separate problems, and their solutions are
+        combined into one.  The objective values are summed, and the status is
+        `OPTIMAL` only if every component was solved to optimality.  Cannot be
+        combined with `on_event`.
+    executor : concurrent.futures.Executor, optional
+        Where the components are solved if `decompose` is True.  By default,
+        one after the other; pass a `ProcessPoolExecutor` to solve them in
+        parallel (threads are not safe, as Gurobi models share an environment).
+    scaling : {"geometric", "equilibration"}, optional
+        Scale the rows of the linear constraints and the columns of the
+        continuous variables by powers of two before the model is passed to
+        the backend, to even out badly scaled coefficients (see
+        [`ilpy.analyze_numerics`][]).  "geometric" divides by the geometric
+        mean of the smallest and largest coefficient, "equilibration" by the
+        largest.  The returned solution is in terms of the original variables.
+
     Returns
     -------
     Solution
@@ -101,29 +161,120 @@ def solve(
     elif isinstance(objective, Objective):
         obj = objective
     else:
+        if isinstance(objective, np.ndarray):
+            objective = objective.ravel().tolist()
         obj = Objective.from_coefficients(coefficients=objective, sense=sense)
 
-    solver = Solver(len(obj), variable_type, preference=preference)
-    solver.set_verbose(verbose)
-    solver.set_objective(obj)
+    blocks = [
+        _matrix_block(A, b, relation, name)
+        for A, b, relation, name in (
+            (A_ub, b_ub, Relation.LessEqual, "A_ub"),
+            (A_eq, b_eq, Relation.Equal, "A_eq"),
+        )
+        if A is not None
+    ]
+    num_variables = max([len(obj), *(n for _, n in blocks)])
+    types = None
+    if integrality is not None:
+        flags = np.broadcast_to(np.asarray(integrality), num_variables)
+        if not np.isin(flags, (0, 1)).all():
+            raise ValueError("integrality must be 0 (continuous) or 1 (integer)")
+        types = np.where(flags == 1, VariableType.Integer, VariableType.Continuous)
+    lower, upper = _parse_bounds(bounds, num_variables)
 
+    consts: list[Constraint | ConstraintBlock] = [block for block, _ in blocks]
     for constraint in constraints:
         if isinstance(constraint, Expression):
-            const = constraint.as_constraint()
+            consts.append(constraint.as_constraint())
         elif isinstance(constraint, Constraint):
-            const = constraint
+            consts.append(constraint)
         else:
             coeff, relation, value = constraint
-            const = Constraint.from_coefficients(
-                coefficients=coeff, relation=_op_map[relation], value=value
+            consts.append(
+                Constraint.from_coefficients(
+                    coefficients=coeff, relation=_op_map[relation], value=value
+                )
+            )
+
+    if decompose and on_event is not None:
+        raise ValueError("on_event cannot be used with decompose=True")
+    column_scale = None
+    if decompose or scaling is not None:
+        if types is None:
+            types = np.full(num_variables, variable_type, dtype=np.int8)
+        default_lower, default_upper = _default_bounds(types)
+        lower = default_lower if lower is None else lower
+        upper = default_upper if upper is None else upper
+        if scaling is not None:
+            obj, consts, lower, upper, column_scale = scale_model(
+                obj, consts, types, lower, upper, scaling
+            )
+        if decompose:
+            solution = solve_decomposed(
+                obj, consts, types, lower, upper, preference, verbose, executor
             )
-        solver.add_constraint(const)
 
-    solver.set_event_callback(on_event)
-    solution = solver.solve()
+    if not decompose:
+        solver = Solver(
+            num_variables,
+            variable_type,
+            types,
+            preference=preference,
+            lower_bounds=lower,
+            upper_bounds=upper,
+        )
+        solver.set_verbose(verbose)
+        solver.set_objective(obj)
+        for const in consts:
+            solver.add_constraint(const)
+
+        solver.set_event_callback(on_event)
+        solution = solver.solve()
+
+    if column_scale is not None:
+        solution = replace(solution, variable_values=solution.values() * column_scale)
     return solution
 
 
+def _matrix_block(
+    matrix: Any, rhs: npt.ArrayLike | None, relation: Relation, name: str
+) -> tuple[ConstraintBlock, int]:
+    """Return the rows of a matrix constraint, and its number of columns."""
+    if rhs is None:
+        raise ValueError(f"{name} requires b_{name[2:]}")
+    indptr, indices, data, (num_rows, num_cols) = _as_csr(matrix)
+    values = np.asarray(rhs, dtype=np.float64)
+    if values.ndim and values.shape != (num_rows,):
+        raise ValueError(
+            f"b_{name[2:]} must have one value per row of {name} ({num_rows}), "
+            f"got shape {values.shape}"
+        )
+    return ConstraintBlock(indptr, indices, data, relation, values), num_cols
+
+
+def _parse_bounds(
+    bounds: Any, num_variables: int
+) -> tuple[np.ndarray | None, np.ndarray | None]:
+    """Convert linprog/milp-style bounds to lower and upper bound arrays."""
+    if bounds is None:
+        return None, None
+    if hasattr(bounds, "lb") and hasattr(bounds, "ub"):  # scipy.optimize.Bounds
+        lower = np.asarray(bounds.lb, dtype=np.float64)
+        upper = np.asarray(bounds.ub, dtype=np.float64)
+    else:
+        # None becomes NaN, i.e. "no bound"
+        pairs = np.asarray(bounds, dtype=np.float64)
+        if pairs.shape[-1:] != (2,) or pairs.ndim > 2:
+            raise ValueError("bounds must be a (lb, ub) pair or a sequence of pairs")
+        lower, upper = pairs[..., 0], pairs[..., 1]
+    lower = np.where(np.isnan(lower), -np.inf, lower)
+    upper = np.where(np.isnan(upper), np.inf, upper)
+    return (
+        np.broadcast_to(lower, num_variables),
+        np.broadcast_to(upper, num_variables),
+    )
+
+
 _op_map = {
     Relation.GreaterEqual: Relation.GreaterEqual,
     Relation.LessEqual: Relation.LessEqual,
@@ -0,0 +1,255 @@
+"""A registry of decision variables that assigns their indices."""
+
+from __future__ import annotations
+
+import bisect
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from ._arrays import VariableArray
+from ._constants import VariableType
+from .expressions import Variable
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+__all__ = ["Model"]
+
+INF = float("inf")
+
+
+class Model:
+    """A registry of decision variables.
+
+    Every variable created by a `Model` is given the next free index, so there
+    is no need to keep track of indices (or of the number of variables) by hand.
+    Types and bounds are stored in compact NumPy arrays rather than on the
+    `Variable` objects, and a [`Solver`][ilpy.Solver] for the model is created
+    with [`Solver.from_model`][ilpy.Solver.from_model].
+
+    Parameters
+    ----------
+    default_variable_type : VariableType
+        The type of variables created without an explicit `vtype`.
+
+    Examples
+    --------
+    ```python
+    model = ilpy.Model()
+    x = model.add_variables(100, name="x", vtype=ilpy.Binary)
+    budget = model.add_variable("budget", lb=0, ub=10)
+    solver = ilpy.Solver.from_model(model)
+    solver.add_constraint(x.sum() <= budget)
+    ```
+    """
+
+    def __init__(
+        self, default_variable_type: VariableType = VariableType.Continuous
+    ) -> None:
+        self.default_variable_type = VariableType(default_variable_type)
+        self._size = 0
+        self._types = np.empty(0, dtype=np.int8)
+        self._lower = np.empty(0, dtype=np.float64)
+        self._upper = np.empty(0, dtype=np.float64)
+        # names of single variables, and of blocks of variables (by prefix)
+        self._names: dict[int, str] = {}
+        self._indices_by_name: dict[str, int] = {}
+        self._block_starts: list[int] = []
+        self._blocks: list[tuple[int, int, str]] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def num_variables(self) -> int:
+        """The number of variables in the model."""
+        return self._size
+
+    @property
+    def variable_types(self) -> np.ndarray:
+        """The type of every variable (as `VariableType` integer values)."""
+        return self._view(self._types)
+
+    @property
+    def lower_bounds(self) -> np.ndarray:
+        """The lower bound of every variable."""
+        return self._view(self._lower)
+
+    @property
+    def upper_bounds(self) -> np.ndarray:
+        """The upper bound of every variable."""
+        return self._view(self._upper)
+
+    def _view(self, array: np.ndarray) -> np.ndarray:
+        view = array[: self._size]
+        view.flags.writeable = False
+        return view
+
+    def add_variable(
+        self,
+        name: str | None = None,
+        vtype: VariableType | None = None,
+        lb: float | None = None,
+        ub: float | None = None,
+    ) -> Variable:
+        """Create a single variable.
+
+        Parameters
+        ----------
+        name : str, optional
+            A name for the variable.  Names must be unique, also among the
+            names of blocks of variables; unnamed variables are named
+            `x{index}`.
+        vtype : VariableType, optional
+            The type of the variable (`default_variable_type` if not given).
+        lb, ub : float, optional
+            The bounds of the variable.  By default binary variables are
+            bounded by 0 and 1, all others are unbounded.
+        """
+        if name is None:
+            name = f"x{self._size}"
+        if self._find(name) is not None:
+            raise ValueError(f"A variable named {name!r} already exists")
+        index = self._allocate(1, vtype, lb, ub)
+        self._indices_by_name[name] = index
+        self._names[index] = name
+        return Variable(name, index=index)
+
+    def add_variables(
+        self,
+        shape: int | tuple[int, ...],
+        name: str = "x",
+        vtype: VariableType | npt.ArrayLike | None = None,
+        lb: npt.ArrayLike | None = None,
+        ub: npt.ArrayLike | None = None,
+    ) -> VariableArray:
+        """Create a block of variables with consecutive indices.
+
+        Parameters
+        ----------
+        shape : int | tuple[int, ...]
+            The shape of the returned `VariableArray`.
+        name : str
+            Prefix of the variable names: the variable with index `i` is named
+            `{name}{i}`.  These names must not be taken by single variables.
+        vtype, lb, ub : scalar or array-like, optional
+            Types and bounds, broadcast to `shape` (see `add_variable`).
+        """
+        count = int(np.prod(shape))
+        start, stop = self._size, self._size + count
+        # look up whichever is fewer: the new names, or the single names
+        if count <= len(self._indices_by_name):
+            names = (f"{name}{i}" for i in range(start, stop))
+            taken = next((n for n in names if n in self._indices_by_name), None)
+        else:
+            taken = next(
+                (
+                    n
+                    for n in self._indices_by_name
+                    if start <= _block_index(n, name) < stop
+                ),
+                None,
+            )
+        if taken is not None:
+            raise ValueError(f"A variable named {taken!r} already exists")
+        self._allocate(count, vtype, lb, ub, shape)
+        if count:
+            self._block_starts.append(start)
+            self._blocks.append((start, start + count, name))
+        return VariableArray(shape, start=start, name=name)
+
+    def _allocate(
+        self,
+        count: int,
+        vtype: Any,
+        lb: Any,
+        ub: Any,
+        shape: int | tuple[int, ...] = 1,
+    ) -> int:
+        """Reserve `count` indices, store their types and bounds, return the first."""
+        start, stop = self._size, self._size + count
+        if stop > len(self._types):
+            capacity = max(stop, 2 * len(self._types), 16)
+            self._types = np.resize(self._types, capacity)
+            self._lower = np.resize(self._lower, capacity)
+            self._upper = np.resize(self._upper, capacity)
+
+        if vtype is None:
+            vtype = self.default_variable_type
+        types, lower, upper = _variable_attributes(shape, vtype, lb, ub)
+        self._types[start:stop] = types
+        self._lower[start:stop] = lower
+        self._upper[start:stop] = upper
+        self._size = stop
+        return start
+
+    def variable(self, key: int | str) -> Variable:
+        """Return the variable with the given index or name."""
+        index = self.index_of(key) if isinstance(key, str) else int(key)
+        if not 0 <= index < self._size:
+            raise IndexError(f"Variable index {index} out of range")
+        return Variable(self.name_of(index), index=index)
+
+    def name_of(self, index: int) -> str:
+        """Return the name of the variable with the given index."""
+        if (name := self._names.get(index)) is not None:
+            return name
+        pos = bisect.bisect_right(self._block_starts, index) - 1
+        if pos >= 0:
+            start, stop, prefix = self._blocks[pos]
+            if start <= index < stop:
+                return f"{prefix}{index}"
+        raise IndexError(f"Variable index {index} out of range")
+
+    def index_of(self, name: str) -> int:
+        """Return the index of the variable with the given name."""
+        if (index := self._find(name)) is None:
+            raise KeyError(f"No variable named {name!r}")
+        return index
+
+    def _find(self, name: str) -> int | None:
+        """Return the index of the variable named `name`, or None."""
+        if (index := self._indices_by_name.get(name)) is not None:
+            return index
+        for start, stop, prefix in self._blocks:
+            if start <= (index := _block_index(name, prefix)) < stop:
+                return index
+        return None
+
+    def __repr__(self) -> str:
+        return f"<ilpy.Model with {self._size} variables>"
+
+
+def _block_index(name: str, prefix: str) -> int:
+    """Return `i` if `name` is `{prefix}{i}`, and -1 otherwise."""
+    suffix = name[len(prefix) :]
+    if name.startswith(prefix) and suffix.isdecimal() and suffix == str(int(suffix)):
+        return int(suffix)
+    return -1
+
+
+def _default_bounds(types: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the default bounds for variables of the given types.
+
+    Binary variables are bounded by 0 and 1, all others are unbounded.
+    """
+    binary = types == VariableType.Binary
+    return np.where(binary, 0.0, -INF), np.where(binary, 1.0, INF)
+
+
+def _variable_attributes(
+    shape: int | tuple[int, ...], vtype: Any, lb: Any, ub: Any
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Broadcast types and bounds (None: the default) to flat arrays."""
+    types = np.broadcast_to(np.asarray(vtype, dtype=np.int8), shape).ravel()
+    if not np.isin(types, list(VariableType)).all():
+        raise ValueError("vtype must be an ilpy.VariableType")
+    lower, upper = _default_bounds(types)
+    if lb is not None:
+        lower = np.broadcast_to(np.asarray(lb, dtype=np.float64), shape).ravel()
+    if ub is not None:
+        upper = np.broadcast_to(np.asarray(ub, dtype=np.float64), shape).ravel()
+    if (lower > upper).any():
+        raise ValueError("Lower bounds must not exceed upper bounds")
+    return types, lower, upper
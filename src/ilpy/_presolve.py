@@ -0,0 +1,192 @@
+"""Array-based reductions of linear constraints before they reach a backend."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+
+from ._components import ConstraintBlock, _compress, _merge_duplicate_rows
+from ._constants import Relation, VariableType
+
+__all__ = ["PresolveStats", "presolve"]
+
+# constraints violated by at most this much are considered satisfied (the
+# default feasibility tolerance of Gurobi and SCIP)
+FEASIBILITY_TOLERANCE = 1e-6
+# bounds of integer variables within this distance of an integer are rounded
+# to it rather than away from it
+_ROUNDING_TOLERANCE = 1e-5
+
+_LE, _GE, _EQ = Relation.LessEqual, Relation.GreaterEqual, Relation.Equal
+
+
+@dataclass
+class PresolveStats:
+    """What a presolve pass removed from the constraints it was given.
+
+    Attributes
+    ----------
+    rows : int
+        The number of rows presolve was given.
+    empty_rows : int
+        Rows without (unfixed) variables, which were checked and dropped.
+    singleton_rows : int
+        Rows with a single (unfixed) variable, turned into bounds.
+    duplicate_rows : int
+        Rows that are equal to (or a multiple of) another row, merged into the
+        one with the tightest right-hand side.
+    fixed_variables : int
+        Variables with equal lower and upper bounds, substituted out of rows.
+    tightened_bounds : int
+        The number of variable bounds tightened by singleton rows.
+    """
+
+    rows: int = 0
+    empty_rows: int = 0
+    singleton_rows: int = 0
+    duplicate_rows: int = 0
+    fixed_variables: int = 0
+    tightened_bounds: int = 0
+
+    @property
+    def removed_rows(self) -> int:
+        """The number of rows that are not passed on to the backend."""
+        return self.empty_rows + self.singleton_rows + self.duplicate_rows
+
+
+class PresolveResult(NamedTuple):
+    block: ConstraintBlock
+    """The remaining rows."""
+    lower: np.ndarray
+    upper: np.ndarray
+    """The bounds of all variables, tightened by singleton rows."""
+    implied_lower: np.ndarray
+    implied_upper: np.ndarray
+    """The bounds implied by singleton rows alone (infinite where there are none)."""
+    substituted: np.ndarray
+    """Which (fixed) variables were substituted out of the rows."""
+    infeasible: bool
+    stats: PresolveStats
+
+
+def presolve(
+    block: ConstraintBlock, types: np.ndarray, lower: np.ndarray, upper: np.ndarray
+) -> PresolveResult:
+    """Remove the rows of `block` that a backend does not need to see.
+
+    Fixed variables are substituted into the right-hand sides, rows left
+    without variables are checked and dropped, rows with a single variable
+    become bounds (rounded for integer variables), and this is repeated until
+    nothing changes.  Finally, duplicate and parallel rows are merged (see
+    `ConstraintBlock.deduplicate`).
+
+    Parameters
+    ----------
+    block : ConstraintBlock
+        The linear constraints.
+    types, lower, upper : np.ndarray
+        The type and bounds of every variable.
+
+    Returns
+    -------
+    PresolveResult
+        The reduced rows and bounds.  If `infeasible` is True, a row or bound
+        was found that no solution can satisfy, and the other fields are only
+        partially reduced.
+    """
+    num_rows = len(block)
+    indptr, indices, data = block.indptr, block.indices, block.data
+    relations, rhs = block.relations, block.values.copy()
+    lower = np.array(lower, dtype=np.float64)
+    upper = np.array(upper, dtype=np.float64)
+    implied_lower = np.full(len(types), -np.inf)
+    implied_upper = np.full(len(types), np.inf)
+    integral = types != VariableType.Continuous
+    entry_rows = np.repeat(np.arange(num_rows), np.diff(indptr))
+    alive = np.ones(len(indices), dtype=bool)
+    keep = np.ones(num_rows, dtype=bool)
+    substituted = np.zeros(len(types), dtype=bool)
+    stats = PresolveStats(rows=num_rows)
+
+    def result(infeasible: bool = False) -> PresolveResult:
+        reduced = _compress(block, keep, alive, rhs)
+        if not infeasible:
+            reduced, merged = _merge_duplicate_rows(reduced, normalize=True)
+            stats.duplicate_rows = merged.removed_rows
+        stats.fixed_variables = int(substituted.sum())
+        return PresolveResult(
+            reduced,
+            lower,
+            upper,
+            implied_lower,
+            implied_upper,
+            substituted,
+            infeasible,
+            stats,
+        )
+
+    while True:
+        # substitute fixed variables into the right-hand sides
+        fixed = (lower == upper) & np.isfinite(lower)
+        dead = alive & fixed[indices]
+        if dead.any():
+            substituted[indices[dead]] = True
+            rhs -= np.bincount(
+                entry_rows[dead],
+                weights=data[dead] * lower[indices[dead]],
+                minlength=num_rows,
+            )
+            alive &= ~dead
+        lengths = np.bincount(entry_rows[alive], minlength=num_rows)
+
+        # rows without variables are either always or never satisfied
+        empty = np.flatnonzero(keep & (lengths == 0))
+        if _violated(relations[empty], rhs[empty]).any():
+            return result(infeasible=True)
+        keep[empty] = False
+        stats.empty_rows += len(empty)
+
+        # rows with one variable become bounds
+        singles = keep & (lengths == 1)
+        if not singles.any():
+            break
+        entries = np.flatnonzero(alive & singles[entry_rows])
+        rows, cols, coefs = entry_rows[entries], indices[entries], data[entries]
+        bounds = rhs[rows] / coefs
+        rel = relations[rows]
+        sets_upper = (rel == _EQ) | ((rel == _LE) == (coefs > 0))
+        sets_lower = (rel == _EQ) | ((rel == _GE) == (coefs > 0))
+        np.minimum.at(implied_upper, cols[sets_upper], bounds[sets_upper])
+        np.maximum.at(implied_lower, cols[sets_lower], bounds[sets_lower])
+        new_lower = np.maximum(lower, implied_lower)
+        new_upper = np.minimum(upper, implied_upper)
+        new_lower[integral] = np.ceil(new_lower[integral] - _ROUNDING_TOLERANCE)
+        new_upper[integral] = np.floor(new_upper[integral] + _ROUNDING_TOLERANCE)
+        stats.tightened_bounds += int(
+            (new_lower > lower).sum() + (new_upper < upper).sum()
+        )
+        lower, upper = new_lower, new_upper
+        keep[singles] = False
+        stats.singleton_rows += int(singles.sum())
+
+        crossed = lower > upper
+        if (lower[crossed] > upper[crossed] + FEASIBILITY_TOLERANCE).any():
+            return result(infeasible=True)
+        upper[crossed] = lower[crossed]
+
+    return result()
+
+
+def _violated(relations: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+    """Whether `0 <relation> rhs` is violated, for every row."""
+    return np.where(
+        relations == _LE,
+        rhs < -FEASIBILITY_TOLERANCE,
+        np.where(
+            relations == _GE,
+            rhs > FEASIBILITY_TOLERANCE,
+            np.abs(rhs) > FEASIBILITY_TOLERANCE,
+        ),
+    )
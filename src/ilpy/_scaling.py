@@ -0,0 +1,270 @@
+"""Coefficient statistics, and row and column scaling of a model."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+
+from ._components import (
+    Constraint,
+    ConstraintBlock,
+    Constraints,
+    Objective,
+    _StatsCollector,
+)
+from ._constants import VariableType
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import numpy.typing as npt
+
+    ScalingMethod = Literal["geometric", "equilibration"]
+
+__all__ = ["NumericsReport", "analyze_numerics"]
+
+# the number of alternating row and column passes of geometric scaling
+GEOMETRIC_PASSES = 4
+
+
+@dataclass
+class NumericsReport:
+    """Magnitudes of the numbers in a model, to diagnose numerical trouble.
+
+    Ranges are over absolute values, ignoring zeros (and infinite bounds).
+    Rows without coefficients, columns that appear in no row, and empty
+    ranges are reported as NaN.
+
+    Attributes
+    ----------
+    row_min, row_max : np.ndarray
+        The smallest and largest coefficient of every row.
+    column_min, column_max : np.ndarray
+        The smallest and largest coefficient of every column (variable).
+    matrix_range : tuple[float, float]
+        The smallest and largest coefficient in the constraint matrix.
+    rhs_range : tuple[float, float]
+        The smallest and largest right-hand side.
+    objective_range : tuple[float, float]
+        The smallest and largest (linear) objective coefficient.
+    bounds_range : tuple[float, float]
+        The smallest and largest finite variable bound.
+    """
+
+    row_min: np.ndarray
+    row_max: np.ndarray
+    column_min: np.ndarray
+    column_max: np.ndarray
+    matrix_range: tuple[float, float]
+    rhs_range: tuple[float, float]
+    objective_range: tuple[float, float] = (np.nan, np.nan)
+    bounds_range: tuple[float, float] = (np.nan, np.nan)
+
+    @property
+    def matrix_ratio(self) -> float:
+        """The ratio of the largest to the smallest matrix coefficient.
+
+        Solvers start to struggle with ratios above about 1e6 to 1e9.
+        """
+        low, high = self.matrix_range
+        return float(high / low)
+
+    def __str__(self) -> str:
+        def fmt(name: str, low: float, high: float) -> str:
+            return f"  {name:<10} [{low:.0e}, {high:.0e}]"
+
+        return "\n".join(
+            [
+                "Coefficient ranges:",
+                fmt("matrix", *self.matrix_range),
+                fmt("objective", *self.objective_range),
+                fmt("bounds", *self.bounds_range),
+                fmt("rhs", *self.rhs_range),
+            ]
+        )
+
+
+def analyze_numerics(
+    constraints: ConstraintBlock | Constraints,
+    num_variables: int | None = None,
+    objective: Objective | None = None,
+    lower: npt.ArrayLike | None = None,
+    upper: npt.ArrayLike | None = None,
+) -> NumericsReport:
+    """Report the ranges of coefficients, right-hand sides, and bounds.
+
+    All statistics are computed in vectorized passes over the constraint
+    arrays.  Only linear coefficients are considered.
+
+    Parameters
+    ----------
+    constraints : ConstraintBlock | Constraints
+        The constraints to analyze.
+    num_variables : int, optional
+        The number of columns (by default, the largest variable index + 1).
+    objective : Objective, optional
+        An objective, whose linear coefficients are included.
+    lower, upper : array-like, optional
+        Variable bounds to include.
+
+    Returns
+    -------
+    NumericsReport
+        The magnitudes of all numbers.
+    """
+    if isinstance(constraints, Constraints):
+        constraints, _ = constraints._split()
+    block = constraints
+    if num_variables is None:
+        num_variables = int(block.indices.max(initial=-1)) + 1
+    magnitudes = np.abs(block.data)
+    rows = np.repeat(np.arange(len(block)), np.diff(block.indptr))
+    collector = _StatsCollector()
+    collector.add(block)
+    collector.set_objective(objective)
+    stats = collector.result(
+        lower=None if lower is None else np.asarray(lower, dtype=np.float64),
+        upper=None if upper is None else np.asarray(upper, dtype=np.float64),
+    )
+    return NumericsReport(
+        _grouped(np.minimum, rows, magnitudes, len(block)),
+        _grouped(np.maximum, rows, magnitudes, len(block)),
+        _grouped(np.minimum, block.indices, magnitudes, num_variables),
+        _grouped(np.maximum, block.indices, magnitudes, num_variables),
+        stats.matrix_range,
+        stats.rhs_range,
+        stats.objective_range,
+        stats.bounds_range,
+    )
+
+
+def _grouped(
+    ufunc: np.ufunc, groups: np.ndarray, values: np.ndarray, size: int
+) -> np.ndarray:
+    """Reduce `values` by group with `ufunc` (NaN for empty groups)."""
+    initial = np.inf if ufunc is np.minimum else -np.inf
+    result = np.full(size, initial)
+    ufunc.at(result, groups, values)
+    result[np.isinf(result)] = np.nan
+    return result
+
+
+def scaling_factors(
+    block: ConstraintBlock, types: np.ndarray, method: ScalingMethod = "geometric"
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return row and column factors that even out the coefficients of `block`.
+
+    Row `i` is multiplied by `row_scale[i]`, and column `j` by
+    `column_scale[j]`, i.e. variable `x[j]` is replaced by
+    `column_scale[j] * y[j]`.  Only continuous columns are scaled, and all
+    factors are powers of two, so that scaling does not introduce rounding
+    errors.
+
+    Parameters
+    ----------
+    block : ConstraintBlock
+        The linear constraints.
+    types : np.ndarray
+        The type of every variable.
+    method : {"geometric", "equilibration"}
+        "geometric" repeatedly divides rows and columns by the geometric mean
+        of their smallest and largest coefficients, "equilibration" divides
+        rows and then columns by their largest coefficient.
+    """
+    if method not in ("geometric", "equilibration"):
+        raise ValueError(f"Unknown scaling method {method!r}")
+    num_rows, num_columns = len(block), len(types)
+    rows = np.repeat(np.arange(num_rows), np.diff(block.indptr))
+    cols = block.indices
+    magnitudes = np.abs(block.data)
+    scalable = types == VariableType.Continuous
+    row_scale, column_scale = np.ones(num_rows), np.ones(num_columns)
+
+    def factors(groups: np.ndarray, size: int) -> np.ndarray:
+        scaled = magnitudes * row_scale[rows] * column_scale[cols]
+        high = _grouped(np.maximum, groups, scaled, size)
+        if method == "geometric":
+            high = np.sqrt(high * _grouped(np.minimum, groups, scaled, size))
+        # round to powers of two, leaving empty rows and columns alone
+        return np.where(np.isnan(high), 1.0, np.exp2(-np.round(np.log2(high))))
+
+    for _ in range(GEOMETRIC_PASSES if method == "geometric" else 1):
+        row_scale *= factors(rows, num_rows)
+        column_scale *= np.where(scalable, factors(cols, num_columns), 1.0)
+    return row_scale, column_scale
+
+
+def scale_model(
+    objective: Objective,
+    constraints: Sequence[Constraint | ConstraintBlock],
+    types: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    method: ScalingMethod = "geometric",
+) -> tuple[
+    Objective, list[Constraint | ConstraintBlock], np.ndarray, np.ndarray, np.ndarray
+]:
+    """Scale a model, and return it with the column factors to unscale values.
+
+    Quadratic constraints and the objective are not row-scaled, but their
+    variables are column-scaled like those of the linear constraints.
+
+    Returns
+    -------
+    tuple
+        The scaled objective, constraints, lower and upper bounds, and the
+        column factors: a solution `y` of the scaled model corresponds to the
+        solution `column_scale * y` of the original one.
+    """
+    collection = Constraints()
+    for constraint in constraints:
+        collection.add(constraint)
+    block, quadratic = collection._split()
+    row_scale, column_scale = scaling_factors(block, types, method)
+    rows = np.repeat(np.arange(len(block)), np.diff(block.indptr))
+    scaled: list[Constraint | ConstraintBlock] = [
+        ConstraintBlock(
+            block.indptr,
+            block.indices,
+            block.data * row_scale[rows] * column_scale[block.indices],
+            block.relations,
+            block.values * row_scale,
+        )
+    ]
+    scaled.extend(_scale_columns(c, column_scale) for c in quadratic)
+
+    coefficients = np.zeros(len(types))
+    given = objective.get_coefficients()[: len(types)]
+    coefficients[: len(given)] = given
+    q_rows, q_cols, q_values = objective.get_quadratic_terms()
+    scaled_objective = Objective.from_coefficients(
+        (coefficients * column_scale).tolist(),
+        constant=objective.get_constant(),
+        sense=objective.get_sense(),
+    )
+    if len(q_values):
+        scaled_objective.set_quadratic_terms(
+            q_rows, q_cols, q_values * column_scale[q_rows] * column_scale[q_cols]
+        )
+    return (
+        scaled_objective,
+        scaled,
+        lower / column_scale,
+        upper / column_scale,
+        column_scale,
+    )
+
+
+def _scale_columns(constraint: Constraint, column_scale: np.ndarray) -> Constraint:
+    rows, cols, values = constraint.get_quadratic_terms()
+    scaled = Constraint.from_coefficients(
+        {i: v * column_scale[i] for i, v in constraint.get_coefficients().items()},
+        relation=constraint.get_relation(),
+        value=constraint.get_value(),
+    )
+    scaled.set_quadratic_terms(
+        rows, cols, values * column_scale[rows] * column_scale[cols]
+    )
+    return scaled
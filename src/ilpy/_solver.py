@@ -1,20 +1,82 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Callable
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field, fields
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Literal, cast, overload
 
-from .expressions import Expression
+import numpy as np
+
+from ._components import (
+    Constraint,
+    ConstraintBlock,
+    Constraints,
+    ModelStats,
+    _StatsCollector,
+)
+from ._constants import VariableType
+from ._model import _default_bounds, _variable_attributes
+from ._presolve import PresolveStats, presolve
+from .expressions import Expression, Variable
 from .solver_backends import Preference, SolverBackend, create_solver_backend
+from .tracing import _NOOP_SPAN, NoOpTracer, get_tracer
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
 
-    import numpy as np
     import numpy.typing as npt
 
-    from ._components import Constraint, Constraints, Objective
-    from ._constants import SolverStatus, VariableType
-    from .event_data import EventData
+    from ._components import Objective
+    from ._constants import SolverStatus
+    from ._event_recorder import EventRecorder
+    from ._model import Model
+    from .event_data import EventData, EventType
+    from .tracing import Span, Tracer
+
+# values at most this far from an integer are considered integral (the default
+# integrality tolerance of Gurobi)
+INTEGRALITY_TOLERANCE = 1e-5
+
+
+@dataclass
+class SolveTimings:
+    """Breakdown of where the wall-clock time (in seconds) of a solve went.
+
+    The model-building phases are accumulated by `Solver` over every call made
+    since it was created; the solving phases are reported by the backend for
+    the most recent call to `Solver.solve`.
+
+    Attributes
+    ----------
+    backend_creation : float
+        Creating the native backend (and its model object).
+    variable_creation : float
+        Creating the decision variables in the native model.
+    objective_transfer : float
+        Converting and passing objectives to the backend.
+    constraint_transfer : float
+        Converting and passing constraints to the backend.
+    presolve : float
+        Time the native solver spent presolving.
+    search : float
+        Time the native solver spent after presolve (LP solves, branching, ...).
+    solution_extraction : float
+        Reading the solution back out of the native model.
+    """
+
+    backend_creation: float = 0.0
+    variable_creation: float = 0.0
+    objective_transfer: float = 0.0
+    constraint_transfer: float = 0.0
+    presolve: float = 0.0
+    search: float = 0.0
+    solution_extraction: float = 0.0
+
+    @property
+    def total(self) -> float:
+        """The sum of all phases."""
+        return float(sum(getattr(self, f.name) for f in fields(self)))
 
 
 @dataclass
@@ -34,6 +96,8 @@ class Solution:
     native_status : Any
         The backend-specific status object, for callers who need more detail
         than `SolverStatus` provides.
+    timings : SolveTimings
+        Per-phase breakdown of the time spent building and solving the model.
     """
 
     variable_values: Sequence[float]
@@ -41,12 +105,11 @@ class Solution:
     status: SolverStatus
     time: float
     native_status: Any = None
+    timings: SolveTimings = field(default_factory=SolveTimings)
 
     def __array__(
         self, dtype: npt.DTypeLike | None = None, copy: bool | None = None
     ) -> np.ndarray:
-        import numpy as np
-
         return np.asarray(self.variable_values, dtype=dtype, copy=copy)
 
     def __iter__(self) -> Iterator[float]:
@@ -60,13 +123,154 @@ class Solution:
         return self.variable_values[key]
 
     def __setitem__(self, key: int, value: float) -> None:
+        self.detach()
         self.variable_values[key] = value  # type: ignore
 
+    def values(self, indices: npt.ArrayLike | None = None) -> np.ndarray:
+        """Return the values of the variables at `indices` (all, if None).
+
+        For a lazy solution, only the requested values are read from the
+        native model (unless all values were already fetched).
+        """
+        idx = None if indices is None else np.asarray(indices, dtype=np.int64)
+        if isinstance(self.variable_values, _LazyValues):
+            return self.variable_values.fetch(idx)
+        values = np.asarray(self.variable_values, dtype=np.float64)
+        return values if idx is None else values[idx]
+
+    def nonzero(self, tol: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+        """Return the indices and values of the variables with `|value| > tol`."""
+        values = self.values()
+        indices = np.flatnonzero(np.abs(values) > tol)
+        return indices, values[indices]
+
+    def selected(self, threshold: float = 0.5) -> np.ndarray:
+        """Return the indices of the variables with a value above `threshold`.
+
+        For binary variables, these are the variables set to 1.
+        """
+        values = self._integer_values()
+        if values is None:
+            values = self.values()
+        return np.flatnonzero(values > threshold)
+
+    def as_integer(self, tol: float = INTEGRALITY_TOLERANCE) -> np.ndarray:
+        """Return the values rounded to the nearest integers, as an int64 array.
+
+        Raises a `ValueError` if a value is more than `tol` away from an integer.
+        """
+        if (integers := self._integer_values()) is not None:
+            return integers.astype(np.int64)
+        values = self.values()
+        rounded: np.ndarray = np.rint(values)
+        deviation = np.abs(values - rounded)
+        if (deviation > tol).any():
+            raise ValueError(
+                f"{np.count_nonzero(deviation > tol)} values are not integral "
+                f"(largest deviation {deviation.max():g} exceeds tol={tol:g})"
+            )
+        return rounded.astype(np.int64)
+
+    def as_binary(
+        self, tol: float = INTEGRALITY_TOLERANCE, packed: bool = False
+    ) -> np.ndarray:
+        """Return the values rounded to 0 or 1, as a uint8 array.
+
+        Raises a `ValueError` if a value is more than `tol` away from 0 or 1.
+        If `packed`, the values are packed into bits with `numpy.packbits`
+        (eight variables per byte; use `numpy.unpackbits(a, count=n)` to
+        restore them).
+        """
+        values = self.as_integer(tol)
+        if ((values < 0) | (values > 1)).any():
+            raise ValueError("Values are not binary")
+        bits = values.astype(np.uint8)
+        return np.packbits(bits) if packed else bits
+
+    def _integer_values(self) -> np.ndarray | None:
+        """Return the values if they are stored compactly, as integers."""
+        values = self.variable_values
+        if isinstance(values, np.ndarray) and values.dtype.kind in "iu":
+            return values
+        return None
+
+    def detach(self) -> Solution:
+        """Fetch all values of a lazy solution, and return this solution.
+
+        A lazy solution (see `Solver.solve`) reads its values from the native
+        model, and can no longer do so once the solver's problem is changed or
+        solved again.  Detaching it first keeps the values available.  This is
+        a no-op for solutions that are not lazy.
+        """
+        if isinstance(self.variable_values, _LazyValues):
+            values = self.variable_values.fetch(None)
+            self.variable_values = cast("Sequence[float]", values)
+        return self
+
     def get_status(self) -> str:
         """Return the solver status as a string (the enum member name)."""
         return self.status.name
 
 
+class _LazyValues(Sequence[float]):
+    """Variable values that are read from the native model when first needed.
+
+    `fetch(indices)` is a backend method returning the values of the
+    variables at `indices` (all, if None).  Once all values have been read,
+    they are kept, and no longer depend on the native model.
+    """
+
+    def __init__(
+        self, fetch: Callable[[np.ndarray | None], np.ndarray], size: int
+    ) -> None:
+        self._fetch = fetch
+        self._size = size
+        self._values: np.ndarray | None = None
+        self.is_current: Callable[[], bool] = lambda: True
+
+    def fetch(self, indices: np.ndarray | None) -> np.ndarray:
+        if self._values is None:
+            if not self.is_current():
+                raise RuntimeError(
+                    "The solver was modified (or solved again) after this lazy "
+                    "solution was returned; call `Solution.detach()` first to keep "
+                    "its values"
+                )
+            if indices is not None:
+                if len(indices) and not (
+                    -self._size <= indices.min() and indices.max() < self._size
+                ):
+                    raise IndexError("Variable index out of range")
+                return self._fetch(np.where(indices < 0, indices + self._size, indices))
+            self._values = self._fetch(None)
+        return self._values if indices is None else self._values[indices]
+
+    def __len__(self) -> int:
+        return self._size
+
+    @overload
+    def __getitem__(self, key: int) -> float: ...
+    @overload
+    def __getitem__(self, key: slice) -> Sequence[float]: ...
+    def __getitem__(self, key: int | slice) -> float | Sequence[float]:
+        if isinstance(key, slice):
+            return cast("Sequence[float]", self.fetch(None)[key])
+        return float(self.fetch(np.array([key], dtype=np.int64))[0])
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.fetch(None).tolist())
+
+    def __array__(
+        self, dtype: npt.DTypeLike | None = None, copy: bool | None = None
+    ) -> np.ndarray:
+        return np.asarray(self.fetch(None), dtype=dtype, copy=copy)
+
+
+def _broadcast_bounds(bounds: npt.ArrayLike, count: int) -> np.ndarray:
+    """Broadcast scalar or per-variable bounds to `count` floats."""
+    return np.broadcast_to(np.asarray(bounds, dtype=np.float64), count)
+
+
 class Solver:
     """High-level wrapper around an ILP solver backend."""
 
@@ -74,8 +278,11 @@ class Solver:
         self,
         num_variables: int,
         default_variable_type: VariableType,
-        variable_types: dict[int, VariableType] | None = None,
+        variable_types: Mapping[int, VariableType] | npt.ArrayLike | None = None,
         preference: Preference = Preference.Any,
+        lower_bounds: npt.ArrayLike | None = None,
+        upper_bounds: npt.ArrayLike | None = None,
+        presolve: bool = False,
     ) -> None:
         """Create a solver with `num_variables` decision variables.
 
@@ -85,31 +292,563 @@ class Solver:
             The number of decision variables in the problem.
         default_variable_type : VariableType
             The type used for variables not listed in `variable_types`.
-        variable_types : dict[int, VariableType], optional
-            Per-variable overrides for the default variable type.
+        variable_types : dict[int, VariableType] | array-like, optional
+            Per-variable overrides for the default variable type, or the type
+            of every variable (an array of length `num_variables`).
         preference : Preference
             Backend preference.  `Preference.Any` picks the first available.
+        lower_bounds, upper_bounds : float | array-like, optional
+            Bounds of the variables.  By default binary variables are bounded
+            by 0 and 1, all others are unbounded.
+        presolve : bool
+            If True, linear constraints are collected and reduced before they
+            are passed to the backend (when solving): fixed variables are
+            substituted out, rows left without variables are dropped, rows
+            with a single variable become bounds, and duplicate rows are
+            merged.  Variables keep their indices; those that presolve fixes
+            and substitutes out can no longer change their bounds.  See
+            `presolve_stats`.  By default, False.
         """
-        vtpes: dict[int, VariableType] = dict(variable_types) if variable_types else {}
-        self._backend: SolverBackend = create_solver_backend(preference)
-        self._num_variables = num_variables
-        self._backend.initialize(num_variables, default_variable_type, vtpes)
+        if variable_types is None or isinstance(variable_types, Mapping):
+            vtpes = dict(variable_types) if variable_types else {}
+            types = np.full(num_variables, default_variable_type, dtype=np.int8)
+            types[list(vtpes)] = list(vtpes.values())
+        else:
+            types, _, _ = _variable_attributes(
+                num_variables, variable_types, None, None
+            )
+            vtpes = {
+                int(i): VariableType(types[i])
+                for i in np.flatnonzero(types != default_variable_type)
+            }
+        self._timings = SolveTimings()
+        self._tracer: Tracer = get_tracer()
+        self._tracing = not isinstance(self._tracer, NoOpTracer)
+        # changes with every modification, to invalidate earlier lazy solutions
+        self._revision = 0
+        # linear constraints waiting for presolve, and what presolve derived
+        self._presolve = presolve
+        self._pending = Constraints()
+        self._presolve_stats = PresolveStats()
+        self._implied_lower = np.full(num_variables, -np.inf)
+        self._implied_upper = np.full(num_variables, np.inf)
+        self._substituted = np.zeros(num_variables, dtype=bool)
+        self._fixed_values = np.full(num_variables, np.nan)
+        # what has been added, for `stats`
+        self._stats = _StatsCollector()
+        with self._traced("__init__", columns=num_variables):
+            t0 = perf_counter()
+            self._backend: SolverBackend = create_solver_backend(preference)
+            self._backend.set_tracer(self._tracer)
+            t1 = perf_counter()
+            self._num_variables = num_variables
+            self._default_variable_type = default_variable_type
+            self._types = np.array(types, dtype=np.int8)
+            _, lower, upper = _variable_attributes(
+                num_variables, types, lower_bounds, upper_bounds
+            )
+            self._lower, self._upper = np.array(lower), np.array(upper)
+            self._backend.initialize(num_variables, default_variable_type, vtpes)
+            if lower_bounds is not None or upper_bounds is not None:
+                self._set_bounds(types)
+            self._timings.backend_creation = t1 - t0
+            self._timings.variable_creation = perf_counter() - t1
+
+    @classmethod
+    def from_model(
+        cls, model: Model, preference: Preference = Preference.Any
+    ) -> Solver:
+        """Create a solver with the variables (types and bounds) of `model`."""
+        return cls(
+            len(model),
+            model.default_variable_type,
+            model.variable_types,
+            preference,
+            lower_bounds=model.lower_bounds,
+            upper_bounds=model.upper_bounds,
+        )
+
+    def _set_bounds(self, types: np.ndarray) -> None:
+        """Pass those bounds that differ from the defaults to a new backend."""
+        lower, upper = self._lower, self._upper
+        default_lower, default_upper = _default_bounds(types)
+        changed = np.flatnonzero((lower != default_lower) | (upper != default_upper))
+        if len(changed):
+            self._backend.set_variable_bounds(changed, lower[changed], upper[changed])
+
+    def _apply_bounds(
+        self, idx: np.ndarray, lower: np.ndarray, upper: np.ndarray
+    ) -> None:
+        """Set new bounds, combined with those presolve derived from constraints."""
+        lb = np.maximum(lower, self._implied_lower[idx])
+        ub = np.minimum(upper, self._implied_upper[idx])
+        sub = self._substituted[idx]
+        fixed = self._fixed_values[idx[sub]]
+        if not ((lb[sub] == fixed) & (ub[sub] == fixed)).all():
+            raise ValueError(
+                "Cannot change the bounds of variables that presolve fixed and "
+                "substituted out of the constraints"
+            )
+        self._backend.set_variable_bounds(idx, lb, ub)
+        self._lower[idx], self._upper[idx] = lower, upper
+
+    @property
+    def num_variables(self) -> int:
+        """The number of variables in the problem."""
+        return self._num_variables
+
+    def add_variables(
+        self,
+        count: int,
+        vtype: VariableType | npt.ArrayLike | None = None,
+        lb: npt.ArrayLike | None = None,
+        ub: npt.ArrayLike | None = None,
+        obj: npt.ArrayLike = 0.0,
+        columns: Sequence[Mapping[int, float]] | None = None,
+    ) -> range:
+        """Add `count` new variables to the problem, and return their indices.
+
+        Parameters
+        ----------
+        count : int
+            The number of variables to add.
+        vtype : VariableType | array-like, optional
+            The type of the new variables (the solver's default variable type
+            if not given).
+        lb, ub : float | array-like, optional
+            Bounds of the new variables.  By default binary variables are
+            bounded by 0 and 1, all others are unbounded.
+        obj : float | array-like
+            Coefficients of the new variables in the current objective.
+        columns : Sequence[Mapping[int, float]], optional
+            For each new variable, its coefficients in constraints that were
+            already added, as a mapping from constraint position (in the order
+            the constraints were added) to coefficient.  Only linear
+            constraints can be extended.
+
+        Returns
+        -------
+        range
+            The indices of the new variables.
+        """
+        if columns is not None and len(columns) != count:
+            raise ValueError("`columns` must have one mapping per new variable")
+        if columns is not None and self._presolve:
+            raise ValueError("`columns` cannot be used with presolve")
+        if vtype is None:
+            vtype = self._default_variable_type
+        with self._traced("add_variables", "variable_creation", columns=count):
+            self._revision += 1
+            types, lower, upper = _variable_attributes(count, vtype, lb, ub)
+            objective = np.broadcast_to(np.asarray(obj, dtype=np.float64), count)
+            self._backend.add_variables(types, lower, upper, objective, columns)
+            self._types = np.concatenate([self._types, types])
+            self._lower = np.concatenate([self._lower, lower])
+            self._upper = np.concatenate([self._upper, upper])
+            self._implied_lower = np.concatenate(
+                [self._implied_lower, np.full(count, -np.inf)]
+            )
+            self._implied_upper = np.concatenate(
+                [self._implied_upper, np.full(count, np.inf)]
+            )
+            self._substituted = np.concatenate(
+                [self._substituted, np.zeros(count, dtype=bool)]
+            )
+            self._fixed_values = np.concatenate(
+                [self._fixed_values, np.full(count, np.nan)]
+            )
+            start = self._num_variables
+            self._num_variables += count
+        return range(start, start + count)
+
+    def set_variable_types(
+        self,
+        types: VariableType | npt.ArrayLike,
+        indices: npt.ArrayLike | None = None,
+    ) -> None:
+        """Change the type of many variables at once.
+
+        Parameters
+        ----------
+        types : VariableType | array-like
+            The new types, broadcast to the number of `indices`.
+        indices : array-like of int, optional
+            The variables to change (all variables, if not given).
+
+        Variables that become binary are also given bounds 0 and 1.
+        """
+        idx = self._variable_indices(indices)
+        with self._traced("set_variable_types", "variable_creation", columns=len(idx)):
+            self._revision += 1
+            new_types, lower, upper = _variable_attributes(len(idx), types, None, None)
+            self._backend.set_variable_types(idx, new_types)
+            self._types[idx] = new_types
+            binary = np.flatnonzero(new_types == VariableType.Binary)
+            if len(binary):
+                self._apply_bounds(idx[binary], lower[binary], upper[binary])
+
+    def set_variable_bounds(
+        self,
+        lower: npt.ArrayLike | None = None,
+        upper: npt.ArrayLike | None = None,
+        indices: npt.ArrayLike | None = None,
+    ) -> None:
+        """Change the bounds of many variables at once.
+
+        Parameters
+        ----------
+        lower, upper : float | array-like, optional
+            The new bounds, broadcast to the number of `indices`.  Use
+            `-inf` / `inf` to remove a bound.  A side that is not given is
+            left unchanged.
+        indices : array-like of int, optional
+            The variables to change (all variables, if not given).
+        """
+        idx = self._variable_indices(indices)
+        lb = None if lower is None else _broadcast_bounds(lower, len(idx))
+        ub = None if upper is None else _broadcast_bounds(upper, len(idx))
+        if lb is not None and ub is not None and (lb > ub).any():
+            raise ValueError("Lower bounds must not exceed upper bounds")
+        with self._traced("set_variable_bounds", "variable_creation", columns=len(idx)):
+            self._revision += 1
+            self._apply_bounds(
+                idx,
+                self._lower[idx] if lb is None else lb,
+                self._upper[idx] if ub is None else ub,
+            )
+
+    def _variable_indices(self, indices: npt.ArrayLike | None) -> np.ndarray:
+        """Return `indices` as a flat integer array (all variables if None)."""
+        if indices is None:
+            return np.arange(self._num_variables)
+        idx = np.asarray(indices)
+        if idx.dtype.kind not in "iu":
+            raise TypeError("Variable indices must be integers")
+        idx = idx.ravel()
+        if len(idx) and not (0 <= idx.min() and idx.max() < self._num_variables):
+            raise IndexError("Variable index out of range")
+        return idx
+
+    def set_tracer(self, tracer: Tracer | None) -> None:
+        """Set the tracer receiving spans for this solver's operations.
+
+        `None` disables tracing.  See [`ilpy.tracing`][] for details.
+        """
+        self._tracer = NoOpTracer() if tracer is None else tracer
+        self._tracing = not isinstance(self._tracer, NoOpTracer)
+        self._backend.set_tracer(self._tracer)
+
+    def _traced(
+        self, operation: str, timing: str | None = None, **attributes: Any
+    ) -> _Traced:
+        """Trace `operation` in a span, and add its duration to a timing.
+
+        `timing` names the `SolveTimings` field the time is added to.  The
+        backend name and `attributes` are set on the span when the operation
+        finishes; further attributes can be set on the span returned on
+        entering (which records nothing if tracing is disabled).
+        """
+        return _Traced(self, operation, timing, attributes)
 
     def set_objective(self, objective: Objective | Expression) -> None:
         """Set the objective, converting from an `Expression` if needed."""
-        if isinstance(objective, Expression):
-            objective = objective.as_objective()
-        self._backend.set_objective(objective)
+        with self._traced("set_objective", "objective_transfer") as span:
+            self._revision += 1
+            if isinstance(objective, Expression):
+                objective = objective.as_objective()
+            self._stats.set_objective(objective)
+            self._backend.set_objective(objective)
+            if span.is_recording():
+                span.set_attribute(
+                    "nnz", sum(1 for coef in objective.get_coefficients() if coef)
+                )
+                span.set_attribute(
+                    "quadratic_nnz", len(objective.get_quadratic_coefficients())
+                )
+                span.set_attribute("sense", objective.get_sense().name)
 
     def set_constraints(self, constraints: Constraints) -> None:
         """Replace the current constraint set."""
-        self._backend.set_constraints(constraints)
+        with self._traced(
+            "set_constraints", "constraint_transfer", rows=len(constraints)
+        ) as span:
+            self._revision += 1
+            self._stats.clear()
+            for item in constraints._constraints:
+                self._stats.add(item)
+            if self._presolve:
+                self._reset_presolve()
+                quadratic = Constraints()
+                for item in constraints._constraints:
+                    if _is_linear(item):
+                        self._pending.add(item)
+                    else:
+                        quadratic.add(item)
+                self._backend.set_constraints(quadratic)
+            else:
+                self._backend.set_constraints(constraints)
+            if span.is_recording():
+                span.set_attribute(
+                    "nnz", sum(len(c.get_coefficients()) for c in constraints)
+                )
+
+    def add_constraint(
+        self, constraint: Constraint | ConstraintBlock | Expression
+    ) -> None:
+        """Add a constraint (or an `Expression` convertible to one).
+
+        A `ConstraintBlock` (e.g. from `A @ x <= b` on a `VariableArray`) adds
+        all of its rows in bulk.
+        """
+        with self._traced("add_constraint", "constraint_transfer") as span:
+            self._revision += 1
+            if isinstance(constraint, Expression):
+                constraint = constraint.as_constraint()
+            self._stats.add(constraint)
+            if self._presolve and _is_linear(constraint):
+                self._pending.add(constraint)
+            elif isinstance(constraint, ConstraintBlock):
+                self._backend.add_constraint_block(constraint)
+                if span.is_recording():
+                    span.set_attribute("rows", len(constraint))
+                    span.set_attribute("nnz", constraint.nnz)
+            else:
+                self._backend.add_constraint(constraint)
+                if span.is_recording():
+                    span.set_attribute("rows", 1)
+                    span.set_attribute("nnz", len(constraint.get_coefficients()))
+                    span.set_attribute("relation", constraint.get_relation().name)
+
+    def add_indicator_constraint(
+        self,
+        binary_var: int | Variable,
+        active_value: bool,
+        constraint: Constraint | Expression,
+    ) -> None:
+        """Add a linear constraint that only holds if `binary_var == active_value`.
+
+        Indicator constraints are passed to the backend natively (rather than
+        as a big-M row), which avoids weak relaxations and numerical trouble.
 
-    def add_constraint(self, constraint: Constraint | Expression) -> None:
-        """Add a single constraint (or an `Expression` convertible to one)."""
+        Parameters
+        ----------
+        binary_var : int | Variable
+            The (index of the) binary variable that switches the constraint.
+        active_value : bool
+            The value of `binary_var` for which the constraint is enforced.
+        constraint : Constraint | Expression
+            The linear constraint.
+        """
         if isinstance(constraint, Expression):
             constraint = constraint.as_constraint()
-        self._backend.add_constraint(constraint)
+        if constraint.get_quadratic_coefficients():
+            raise ValueError("Indicator constraints must be linear")
+        constraints = Constraints()
+        constraints.add(constraint)
+        self.add_indicator_constraints(
+            [int(binary_var)], active_value, constraints.to_block()
+        )
+
+    def add_indicator_constraints(
+        self,
+        binary_vars: npt.ArrayLike,
+        active_values: bool | npt.ArrayLike,
+        constraints: ConstraintBlock,
+    ) -> None:
+        """Add every row of `constraints` as an indicator constraint, in bulk.
+
+        Row `r` is only enforced if the binary variable `binary_vars[r]` takes
+        the value `active_values[r]`; see `add_indicator_constraint`.
+
+        Parameters
+        ----------
+        binary_vars : array-like of int
+            One binary variable index per row of `constraints`.
+        active_values : bool | array-like of bool
+            The values for which the rows are enforced (or one value for all).
+        constraints : ConstraintBlock
+            The linear constraints.
+        """
+        idx = self._variable_indices(binary_vars)
+        if len(idx) != len(constraints):
+            raise ValueError(
+                f"Expected one binary variable per constraint ({len(constraints)}), "
+                f"got {len(idx)}"
+            )
+        active = np.broadcast_to(np.asarray(active_values), idx.shape)
+        if not np.isin(active, (0, 1)).all():
+            raise ValueError("Active values must be booleans (or 0 and 1)")
+        if (self._types[idx] != VariableType.Binary).any():
+            raise ValueError("Indicator variables must be binary")
+        with self._traced(
+            "add_indicator_constraints",
+            "constraint_transfer",
+            rows=len(constraints),
+            nnz=constraints.nnz,
+        ):
+            self._revision += 1
+            self._backend.add_indicator_constraints(
+                idx, active.astype(bool), constraints
+            )
+            self._stats.indicator_constraints += len(constraints)
+
+    def add_sos(
+        self,
+        sos_type: Literal[1, 2],
+        indices: npt.ArrayLike,
+        weights: npt.ArrayLike | None = None,
+    ) -> None:
+        """Add a special ordered set (SOS) of variables.
+
+        In an SOS of type 1, at most one variable may be nonzero; in an SOS of
+        type 2, at most two, and they must be adjacent in the order given by
+        `weights`.  Backends branch on sets directly, which is much faster than
+        modelling them with auxiliary binaries (e.g. for piecewise-linear
+        functions).
+
+        Parameters
+        ----------
+        sos_type : {1, 2}
+            The type of the set.
+        indices : array-like of int
+            The variables in the set.
+        weights : array-like of float, optional
+            Distinct weights that order the variables (by default, their
+            position in `indices`).
+        """
+        count = len(np.asarray(indices).ravel())
+        self.add_sos_constraints(sos_type, [0, count], indices, weights)
+
+    def add_sos_constraints(
+        self,
+        sos_type: Literal[1, 2],
+        indptr: npt.ArrayLike,
+        indices: npt.ArrayLike,
+        weights: npt.ArrayLike | None = None,
+    ) -> None:
+        """Add many special ordered sets of the same type, in bulk.
+
+        Set `k` holds the variables `indices[indptr[k]:indptr[k + 1]]` (as in
+        a `ConstraintBlock`); see `add_sos`.
+
+        Parameters
+        ----------
+        sos_type : {1, 2}
+            The type of all sets.
+        indptr : array-like of int
+            Where each set starts in `indices` (and, finally, where the last
+            one ends).
+        indices : array-like of int
+            The variables of all sets, one set after another.
+        weights : array-like of float, optional
+            Weights that order the variables within each set, distinct within
+            a set (by default, their position in the set).
+        """
+        if sos_type not in (1, 2):
+            raise ValueError(f"SOS type must be 1 or 2, got {sos_type!r}")
+        idx = self._variable_indices(indices)
+        bounds = np.asarray(indptr, dtype=np.int64)
+        if (
+            bounds.ndim != 1
+            or not len(bounds)
+            or bounds[0] != 0
+            or bounds[-1] != len(idx)
+            or (np.diff(bounds) < 0).any()
+        ):
+            raise ValueError("`indptr` must rise from 0 to the number of indices")
+        sets = np.repeat(np.arange(len(bounds) - 1), np.diff(bounds))
+        if weights is None:
+            wts = (np.arange(len(idx)) - bounds[sets]).astype(np.float64)
+        else:
+            wts = np.asarray(weights, dtype=np.float64).ravel()
+            if len(wts) != len(idx):
+                raise ValueError("Expected one weight per index")
+            order = np.lexsort((wts, sets))
+            if (
+                (sets[order][1:] == sets[order][:-1])
+                & (wts[order][1:] == wts[order][:-1])
+            ).any():
+                raise ValueError("Weights must be distinct within each set")
+        with self._traced(
+            "add_sos_constraints",
+            "constraint_transfer",
+            sets=len(bounds) - 1,
+            nnz=len(idx),
+        ):
+            self._revision += 1
+            self._backend.add_sos_constraints(sos_type, bounds, idx, wts)
+            self._stats.sos_constraints += len(bounds) - 1
+
+    def stats(self) -> ModelStats:
+        """Return the number of rows, columns, nonzeros, etc. of the model.
+
+        The statistics describe the model as it was given to this solver
+        (before presolve), and are kept up to date as it is built, so that
+        calling this is cheap.
+        """
+        return self._stats.result(
+            self._num_variables, self._types, self._lower, self._upper
+        )
+
+    @property
+    def presolve_stats(self) -> PresolveStats:
+        """What the most recent presolve pass removed (see `presolve`)."""
+        return self._presolve_stats
+
+    def _run_presolve(self) -> None:
+        """Presolve the collected linear constraints and pass them on."""
+        if not len(self._pending):
+            return
+        with self._traced("presolve", "constraint_transfer") as span:
+            block = self._pending.to_block()
+            self._pending.clear()
+            lower = np.maximum(self._lower, self._implied_lower)
+            upper = np.minimum(self._upper, self._implied_upper)
+            result = presolve(block, self._types, lower, upper)
+            self._presolve_stats = result.stats
+            if result.infeasible:
+                # leave it to the backend to report the infeasibility
+                self._backend.add_constraint_block(block)
+            else:
+                np.maximum(
+                    self._implied_lower, result.implied_lower, out=self._implied_lower
+                )
+                np.minimum(
+                    self._implied_upper, result.implied_upper, out=self._implied_upper
+                )
+                new = result.substituted & ~self._substituted
+                self._substituted |= new
+                self._fixed_values[new] = result.lower[new]
+                changed = np.flatnonzero(
+                    (result.lower != lower) | (result.upper != upper)
+                )
+                if len(changed):
+                    self._backend.set_variable_bounds(
+                        changed, result.lower[changed], result.upper[changed]
+                    )
+                if len(result.block):
+                    self._backend.add_constraint_block(result.block)
+            if span.is_recording():
+                span.set_attribute("rows", len(block))
+                span.set_attribute("removed_rows", result.stats.removed_rows)
+                span.set_attribute("infeasible", result.infeasible)
+
+    def _reset_presolve(self) -> None:
+        """Forget collected constraints and the bounds presolve derived."""
+        self._pending.clear()
+        derived = np.flatnonzero(
+            np.isfinite(self._implied_lower)
+            | np.isfinite(self._implied_upper)
+            | self._substituted
+        )
+        self._implied_lower[:] = -np.inf
+        self._implied_upper[:] = np.inf
+        self._substituted[:] = False
+        self._fixed_values[:] = np.nan
+        if len(derived):
+            self._backend.set_variable_bounds(
+                derived, self._lower[derived], self._upper[derived]
+            )
 
     def set_timeout(self, timeout: float) -> None:
         """Set a wall-clock time limit (in seconds) for solving."""
@@ -131,14 +870,155 @@ class Solver:
         """Enable or disable solver log output."""
         self._backend.set_verbose(verbose)
 
-    def set_event_callback(self, callback: Callable[[EventData], None] | None) -> None:
-        """Set (or clear) a callback invoked on backend progress events."""
-        self._backend.set_event_callback(callback)
+    def set_event_callback(
+        self,
+        callback: Callable[[EventData], None] | None,
+        events: Iterable[EventType | str] | None = None,
+        min_interval: float = 0.0,
+    ) -> None:
+        """Set (or clear) a callback invoked on backend progress events.
 
-    def solve(self) -> Solution:
-        """Solve the problem and return a `Solution`."""
-        return self._backend.solve()
+        Parameters
+        ----------
+        callback : Callable[[EventData], None] | None
+            The callback, or None to remove the current one.
+        events : Iterable[str], optional
+            The event types to deliver (e.g. `{"MIPSOL"}` for Gurobi, or
+            `{"BESTSOLFOUND"}` for SCIP).  Backends only register for, and
+            collect data of, subscribed events; types a backend does not emit
+            are ignored.  By default, all events are delivered.
+        min_interval : float
+            Minimum time (in seconds) between two delivered events of the same
+            type.  Events arriving sooner are dropped before their data is
+            collected.  By default, 0 (no rate limiting).
+        """
+        self._backend.set_event_callback(callback, events, min_interval)
+
+    def set_event_recorder(self, recorder: EventRecorder | None) -> None:
+        """Set (or clear) an `EventRecorder` that progress events are written into.
+
+        Unlike an event callback, the recorder is written to directly by the
+        backend, without building an event dict for every event.
+        """
+        self._backend.set_event_recorder(recorder)
+
+    def solve(self, lazy: bool = False, compact: bool = False) -> Solution:
+        """Solve the problem and return a `Solution`.
+
+        `Solution.timings` combines the model-building time accumulated by this
+        solver with the presolve, search and extraction times of this solve.
+
+        Parameters
+        ----------
+        lazy : bool
+            If True, variable values are not extracted after solving, but read
+            from the native model when first accessed: all of them, only those
+            requested with `Solution.values(indices)`, or only the nonzero ones
+            with `Solution.nonzero()`.  A lazy solution can no longer read
+            values once this solver is modified or solved again; call
+            `Solution.detach()` before that to keep them.  By default, False.
+        compact : bool
+            If True, the variable values are rounded (see `Solution.as_integer`)
+            and stored as a uint8 array if all variables are binary, or as an
+            int64 array if all are binary or integer.  Only supported for
+            models without continuous variables, and not together with `lazy`.
+            By default, False.
+        """
+        if compact:
+            if lazy:
+                raise ValueError("A solution cannot be both lazy and compact")
+            if (self._types == VariableType.Continuous).any():
+                raise ValueError(
+                    "Compact solutions require a model without continuous variables"
+                )
+        if self._presolve:
+            self._run_presolve()
+        with self._traced("solve") as span:
+            self._revision += 1
+            solution = self._backend.solve(lazy=lazy)
+            if isinstance(values := solution.variable_values, _LazyValues):
+                revision = self._revision
+                values.is_current = lambda: self._revision == revision
+            if compact:
+                if (self._types == VariableType.Binary).all():
+                    compact_values = solution.as_binary()
+                else:
+                    compact_values = solution.as_integer()
+                solution.variable_values = cast("Sequence[float]", compact_values)
+            if span.is_recording():
+                span.set_attribute("status", solution.status.name)
+                span.set_attribute("objective_value", solution.objective_value)
+                span.set_attribute("native_time", solution.time)
+        timings = solution.timings
+        timings.backend_creation = self._timings.backend_creation
+        timings.variable_creation = self._timings.variable_creation
+        timings.objective_transfer = self._timings.objective_transfer
+        timings.constraint_transfer = self._timings.constraint_transfer
+        return solution
 
     def native_model(self) -> Any:
-        """Return the backend's native model object (e.g. a gurobipy Model)."""
+        """Return the backend's native model object (e.g. a gurobipy Model).
+
+        With presolve, the collected constraints are presolved and passed to
+        the backend first.
+        """
+        if self._presolve:
+            self._run_presolve()
         return self._backend.native_model()
+
+
+class _Traced:
+    """The context manager returned by `Solver._traced`.
+
+    A class rather than a generator, and without a span when tracing is
+    disabled, so that the untraced path costs little more than the timing.
+    """
+
+    __slots__ = ("_attributes", "_operation", "_solver", "_span", "_t0", "_timing")
+
+    def __init__(
+        self,
+        solver: Solver,
+        operation: str,
+        timing: str | None,
+        attributes: dict[str, Any],
+    ) -> None:
+        self._solver = solver
+        self._operation = operation
+        self._timing = timing
+        self._attributes = attributes
+
+    def __enter__(self) -> Span:
+        solver = self._solver
+        if solver._tracing:
+            span = solver._tracer.start_span(f"ilpy.Solver.{self._operation}")
+            self._span = span.__enter__()
+        else:
+            self._span = _NOOP_SPAN
+        self._t0 = perf_counter()
+        return self._span
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None and (timing := self._timing) is not None:
+            timings = self._solver._timings
+            elapsed = perf_counter() - self._t0
+            setattr(timings, timing, getattr(timings, timing) + elapsed)
+        span = self._span
+        if span is _NOOP_SPAN:
+            return
+        if exc_type is None and span.is_recording():
+            span.set_attribute("backend", self._solver._backend.name)
+            for key, value in self._attributes.items():
+                span.set_attribute(key, value)
+        span.__exit__(exc_type, exc, tb)
+
+
+def _is_linear(constraint: Constraint | ConstraintBlock) -> bool:
+    return isinstance(constraint, ConstraintBlock) or not (
+        constraint.get_quadratic_coefficients()
+    )
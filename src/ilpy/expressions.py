@@ -8,16 +8,24 @@ syntax (e.g. `2 * x - y >= 0`) and convert them into the corresponding
 from __future__ import annotations
 
 import ast
+import itertools
+import numbers
 import sys
+from collections.abc import Mapping
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Any, ClassVar, Union
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, ClassVar, Union, cast
+
+import numpy as np
 
 from ._constants import Relation, Sense
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Iterable, Iterator, Sequence
+
+    import numpy.typing as npt
 
-    from ._components import Constraint, Objective
+    from ._components import Constraint, ConstraintBlock, Objective
 
 Number = Union[float, int]
 
@@ -53,22 +61,22 @@ class Expression(ast.expr):
         """Create an [ilpy.Constraint][] object from this expression."""
         from ._components import Constraint
 
-        l_coeffs, q_coeffs, value = _get_coeff_indices(self)
+        l_coeffs, q_coeffs, value, relation = _get_coeff_indices(self)
         return Constraint.from_coefficients(
             coefficients=l_coeffs,
             quadratic_coefficients=q_coeffs,
-            relation=_get_relation(self) or Relation.LessEqual,
+            relation=relation or Relation.LessEqual,
             value=-value,  # negate value to convert to RHS form
         )
 
     def as_objective(self, sense: Sense = Sense.Minimize) -> Objective:
         """Create a linear objective from this expression."""
-        if _get_relation(self) is not None:  # pragma: no cover
+        l_coeffs, q_coeffs, value, relation = _get_coeff_indices(self)
+        if relation is not None:  # pragma: no cover
             # TODO: may be supported in the future, eg. for piecewise objectives?
             raise ValueError(f"Objective function cannot have comparisons: {self}")
         from ._components import Objective
 
-        l_coeffs, q_coeffs, value = _get_coeff_indices(self)
         return Objective.from_coefficients(
             coefficients=l_coeffs,
             quadratic_coefficients=q_coeffs,
@@ -91,9 +99,13 @@ class Expression(ast.expr):
         return Compare(self, [ast.Lt()], [other])
 
     def __le__(self, other: Expression | float) -> Compare:
+        if _defers_to(other):
+            return NotImplemented
         return Compare(self, [ast.LtE()], [other])
 
     def __eq__(self, other: Expression | float) -> Compare:  # type: ignore
+        if _defers_to(other):
+            return NotImplemented
         return Compare(self, [ast.Eq()], [other])
 
     def __ne__(self, other: Expression | float) -> Compare:  # type: ignore
@@ -103,32 +115,47 @@ class Expression(ast.expr):
         return Compare(self, [ast.Gt()], [other])
 
     def __ge__(self, other: Expression | float) -> Compare:
+        if _defers_to(other):
+            return NotImplemented
         return Compare(self, [ast.GtE()], [other])
 
     # binary operators
     # (note that __and__ and __or__ are reserved for boolean operators.)
 
-    def __add__(self, other: Expression | Number) -> BinOp:
+    def __add__(self, other: Expression | Number) -> Expression:
+        if isinstance(other, LinearExpression):
+            # keep the result flat
+            return other.__radd__(self)
+        if _defers_to(other):
+            return NotImplemented
         return BinOp(self, ast.Add(), other)
 
-    def __radd__(self, other: Expression | Number) -> BinOp:
+    def __radd__(self, other: Expression | Number) -> Expression:
         return BinOp(other, ast.Add(), self)
 
-    def __sub__(self, other: Expression | Number) -> BinOp:
+    def __sub__(self, other: Expression | Number) -> Expression:
+        if isinstance(other, LinearExpression):
+            return other.__rsub__(self)
+        if _defers_to(other):
+            return NotImplemented
         return BinOp(self, ast.Sub(), other)
 
-    def __rsub__(self, other: Expression | Number) -> BinOp:
+    def __rsub__(self, other: Expression | Number) -> Expression:
         return BinOp(other, ast.Sub(), self)
 
-    def __mul__(self, other: Any) -> BinOp | Constant:
+    def __mul__(self, other: Any) -> Expression:
+        if isinstance(other, LinearExpression):
+            return other.__rmul__(self)
+        if _defers_to(other):
+            return NotImplemented
         return BinOp(self, ast.Mult(), other)
 
-    def __rmul__(self, other: Number) -> BinOp | Constant:
+    def __rmul__(self, other: Number) -> Expression:
         if not isinstance(other, (int, float)):  # pragma: no cover
             raise TypeError("Right multiplication must be with a number")
         return Constant(other) * self
 
-    def __truediv__(self, other: Number) -> BinOp:
+    def __truediv__(self, other: Number) -> Expression:
         return BinOp(self, ast.Div(), other)
 
     def __rtruediv__(self, other: Number) -> BinOp:
@@ -136,10 +163,10 @@ class Expression(ast.expr):
 
     # unary operators
 
-    def __neg__(self) -> UnaryOp:
+    def __neg__(self) -> Expression:
         return UnaryOp(ast.USub(), self)
 
-    def __pos__(self) -> UnaryOp:
+    def __pos__(self) -> Expression:
         # usually a no-op
         return UnaryOp(ast.UAdd(), self)
 
@@ -152,6 +179,15 @@ class Expression(ast.expr):
     # return BinOp(self, ast.Pow(), other)
 
 
+def _defers_to(other: Any) -> bool:
+    """Return True if binary operations with `other` should be left to it.
+
+    Like NumPy, objects that set `__array_ufunc__ = None` (such as
+    `ilpy.VariableArray`) implement the reflected operators themselves.
+    """
+    return getattr(type(other), "__array_ufunc__", False) is None
+
+
 class Compare(Expression, ast.Compare):
     """A comparison of two or more values.
 
@@ -213,7 +249,7 @@ class Constant(Expression, ast.Constant):
             raise TypeError("Constants must be numbers")
         super().__init__(value, kind, **kwargs)
 
-    def __mul__(self, other: Any) -> BinOp | Constant:
+    def __mul__(self, other: Any) -> Expression:
         if isinstance(other, Constant):
             return Constant(self.value**other.value)
         if isinstance(other, (float, int)):
@@ -263,6 +299,495 @@ class Variable(Expression, ast.Name):
         return f"ilpy.Variable({self.id!r}, index={self.index!r})"
 
 
+class Parameter(Variable):
+    """A named constant whose value is supplied later, by a `ConstraintTemplate`.
+
+    Parameters may be added to an expression or multiply a variable (making
+    its coefficient parametric), e.g. `w * x + y <= cap`.
+    """
+
+    def __init__(self, id: str) -> None:
+        super().__init__(id)
+
+    def __repr__(self) -> str:
+        return f"ilpy.Parameter({self.id!r})"
+
+
+class LinearExpression(Expression):
+    """A flat linear expression: a sum of `coefficient * variable` terms.
+
+    Unlike an expression built with `+` on other nodes (which grows a tree of
+    `BinOp` nodes, one per operation), a `LinearExpression` stores its terms in
+    a dict mapping variable index to coefficient, plus a constant.  In-place
+    operators (`+=`, `-=`, `*=`, `/=`) update it without allocating any nodes,
+    and conversion to a `Constraint` or `Objective` is linear in the number of
+    terms.  It can be used anywhere an `Expression` can, e.g. in comparisons.
+
+    All variables added to a `LinearExpression` must have an `index`.
+
+    Parameters
+    ----------
+    terms : Mapping[Variable, float] | Iterable[tuple[Variable, float]]
+        Initial `(variable, coefficient)` terms.
+    constant : float
+        Initial constant term.
+
+    Examples
+    --------
+    ```python
+    expr = LinearExpression()
+    for i, weight in enumerate(weights):
+        expr += weight * x[i]
+    solver.add_constraint(expr <= 10)
+    ```
+    """
+
+    def __init__(
+        self,
+        terms: Mapping[Variable, float] | Iterable[tuple[Variable, float]] = (),
+        constant: float = 0.0,
+    ) -> None:
+        super().__init__()
+        self._linear: dict[int, float] = {}
+        self._quadratic: dict[tuple[int, int], float] = {}
+        self._constant = float(constant)
+        # variable objects by index (used for names, and by _get_coefficients)
+        self._vars: dict[int, Variable] = {}
+        items = terms.items() if isinstance(terms, Mapping) else terms
+        for var, coef in items:
+            self._add_linear(var, coef)
+
+    def get_coefficients(self) -> Mapping[int, float]:
+        """Return the linear coefficients as a mapping from variable index to value."""
+        return MappingProxyType(self._linear)
+
+    def get_quadratic_coefficients(self) -> Mapping[tuple[int, int], float]:
+        """Return the quadratic coefficients, keyed by variable-index pairs."""
+        return MappingProxyType(self._quadratic)
+
+    def get_constant(self) -> float:
+        """Return the constant term."""
+        return self._constant
+
+    def copy(self) -> LinearExpression:
+        """Return a copy of this expression."""
+        new = self.__class__.__new__(self.__class__)
+        Expression.__init__(new)
+        new._linear = self._linear.copy()
+        new._quadratic = self._quadratic.copy()
+        new._constant = self._constant
+        new._vars = self._vars.copy()
+        return new
+
+    def as_constraint(self) -> Constraint:
+        """Create an [ilpy.Constraint][] object for `self <= 0`."""
+        from ._components import Constraint
+
+        return Constraint.from_coefficients(
+            coefficients=self._linear,
+            quadratic_coefficients=self._quadratic,
+            relation=Relation.LessEqual,
+            value=-self._constant,
+        )
+
+    def as_objective(self, sense: Sense = Sense.Minimize) -> Objective:
+        """Create an objective from this expression."""
+        from ._components import Objective
+
+        return Objective.from_coefficients(
+            coefficients=self._linear,
+            quadratic_coefficients=self._quadratic,
+            constant=self._constant,
+            sense=sense,
+        )
+
+    # accumulation
+
+    def _add_linear(self, var: Variable, coef: float) -> None:
+        index = _ensure_index(var)
+        self._vars.setdefault(index, var)
+        self._linear[index] = self._linear.get(index, 0.0) + coef
+
+    def _add_quadratic(self, v1: Variable, v2: Variable, coef: float) -> None:
+        i, j = _ensure_index(v1), _ensure_index(v2)
+        self._vars.setdefault(i, v1)
+        self._vars.setdefault(j, v2)
+        key = (i, j) if i <= j else (j, i)
+        self._quadratic[key] = self._quadratic.get(key, 0.0) + coef
+
+    def _iadd(self, other: Any, scale: float) -> LinearExpression:
+        """Add `scale * other` to this expression in place.
+
+        Returns the expression holding the result: `self`, or a new
+        `QuadraticExpression` if `other` has quadratic terms and `self` cannot
+        hold them.
+        """
+        if isinstance(other, numbers.Real):
+            self._constant += scale * float(other)
+        elif isinstance(other, Variable):
+            self._add_linear(other, scale)
+        elif isinstance(other, LinearExpression):
+            if other._quadratic and not isinstance(self, QuadraticExpression):
+                return QuadraticExpression._from(self)._iadd(other, scale)
+            vars_ = other._vars
+            for i, coef in other._linear.items():
+                self._add_linear(vars_[i], scale * coef)
+            for (i, j), coef in other._quadratic.items():
+                self._add_quadratic(vars_[i], vars_[j], scale * coef)
+            self._constant += scale * other._constant
+        elif isinstance(other, Compare):
+            raise TypeError("Cannot add a comparison to an expression")
+        elif (
+            isinstance(other, BinOp)
+            and isinstance(other.op, ast.Mult)
+            and isinstance(other.left, Constant)
+            and isinstance(other.right, Variable)
+        ):
+            # fast path for the most common term: `coef * x`
+            self._add_linear(other.right, scale * cast("float", other.left.value))
+        elif isinstance(other, Expression):
+            coeffs = _get_coefficients(other, scale=scale)  # type: ignore[arg-type]
+            if any(isinstance(k, tuple) for k in coeffs) and not isinstance(
+                self, QuadraticExpression
+            ):
+                return QuadraticExpression._from(self)._iadd(other, scale)
+            for key, coef in coeffs.items():
+                if key is None:
+                    self._constant += coef
+                elif isinstance(key, tuple):
+                    self._add_quadratic(key[0], key[1], coef)
+                else:
+                    self._add_linear(key, coef)
+        else:
+            raise TypeError(f"Unsupported operand type: {type(other).__name__!r}")
+        return self
+
+    def _scale(self, factor: float) -> LinearExpression:
+        if not isinstance(factor, numbers.Real):
+            raise TypeError(f"Cannot multiply an expression by {factor!r}")
+        factor = float(factor)
+        for i in self._linear:
+            self._linear[i] *= factor
+        for key in self._quadratic:
+            self._quadratic[key] *= factor
+        self._constant *= factor
+        return self
+
+    def _product(self, other: Variable | LinearExpression) -> QuadraticExpression:
+        """Return the product of this (linear) expression with `other`."""
+        if self._quadratic or (
+            isinstance(other, LinearExpression) and other._quadratic
+        ):
+            raise TypeError("Cannot multiply by more than two variables.")
+        if isinstance(other, Variable):
+            other = LinearExpression([(other, 1.0)])
+        result = QuadraticExpression(constant=self._constant * other._constant)
+        for i, a in self._linear.items():
+            vi = self._vars[i]
+            for j, b in other._linear.items():
+                result._add_quadratic(vi, other._vars[j], a * b)
+            if other._constant:
+                result._add_linear(vi, a * other._constant)
+        if self._constant:
+            for j, b in other._linear.items():
+                result._add_linear(other._vars[j], self._constant * b)
+        return result
+
+    def __iadd__(self, other: Any) -> LinearExpression:
+        return self._iadd(other, 1.0)
+
+    def __isub__(self, other: Any) -> LinearExpression:
+        return self._iadd(other, -1.0)
+
+    def __imul__(self, other: Any) -> LinearExpression:
+        return self._scale(other)
+
+    def __itruediv__(self, other: Number) -> LinearExpression:
+        return self._scale(1 / other)
+
+    def __add__(self, other: Any) -> LinearExpression:
+        if _defers_to(other):
+            return NotImplemented
+        return self.copy()._iadd(other, 1.0)
+
+    def __radd__(self, other: Any) -> LinearExpression:
+        return self.copy()._iadd(other, 1.0)
+
+    def __sub__(self, other: Any) -> LinearExpression:
+        if _defers_to(other):
+            return NotImplemented
+        return self.copy()._iadd(other, -1.0)
+
+    def __rsub__(self, other: Any) -> LinearExpression:
+        return self.copy()._scale(-1.0)._iadd(other, 1.0)
+
+    def __mul__(self, other: Any) -> LinearExpression:
+        if _defers_to(other):
+            return NotImplemented
+        if isinstance(other, (Variable, LinearExpression)):
+            return self._product(other)
+        if isinstance(other, Constant):
+            other = other.value
+        return self.copy()._scale(other)
+
+    def __rmul__(self, other: Any) -> LinearExpression:
+        return self.__mul__(other)
+
+    def __truediv__(self, other: Number) -> LinearExpression:
+        return self.copy()._scale(1 / other)
+
+    def __neg__(self) -> LinearExpression:
+        return self.copy()._scale(-1.0)
+
+    def __pos__(self) -> LinearExpression:
+        return self.copy()
+
+
+class QuadraticExpression(LinearExpression):
+    """A flat quadratic expression.
+
+    Like [`LinearExpression`][ilpy.LinearExpression], but may also hold
+    `coefficient * x_i * x_j` terms, stored in a dict keyed by variable-index
+    pairs `(i, j)` with `i <= j`.  It is usually created by adding a quadratic
+    term to a `LinearExpression`, or by multiplying a `LinearExpression` with a
+    variable (or another linear expression).
+    """
+
+    def __init__(
+        self,
+        terms: Mapping[Variable, float] | Iterable[tuple[Variable, float]] = (),
+        quadratic_terms: Mapping[tuple[Variable, Variable], float]
+        | Iterable[tuple[tuple[Variable, Variable], float]] = (),
+        constant: float = 0.0,
+    ) -> None:
+        super().__init__(terms, constant)
+        items = (
+            quadratic_terms.items()
+            if isinstance(quadratic_terms, Mapping)
+            else quadratic_terms
+        )
+        for (v1, v2), coef in items:
+            self._add_quadratic(v1, v2, coef)
+
+    @classmethod
+    def _from(cls, expr: LinearExpression) -> QuadraticExpression:
+        """Return a QuadraticExpression holding a copy of the terms of `expr`."""
+        new = cls()
+        new._linear = expr._linear.copy()
+        new._quadratic = expr._quadratic.copy()
+        new._constant = expr._constant
+        new._vars = expr._vars.copy()
+        return new
+
+
+def quicksum(terms: Iterable[Expression | Number]) -> LinearExpression:
+    """Sum `terms` into a single flat expression.
+
+    Unlike Python's `sum()`, which creates a new `BinOp` node for every term
+    (and an initial `Constant(0)`), this accumulates all terms into one
+    [`LinearExpression`][ilpy.LinearExpression] (or `QuadraticExpression`, if
+    any term is quadratic) in a single pass.
+
+    Parameters
+    ----------
+    terms : Iterable[Expression | float]
+        Variables, expressions or numbers, e.g. a generator or a NumPy object
+        array.
+
+    Examples
+    --------
+    ```python
+    solver.add_constraint(ilpy.quicksum(x[i] for i in nodes) <= 1)
+    ```
+    """
+    expr = LinearExpression()
+    for term in terms:
+        expr = expr._iadd(term, 1.0)
+    return expr
+
+
+def dot(
+    coefficients: Iterable[float], variables: Iterable[Variable]
+) -> LinearExpression:
+    """Return the flat linear expression `sum(c * v for c, v in zip(...))`.
+
+    Parameters
+    ----------
+    coefficients : Iterable[float]
+        The coefficients, e.g. a list or a 1D NumPy array.
+    variables : Iterable[Variable]
+        The variables (which must have an `index`), in the same order as
+        `coefficients`.
+
+    Raises
+    ------
+    ValueError
+        If `coefficients` and `variables` have different lengths.
+    """
+    expr = LinearExpression()
+    linear, names = expr._linear, expr._vars
+    var_iter = iter(variables)
+    for coef in coefficients:
+        try:
+            var = next(var_iter)
+        except StopIteration:
+            raise ValueError("dot() arguments have different lengths") from None
+        index = _ensure_index(var)
+        names.setdefault(index, var)
+        linear[index] = linear.get(index, 0.0) + float(coef)
+    if next(var_iter, None) is not None:
+        raise ValueError("dot() arguments have different lengths")
+    return expr
+
+
+class ConstraintTemplate:
+    """A constraint with placeholder variables and parameters, compiled once.
+
+    Many constraints share a structure and differ only in which variables and
+    constants they use (e.g. `x[i] + x[j] <= cap[k]` over many index tuples).
+    A template is written as a single expression in which
+
+    - variables *without* an `index` are placeholders (slots) for a variable
+      index chosen per instance,
+    - [`Parameter`][ilpy.expressions.Parameter] nodes are placeholders for
+      constants, and may appear as terms or as coefficients of variables,
+    - variables *with* an `index` are the same variable in every instance.
+
+    The expression is compiled to a coefficient pattern when the template is
+    created.  `instantiate` then binds arrays of indices and parameter values
+    and emits all instances as one [`ConstraintBlock`][ilpy.ConstraintBlock],
+    without building any per-instance expressions.
+
+    Parameters
+    ----------
+    expr : Expression
+        A linear comparison, e.g. `i + j <= cap`.
+
+    Examples
+    --------
+    ```python
+    i, j, cap = Variable("i"), Variable("j"), Parameter("cap")
+    edge_capacity = ConstraintTemplate(i + j <= cap)
+    block = edge_capacity.instantiate(i=sources, j=targets, cap=capacities)
+    solver.add_constraint(block)
+    ```
+    """
+
+    def __init__(self, expr: Expression) -> None:
+        compare_ops: list[type[ast.cmpop]] = []
+        coeffs: CoefficientMap = {}
+        _collect_coefficients(expr, coeffs, 1, None, compare_ops)
+        relation = _get_relation(compare_ops)
+        if relation is None:
+            raise ValueError(f"A constraint template must be a comparison: {expr}")
+        self._relation = relation
+
+        slots: dict[str, Variable] = {}
+        params: dict[str, Parameter] = {}
+
+        def name_of(var: Variable) -> str:
+            registry: dict[str, Any] = params if isinstance(var, Parameter) else slots
+            if registry.setdefault(var.id, var) is not var:
+                raise ValueError(f"Different placeholders are named {var.id!r}")
+            return str(var.id)
+
+        # the compiled pattern: one entry per term of an instance...
+        # (variable index or slot name, coefficient, parameter name or None)
+        self._terms: list[tuple[int | str, float, str | None]] = []
+        # ...and the terms of its constant: (coefficient, parameter name or None)
+        self._constant: list[tuple[float, str | None]] = []
+        for key, coef in coeffs.items():
+            if key is None:
+                self._constant.append((coef, None))
+                continue
+            var: Variable
+            param: str | None = None
+            if not isinstance(key, tuple):
+                var = key
+            else:
+                params_in_key = [v for v in key if isinstance(v, Parameter)]
+                if not params_in_key:
+                    raise ValueError("Constraint templates must be linear")
+                if len(params_in_key) == 2:
+                    raise ValueError("Parameters cannot be multiplied together")
+                param = name_of(params_in_key[0])
+                var = key[1] if key[0] is params_in_key[0] else key[0]
+            if isinstance(var, Parameter):
+                self._constant.append((coef, name_of(var)))
+            elif var.index is not None:
+                self._terms.append((var.index, coef, param))
+            else:
+                self._terms.append((name_of(var), coef, param))
+        self._slots = tuple(slots)
+        self._params = tuple(params)
+
+    @property
+    def slots(self) -> tuple[str, ...]:
+        """The names of the placeholder variables."""
+        return self._slots
+
+    @property
+    def parameters(self) -> tuple[str, ...]:
+        """The names of the parameters."""
+        return self._params
+
+    def __repr__(self) -> str:
+        names = ", ".join(self._slots + self._params)
+        return f"<ConstraintTemplate({names}): {len(self._terms)} terms>"
+
+    def instantiate(self, **bindings: npt.ArrayLike) -> ConstraintBlock:
+        """Create one constraint per element of the bound arrays.
+
+        Every slot must be bound to an array of variable indices (or a
+        `VariableArray`) and every parameter to an array of values.  Arrays
+        are broadcast against each other; the result has one row per element
+        of the broadcast shape (in C order).
+
+        Raises
+        ------
+        TypeError
+            If a slot or parameter is not bound, or an unknown name is given.
+        """
+        from ._arrays import VariableArray
+        from ._components import ConstraintBlock
+
+        expected = set(self._slots) | set(self._params)
+        if missing := expected - bindings.keys():
+            raise TypeError(f"Missing bindings for {sorted(missing)}")
+        if unknown := bindings.keys() - expected:
+            raise TypeError(f"Unknown template names {sorted(unknown)}")
+
+        arrays: dict[str, np.ndarray] = {}
+        for name, value in bindings.items():
+            if isinstance(value, VariableArray):
+                value = value.indices
+            if name in self._slots:
+                array = np.asarray(value)
+                if array.size and not np.issubdtype(array.dtype, np.integer):
+                    raise TypeError(f"{name!r} must be bound to variable indices")
+                arrays[name] = array.astype(np.int64, copy=False)
+            else:
+                arrays[name] = np.asarray(value, dtype=np.float64)
+        shape = np.broadcast_shapes(*(a.shape for a in arrays.values()))
+        num_rows = int(np.prod(shape))
+        bound = {k: np.broadcast_to(a, shape).ravel() for k, a in arrays.items()}
+
+        num_terms = len(self._terms)
+        indices = np.empty((num_rows, num_terms), dtype=np.int64)
+        data = np.empty((num_rows, num_terms), dtype=np.float64)
+        for t, (var, coef, param) in enumerate(self._terms):
+            indices[:, t] = var if isinstance(var, int) else bound[var]
+            data[:, t] = coef if param is None else coef * bound[param]
+        constant = np.zeros(num_rows, dtype=np.float64)
+        for coef, param in self._constant:
+            constant += coef if param is None else coef * bound[param]
+
+        indptr = np.arange(num_rows + 1, dtype=np.int64) * num_terms
+        return ConstraintBlock(
+            indptr, indices.ravel(), data.ravel(), self._relation, -constant
+        )
+
+
 # conversion between ast comparison operators and ilpy relations
 # TODO: support more less/greater than operators
 OPERATOR_MAP: dict[type[ast.cmpop], Relation] = {
@@ -272,40 +797,58 @@ OPERATOR_MAP: dict[type[ast.cmpop], Relation] = {
 }
 
 
-def _get_relation(expr: Expression) -> Relation | None:
-    seen_compare = False
-    relation: Relation | None = None
-    for sub in ast.walk(expr):
-        if isinstance(sub, Compare):
-            if seen_compare:  # pragma: no cover
-                raise ValueError("Only single comparisons are supported")
-
-            op_type = type(sub.ops[0])
-            try:
-                relation = OPERATOR_MAP[op_type]
-            except KeyError as e:
-                raise ValueError(f"Unsupported comparison operator: {op_type}") from e
-            seen_compare = True
-    return relation
+def _get_relation(compare_ops: Sequence[type[ast.cmpop]]) -> Relation | None:
+    """Return the relation for the comparison operators found in an expression."""
+    if not compare_ops:
+        return None
+    if len(compare_ops) > 1:  # pragma: no cover
+        raise ValueError("Only single comparisons are supported")
+    op_type = compare_ops[0]
+    try:
+        return OPERATOR_MAP[op_type]
+    except KeyError as e:
+        raise ValueError(f"Unsupported comparison operator: {op_type}") from e
 
 
 def _get_coeff_indices(
     expr: Expression,
-) -> tuple[dict[int, float], dict[tuple[int, int], float], float]:
+) -> tuple[dict[int, float], dict[tuple[int, int], float], float, Relation | None]:
     l_coeffs: dict[int, float] = {}
     q_coeffs: dict[tuple[int, int], float] = {}
+    coeffs: CoefficientMap = {}
+    compare_ops: list[type[ast.cmpop]] = []
+    # memoized subexpressions are merged into l_coeffs/q_coeffs directly
+    _collect_coefficients(expr, coeffs, 1, None, compare_ops, (l_coeffs, q_coeffs))
+    constant = _split_by_index(coeffs, l_coeffs, q_coeffs)
+    return l_coeffs, q_coeffs, constant, _get_relation(compare_ops)
+
+
+def _split_by_index(
+    coeffs: CoefficientMap,
+    l_coeffs: dict[int, float],
+    q_coeffs: dict[tuple[int, int], float],
+) -> float:
+    """Add `coeffs` to the index-keyed `l_coeffs` and `q_coeffs`.
+
+    Returns the constant term.  Zero linear coefficients are skipped.
+    """
     constant = 0.0
-    for var, coefficient in _get_coefficients(expr).items():
+    for var, coefficient in coeffs.items():
         if var is None:
             constant = coefficient
         elif isinstance(var, tuple):
-            q_coeffs[(_ensure_index(var[0]), _ensure_index(var[1]))] = coefficient
+            # (distinct Variable objects may share an index, so accumulate)
+            key = (_ensure_index(var[0]), _ensure_index(var[1]))
+            q_coeffs[key] = q_coeffs.get(key, 0) + coefficient
         elif coefficient != 0:
-            l_coeffs[_ensure_index(var)] = coefficient
-    return l_coeffs, q_coeffs, constant
+            index = _ensure_index(var)
+            l_coeffs[index] = l_coeffs.get(index, 0) + coefficient
+    return constant
 
 
 def _ensure_index(var: Variable) -> int:
+    if isinstance(var, Parameter):
+        raise ValueError(f"Parameter {var.id!r} can only be used in a template")
     if var.index is None:
         raise ValueError("All variables in an Expression must have an index")
     return var.index
@@ -346,6 +889,52 @@ def _get_coefficients(
     """
     if coeffs is None:
         coeffs = {}
+    _collect_coefficients(expr, coeffs, scale, var_scale, [])
+    return coeffs
+
+
+# Coefficient extraction is memoized on expression nodes that are shared
+# between expressions (e.g. a long sum reused in many constraints):
+#
+# - Every compound node records the id of the first extraction that walked it
+#   (`_OWNER_ATTR`).  Extractions rooted at a node use that node's owner id, so
+#   walking the same tree again never memoizes its interior nodes.
+# - A node reached from an extraction with a *different* owner is shared: its
+#   coefficients are extracted once, stored on the node (`_COEFFS_ATTR`), and
+#   merged into every later extraction that reaches it.
+#
+# Nodes are treated as immutable once extracted (including the `index` of
+# their variables).  `LinearExpression` nodes may be modified in place, so
+# subtrees containing one are never memoized.
+_COEFFS_ATTR = "_ilpy_coefficients"
+_OWNER_ATTR = "_ilpy_owner"
+_NOT_MEMOIZED = "not memoized"
+_owner_ids = itertools.count()
+
+CoefficientMap = dict[Union[Variable, tuple[Variable, Variable], None], float]
+
+
+def _collect_coefficients(
+    expr: Expression | ast.expr,
+    coeffs: CoefficientMap,
+    scale: float,
+    var_scale: Variable | None,
+    compare_ops: list[type[ast.cmpop]],
+    by_index: tuple[dict[int, float], dict[tuple[int, int], float]] | None = None,
+) -> bool:
+    """Add the coefficients of `expr` to `coeffs` (see `_get_coefficients`).
+
+    The types of all comparison operators in `expr` are appended to
+    `compare_ops`.  If `by_index` is given, the linear and quadratic terms of
+    memoized subexpressions are added to those index-keyed dicts instead (and
+    only their constant to `coeffs`).  Returns False if `expr` contains a
+    `LinearExpression` (and its coefficients may therefore not be memoized).
+    """
+    attrs = expr.__dict__
+    owner = attrs.get(_OWNER_ATTR)
+    if owner is None:
+        owner = attrs[_OWNER_ATTR] = next(_owner_ids)
+    memoizable = True
 
     # Use an explicit stack to avoid recursion
     # Stack entries: (expr, scale, var_scale)
@@ -356,9 +945,24 @@ def _get_coefficients(
     while stack:
         current_expr, current_scale, current_var_scale = stack.pop()
 
+        if isinstance(current_expr, (BinOp, UnaryOp, Compare)):
+            memo = _memoized_coefficients(current_expr, owner)
+            if memo is not None:
+                compare_ops.extend(memo.compare_ops)
+                if by_index is not None and current_var_scale is None:
+                    memo.merge_by_index(coeffs, *by_index, current_scale)
+                else:
+                    memo.merge(coeffs, current_scale, current_var_scale)
+                continue
+
         if isinstance(current_expr, Constant):
-            coeffs.setdefault(None, 0)
-            coeffs[None] += current_expr.value * current_scale
+            value = cast("float", current_expr.value) * current_scale
+            if current_var_scale is not None:
+                # multiplication between a variable and a constant term
+                if value:
+                    coeffs[current_var_scale] = coeffs.get(current_var_scale, 0) + value
+            else:
+                coeffs[None] = coeffs.get(None, 0) + value
 
         elif isinstance(current_expr, UnaryOp):
             new_scale = current_scale
@@ -376,9 +980,16 @@ def _get_coefficients(
                 coeffs.setdefault(current_expr, 0)
                 coeffs[current_expr] += current_scale
 
+        elif isinstance(current_expr, LinearExpression):
+            memoizable = False
+            _add_flat_coefficients(
+                coeffs, current_expr, current_scale, current_var_scale
+            )
+
         elif isinstance(current_expr, Compare):
             if len(current_expr.ops) != 1:  # pragma: no cover
                 raise ValueError("Only single comparisons are supported")
+            compare_ops.append(type(current_expr.ops[0]))
             stack.append((current_expr.left, current_scale, current_var_scale))
             # negate the right hand side of the comparison
             stack.append(
@@ -404,7 +1015,118 @@ def _get_coefficients(
         else:  # pragma: no cover
             raise ValueError(f"Unsupported expression type: {type(current_expr)}")
 
-    return coeffs
+    return memoizable
+
+
+class _MemoizedCoefficients:
+    """The coefficients of a shared expression node (see above)."""
+
+    __slots__ = ("_by_index", "coeffs", "compare_ops")
+
+    def __init__(
+        self, coeffs: CoefficientMap, compare_ops: tuple[type[ast.cmpop], ...]
+    ) -> None:
+        self.coeffs = coeffs
+        self.compare_ops = compare_ops
+        self._by_index: (
+            tuple[dict[int, float], dict[tuple[int, int], float], float] | None
+        ) = None
+
+    def merge(
+        self, coeffs: CoefficientMap, scale: float, var_scale: Variable | None
+    ) -> None:
+        """Add `scale * self` (times `var_scale`, if given) to `coeffs`."""
+        if var_scale is None:
+            for key, coef in self.coeffs.items():
+                coeffs[key] = coeffs.get(key, 0) + coef * scale
+            return
+
+        new_key: Variable | tuple[Variable, Variable]
+        for key, coef in self.coeffs.items():
+            if key is None:
+                if not coef:
+                    continue
+                new_key = var_scale
+            elif isinstance(key, tuple):
+                raise TypeError("Cannot multiply by more than two variables.")
+            else:
+                new_key = _sort_vars(key, var_scale)
+            coeffs[new_key] = coeffs.get(new_key, 0) + coef * scale
+
+    def merge_by_index(
+        self,
+        coeffs: CoefficientMap,
+        l_coeffs: dict[int, float],
+        q_coeffs: dict[tuple[int, int], float],
+        scale: float,
+    ) -> None:
+        """Add `scale * self` to index-keyed coefficients (constant to `coeffs`)."""
+        if self._by_index is None:
+            linear: dict[int, float] = {}
+            quadratic: dict[tuple[int, int], float] = {}
+            constant = _split_by_index(self.coeffs, linear, quadratic)
+            self._by_index = (linear, quadratic, constant)
+        linear, quadratic, constant = self._by_index
+        if not l_coeffs and scale == 1:
+            l_coeffs.update(linear)
+        else:
+            for index, coef in linear.items():
+                l_coeffs[index] = l_coeffs.get(index, 0) + coef * scale
+        for pair, coef in quadratic.items():
+            q_coeffs[pair] = q_coeffs.get(pair, 0) + coef * scale
+        if None in self.coeffs:
+            coeffs[None] = coeffs.get(None, 0) + constant * scale
+
+
+def _memoized_coefficients(
+    node: Expression, owner: int
+) -> _MemoizedCoefficients | None:
+    """Return the memoized coefficients of `node`, if any.
+
+    If `node` was first extracted as part of an expression other than `owner`,
+    it is shared: its coefficients are extracted and memoized now.
+    """
+    attrs = node.__dict__
+    memo = attrs.get(_COEFFS_ATTR)
+    if memo is None:
+        if attrs.setdefault(_OWNER_ATTR, owner) == owner:
+            return None
+        coeffs: CoefficientMap = {}
+        compare_ops: list[type[ast.cmpop]] = []
+        if _collect_coefficients(node, coeffs, 1, None, compare_ops):
+            memo = _MemoizedCoefficients(coeffs, tuple(compare_ops))
+        else:
+            memo = _NOT_MEMOIZED
+        attrs[_COEFFS_ATTR] = memo
+    return memo if isinstance(memo, _MemoizedCoefficients) else None
+
+
+def _add_flat_coefficients(
+    coeffs: dict[Variable | tuple[Variable, Variable] | None, float],
+    expr: LinearExpression,
+    scale: float,
+    var_scale: Variable | None,
+) -> None:
+    """Helper for _get_coefficients to add the terms of a flat expression."""
+    variables = expr._vars
+    key: Variable | tuple[Variable, Variable] | None
+    if var_scale is None:
+        for i, coef in expr._linear.items():
+            key = variables[i]
+            coeffs[key] = coeffs.get(key, 0) + coef * scale
+        for (i, j), coef in expr._quadratic.items():
+            key = (variables[i], variables[j])
+            coeffs[key] = coeffs.get(key, 0) + coef * scale
+        coeffs[None] = coeffs.get(None, 0) + expr._constant * scale
+        return
+
+    if expr._quadratic:
+        raise TypeError("Cannot multiply by more than two variables.")
+    for i, coef in expr._linear.items():
+        key = _sort_vars(variables[i], var_scale)
+        coeffs[key] = coeffs.get(key, 0) + coef * scale
+    if expr._constant:
+        coeffs[var_scale] = coeffs.get(var_scale, 0) + expr._constant * scale
 
 
 def _sort_vars(v1: Variable, v2: Variable) -> tuple[Variable, Variable]:
@@ -415,7 +1137,7 @@ def _sort_vars(v1: Variable, v2: Variable) -> tuple[Variable, Variable]:
     which would exclude the possibility of having the same variable twice).
     """
     # two lines are used to tell mypy it's a length 2 tuple
-    _v1, _v2 = sorted((v1, v2), key=lambda v: getattr(v, "index", id(v)))
+    _v1, _v2 = sorted((v1, v2), key=lambda v: id(v) if v.index is None else v.index)
     return _v1, _v2
 
 
@@ -438,6 +1160,8 @@ def _process_mult_op_iterative(
         v = expr.left.value
         new_scale = scale * (1 / v if isinstance(expr.op, ast.Div) else v)
         stack.append((expr.right, new_scale, var_scale))
+    elif isinstance(expr.op, ast.Div) and isinstance(expr.right, Parameter):
+        raise TypeError("Cannot divide by a Parameter.")
     elif isinstance(expr.left, Variable):
         if var_scale is not None:
             raise TypeError("Cannot multiply by more than two variables.")
@@ -500,6 +1224,31 @@ class _ExprSerializer(ast.NodeVisitor):
     def visit_Variable(self, node: Variable) -> None:
         self.write(node.id)
 
+    def visit_LinearExpression(self, node: LinearExpression) -> None:
+        names = {i: v.id for i, v in node._vars.items()}
+        terms = [(coef, names[i]) for i, coef in node._linear.items() if coef]
+        terms += [
+            (coef, f"{names[i]} * {names[j]}")
+            for (i, j), coef in node._quadratic.items()
+        ]
+        if node._constant or not terms:
+            terms.append((node._constant, ""))
+        for n, (coef, name) in enumerate(terms):
+            sign = "-" if coef < 0 else "+"
+            if n:
+                self.write(f" {sign} ")
+            elif sign == "-":
+                self.write("-")
+            coef = abs(coef)
+            if not name:
+                self.write(repr(coef))
+            elif coef == 1:
+                self.write(name)
+            else:
+                self.write(f"{coef!r} * {name}")
+
+    visit_QuadraticExpression = visit_LinearExpression
+
     def visit_Constant(self, node: ast.Constant) -> None:
         self.write(repr(node.value))
 
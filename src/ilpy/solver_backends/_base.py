@@ -1,26 +1,88 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Callable
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, ClassVar
+
+from ilpy.tracing import get_tracer
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Iterable, Mapping, Sequence
+
+    import numpy as np
 
-    from ilpy._components import Constraint, Constraints, Objective
+    from ilpy._components import Constraint, ConstraintBlock, Constraints, Objective
     from ilpy._constants import VariableType
+    from ilpy._event_recorder import EventRecorder
     from ilpy._solver import Solution
-    from ilpy.event_data import EventData
+    from ilpy.event_data import EventData, EventType
+    from ilpy.tracing import Tracer
 
 
 class SolverBackend(ABC):
     """Abstract base class implemented by each concrete solver backend."""
 
+    name: ClassVar[str]
+    """Short name of the backend (e.g. "gurobi"), used in events and spans."""
+
     def __init__(self) -> None:
         self._event_callback: Callable[[EventData], None] | None = None
+        self._event_filter: frozenset[str] | None = None
+        self._event_min_interval = 0.0
+        self._last_event_time: dict[str, float] = {}
+        self._event_recorder: EventRecorder | None = None
+        self._tracer: Tracer = get_tracer()
+
+    def set_tracer(self, tracer: Tracer) -> None:
+        """Set the tracer receiving spans for native operations."""
+        self._tracer = tracer
+
+    def set_event_callback(
+        self,
+        callback: Callable[[EventData], None] | None,
+        events: Iterable[EventType | str] | None = None,
+        min_interval: float = 0.0,
+    ) -> None:
+        """Set (or clear) a callback invoked on solver progress events.
 
-    def set_event_callback(self, callback: Callable[[EventData], None] | None) -> None:
-        """Set (or clear) a callback invoked on solver progress events."""
+        Only events whose type is in `events` (all, if None) are delivered, and
+        at most one event of each type per `min_interval` seconds.
+        """
+        if min_interval < 0:
+            raise ValueError("min_interval must be non-negative")
         self._event_callback = callback
+        self._event_filter = frozenset(events) if events is not None else None
+        self._event_min_interval = min_interval
+        self._last_event_time.clear()
+
+    def set_event_recorder(self, recorder: EventRecorder | None) -> None:
+        """Set (or clear) a recorder that progress events are written into."""
+        self._event_recorder = recorder
+
+    def _subscribed(self, event_type: str) -> bool:
+        """Return True if the event callback is subscribed to `event_type`.
+
+        Backends use this to decide which native events to register for.
+        """
+        return self._event_callback is not None and (
+            self._event_filter is None or event_type in self._event_filter
+        )
+
+    def _wants_event(self, event_type: str) -> bool:
+        """Return True if an event of `event_type` should be built and emitted.
+
+        This applies the subscription filter and the rate limit, and must be
+        checked before querying the native solver for the event's data.
+        """
+        if not self._subscribed(event_type):
+            return False
+        if self._event_min_interval > 0:
+            now = perf_counter()
+            last = self._last_event_time.get(event_type)
+            if last is not None and now - last < self._event_min_interval:
+                return False
+            self._last_event_time[event_type] = now
+        return True
 
     def emit_event_data(self, data: EventData) -> None:
         """Dispatch `data` to the registered event callback (no-op if none)."""
@@ -36,6 +98,39 @@ class SolverBackend(ABC):
     ) -> None:
         """Initialize the backend with decision variables and their types."""
 
+    def set_variable_types(self, indices: np.ndarray, types: np.ndarray) -> None:
+        """Set the types (`VariableType` values) of the variables at `indices`."""
+        raise NotImplementedError(f"{self.name} does not support changing types")
+
+    def set_variable_bounds(
+        self,
+        indices: np.ndarray,
+        lower: np.ndarray | None,
+        upper: np.ndarray | None,
+    ) -> None:
+        """Set the bounds of the variables at `indices` (infinite: unbounded).
+
+        A side given as None is left unchanged.
+        """
+        raise NotImplementedError(f"{self.name} does not support variable bounds")
+
+    def add_variables(
+        self,
+        types: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        obj: np.ndarray,
+        columns: Sequence[Mapping[int, float]] | None,
+    ) -> None:
+        """Append one variable per element of `types`, after the existing ones.
+
+        `obj` holds their coefficients in the current objective, and
+        `columns` (if given) their coefficients in existing linear
+        constraints, keyed by the position of the constraint in the order
+        constraints were added.
+        """
+        raise NotImplementedError(f"{self.name} does not support adding variables")
+
     @abstractmethod
     def set_objective(self, objective: Objective) -> None:
         """Set the objective function for the problem."""
@@ -48,6 +143,39 @@ class SolverBackend(ABC):
     def add_constraint(self, constraint: Constraint) -> None:
         """Add a single constraint to the problem."""
 
+    def add_constraint_block(self, block: ConstraintBlock) -> None:
+        """Add every (linear) constraint of `block`.
+
+        Backends should override this to load the rows in bulk; the default
+        adds them one by one.
+        """
+        for constraint in block:
+            self.add_constraint(constraint)
+
+    def add_indicator_constraints(
+        self, binaries: np.ndarray, active_values: np.ndarray, block: ConstraintBlock
+    ) -> None:
+        """Add the (linear) rows of `block` as indicator constraints.
+
+        Row `r` is only enforced if the binary variable `binaries[r]` takes the
+        value `active_values[r]` (a bool).
+        """
+        raise NotImplementedError(f"{self.name} does not support indicator constraints")
+
+    def add_sos_constraints(
+        self,
+        sos_type: int,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: np.ndarray,
+    ) -> None:
+        """Add special ordered sets of type `sos_type` (1 or 2).
+
+        Set `k` holds the variables `indices[indptr[k]:indptr[k + 1]]`, ordered
+        by the corresponding (distinct) `weights`.
+        """
+        raise NotImplementedError(f"{self.name} does not support SOS constraints")
+
     @abstractmethod
     def set_timeout(self, timeout: float) -> None:
         """Set the wall-clock time limit (in seconds) for solving."""
@@ -65,8 +193,20 @@ class SolverBackend(ABC):
         """Enable or disable backend log output."""
 
     @abstractmethod
-    def solve(self) -> Solution:
-        """Solve the problem and return a `Solution`."""
+    def solve(self, lazy: bool = False) -> Solution:
+        """Solve the problem and return a `Solution`.
+
+        If `lazy`, the variable values of the solution are read with
+        `get_values` when first needed, rather than extracted right away.
+        """
+
+    def get_values(self, indices: np.ndarray | None) -> np.ndarray:
+        """Return the values of the variables at `indices` (all, if None).
+
+        The values are those of the best solution found by the last `solve`
+        (zeros, if none was found).
+        """
+        raise NotImplementedError(f"{self.name} does not support lazy solutions")
 
     @abstractmethod
     def native_model(self) -> Any:
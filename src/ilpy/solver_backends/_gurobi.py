@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import bisect
 import sys
+from time import perf_counter
 from typing import TYPE_CHECKING, cast
 
-from ilpy._constants import Relation, Sense, SolverStatus, VariableType
-from ilpy._solver import Solution
+import numpy as np
+
+from ilpy._components import ConstraintBlock
+from ilpy._constants import Sense, SolverStatus, VariableType
+from ilpy._model import _default_bounds
+from ilpy._solver import Solution, SolveTimings, _LazyValues
 
 from ._base import SolverBackend
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Mapping, Sequence
 
     from ilpy._components import Constraint, Constraints, Objective
+    from ilpy._event_recorder import EventRecorder
     from ilpy.event_data import GurobiData
 
 try:
@@ -30,11 +37,16 @@ VTYPE_MAP: Mapping[int, str] = {
     VariableType.Binary: GRB.BINARY,
     VariableType.Integer: GRB.INTEGER,
 }
+# Gurobi variable types, indexed by ilpy.VariableType value
+VTYPES = np.array(["", *(VTYPE_MAP[vt] for vt in VariableType)])
+# Gurobi constraint senses, indexed by ilpy.Relation value
+RELATION_SENSES = np.array(["", GRB.LESS_EQUAL, GRB.EQUAL, GRB.GREATER_EQUAL])
 SENSE_MAP: Mapping[Sense, int] = {
     Sense.Minimize: GRB.MINIMIZE,
     Sense.Maximize: GRB.MAXIMIZE,
 }
 EPS = sys.float_info.epsilon
+INF = float("inf")
 
 STATUS_MAP: Mapping[int, SolverStatus] = {
     GRB.LOADED: SolverStatus.UNKNOWN,
@@ -52,6 +64,8 @@ STATUS_MAP: Mapping[int, SolverStatus] = {
 
 
 class GurobiSolver(SolverBackend):
+    name = "gurobi"
+
     def __init__(self) -> None:
         super().__init__()
         # we put this in __init__ instead of initialize so that it will raise an
@@ -66,53 +80,228 @@ class GurobiSolver(SolverBackend):
         self,
         num_variables: int,
         default_variable_type: VariableType,
-        variable_types: Mapping[int, VariableType],  # TODO
+        variable_types: Mapping[int, VariableType],
     ) -> None:
         self._reset()
-        # clear if we have any
+        types = np.full(num_variables, default_variable_type, dtype=np.int8)
+        if variable_types:
+            types[list(variable_types)] = list(variable_types.values())
         # ilpy uses infinite bounds by default, but Gurobi uses 0 to infinity by default
-        vtype = VTYPE_MAP[default_variable_type]
-        self._vars = self._model.addVars(num_variables, lb=-GRB.INFINITY, vtype=vtype)
+        lower, upper = _default_bounds(types)
+        self._vars = self._model.addVars(
+            range(num_variables),
+            lb=lower.tolist(),
+            ub=upper.tolist(),
+            vtype=VTYPES[types].tolist(),
+        )
+        self._var_list = list(self._vars.values())
+
+    def set_variable_types(self, indices: np.ndarray, types: np.ndarray) -> None:
+        variables = [self._var_list[i] for i in indices.tolist()]
+        self._model.setAttr("VType", variables, VTYPES[types].tolist())
+
+    def set_variable_bounds(
+        self,
+        indices: np.ndarray,
+        lower: np.ndarray | None,
+        upper: np.ndarray | None,
+    ) -> None:
+        variables = [self._var_list[i] for i in indices.tolist()]
+        if lower is not None:
+            self._model.setAttr("LB", variables, lower.tolist())
+        if upper is not None:
+            self._model.setAttr("UB", variables, upper.tolist())
+
+    def add_variables(
+        self,
+        types: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        obj: np.ndarray,
+        columns: Sequence[Mapping[int, float]] | None,
+    ) -> None:
+        vtypes = VTYPES[types].tolist()
+        if columns is None:
+            new_vars = list(
+                self._model.addVars(
+                    range(len(vtypes)),
+                    lb=lower.tolist(),
+                    ub=upper.tolist(),
+                    obj=obj.tolist(),
+                    vtype=vtypes,
+                ).values()
+            )
+        else:
+            # validate all columns before changing the model
+            rows = [[self._linear_row(row) for row in col] for col in columns]
+            self._model.update()
+            constrs = self._model.getConstrs()
+            new_vars = [
+                self._model.addVar(
+                    lb=lb,
+                    ub=ub,
+                    obj=coef,
+                    vtype=vtype,
+                    column=gb.Column(
+                        list(column.values()), [constrs[i] for i in col_rows]
+                    ),
+                )
+                for vtype, lb, ub, coef, column, col_rows in zip(
+                    vtypes, lower.tolist(), upper.tolist(), obj.tolist(), columns, rows
+                )
+            ]
+        start = len(self._var_list)
+        for i, var in enumerate(new_vars, start):
+            self._vars[i] = var
+        self._var_list.extend(new_vars)
+
+    def _linear_row(self, row: int) -> int:
+        """Return the position among `getConstrs()` of the `row`-th constraint."""
+        if not 0 <= row < self._num_rows:
+            raise IndexError(f"Constraint {row} does not exist")
+        pos = bisect.bisect_left(self._quadratic_rows, row)
+        if pos < len(self._quadratic_rows) and self._quadratic_rows[pos] == row:
+            raise ValueError(f"Constraint {row} is not linear")
+        return row - pos
 
     def _reset(self) -> None:
         self._model.remove(self._model.getVars())
+        self._clear_constraints()
+
+    def _clear_constraints(self) -> None:
+        # constraints added since the last update are not yet listed
+        self._model.update()
         self._model.remove(self._model.getConstrs())
+        self._model.remove(self._model.getQConstrs())
+        # number of constraints added, and the positions of the quadratic ones
+        # (Gurobi keeps linear and quadratic constraints in separate lists)
+        self._num_rows = 0
+        self._quadratic_rows: list[int] = []
 
     def set_objective(self, objective: Objective) -> None:
-        obj: gb.LinExpr | gb.QuadExpr = gb.quicksum(
-            coef * var for coef, var in zip(objective, self._vars.values())
+        coefs = objective.get_coefficients()[: len(self._var_list)]
+        obj = self._quad_expr(
+            gb.LinExpr(coefs, self._var_list[: len(coefs)]),
+            *objective.get_quadratic_terms(),
         )
-        for (i, j), qcoef in objective.get_quadratic_coefficients().items():
-            obj += qcoef * self._vars[i] * self._vars[j]
-        obj += objective.get_constant()
+        obj.addConstant(objective.get_constant())
         sense = SENSE_MAP[objective.get_sense()]
         self._model.setObjective(obj, sense)
 
+    def _quad_expr(
+        self, linear: gb.LinExpr, rows: np.ndarray, cols: np.ndarray, values: np.ndarray
+    ) -> gb.LinExpr | gb.QuadExpr:
+        """Add the quadratic terms given as COO arrays to `linear` (in bulk)."""
+        if not len(values):
+            return linear
+        variables = self._var_list
+        expr = gb.QuadExpr(linear)
+        expr.addTerms(
+            values.tolist(),
+            [variables[i] for i in rows.tolist()],
+            [variables[j] for j in cols.tolist()],
+        )
+        return expr
+
     def set_constraints(self, constraints: Constraints) -> None:
         # clear existing constraints
-        self._model.remove(self._model.getConstrs())
+        self._clear_constraints()
+
+        for item in constraints._constraints:
+            if isinstance(item, ConstraintBlock):
+                self.add_constraint_block(item)
+            else:
+                self.add_constraint(item)
+
+    def add_constraint_block(self, block: ConstraintBlock) -> None:
+        if not len(block):
+            return
+        self._num_rows += len(block)
+        senses = RELATION_SENSES[block.relations]
+        try:
+            matrix = block.to_scipy(len(self._vars))
+        except ImportError:
+            # scipy is optional: build each row's LinExpr from arrays instead
+            variables = self._var_list
+            indptr, indices, data = block.indptr, block.indices, block.data
+            for row in range(len(block)):
+                start, stop = indptr[row], indptr[row + 1]
+                expr = gb.LinExpr(
+                    data[start:stop].tolist(),
+                    [variables[i] for i in indices[start:stop].tolist()],
+                )
+                self._model.addLConstr(expr, senses[row], float(block.values[row]))
+        else:
+            self._model.addMConstr(matrix, self._var_list, senses, block.values)
 
-        for constraint in constraints:
-            self.add_constraint(constraint)
+    def add_indicator_constraints(
+        self, binaries: np.ndarray, active_values: np.ndarray, block: ConstraintBlock
+    ) -> None:
+        if not len(block):
+            return
+        variables = self._var_list
+        try:
+            matrix = block.to_scipy(len(self._vars))
+        except ImportError:
+            senses = RELATION_SENSES[block.relations]
+            indptr, indices, data = block.indptr, block.indices, block.data
+            for row, (binary, active) in enumerate(
+                zip(binaries.tolist(), active_values.tolist())
+            ):
+                start, stop = indptr[row], indptr[row + 1]
+                expr = gb.LinExpr(
+                    data[start:stop].tolist(),
+                    [variables[i] for i in indices[start:stop].tolist()],
+                )
+                self._model.addGenConstrIndicator(
+                    variables[binary],
+                    active,
+                    expr,
+                    senses[row],
+                    float(block.values[row]),
+                )
+        else:
+            # one matrix-form call per relation
+            x = gb.MVar.fromlist(variables)
+            for relation in np.unique(block.relations).tolist():
+                rows = np.flatnonzero(block.relations == relation)
+                self._model.addGenConstrIndicator(
+                    gb.MVar.fromlist([variables[i] for i in binaries[rows].tolist()]),
+                    active_values[rows],
+                    matrix[rows] @ x,
+                    RELATION_SENSES[relation],
+                    block.values[rows],
+                )
+
+    def add_sos_constraints(
+        self,
+        sos_type: int,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: np.ndarray,
+    ) -> None:
+        sos = GRB.SOS_TYPE1 if sos_type == 1 else GRB.SOS_TYPE2
+        variables = self._var_list
+        bounds, idx, wts = indptr.tolist(), indices.tolist(), weights.tolist()
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            self._model.addSOS(
+                sos, [variables[i] for i in idx[start:stop]], wts[start:stop]
+            )
 
     def add_constraint(self, constraint: Constraint) -> None:
         coefs = constraint.get_coefficients()
-        qcoefs = constraint.get_quadratic_coefficients()
-        relation = constraint.get_relation()
-        value = constraint.get_value()
-        left: gb.QuadExpr | gb.LinExpr = gb.quicksum(
-            lcoef * self._vars[idx] for idx, lcoef in coefs.items()
+        left = self._quad_expr(
+            gb.LinExpr(list(coefs.values()), [self._var_list[i] for i in coefs]),
+            *constraint.get_quadratic_terms(),
         )
-        for (i, j), qcoef in qcoefs.items():
-            left = left + qcoef * self._vars[i] * self._vars[j]
-        if relation == Relation.LessEqual:
-            self._model.addConstr(left <= value)
-        elif relation == Relation.GreaterEqual:
-            self._model.addConstr(left >= value)
-        elif relation == Relation.Equal:
-            self._model.addConstr(left == value)
+        sense = RELATION_SENSES[constraint.get_relation()]
+        value = constraint.get_value()
+        if isinstance(left, gb.QuadExpr):
+            self._quadratic_rows.append(self._num_rows)
+            self._model.addQConstr(left, sense, value)
         else:
-            raise ValueError(f"Unsupported relation: {relation}")  # pragma: no cover
+            self._model.addLConstr(left, sense, value)
+        self._num_rows += 1
 
     def set_timeout(self, timeout: float) -> None:
         self._model.params.TimeLimit = timeout
@@ -130,56 +319,176 @@ class GurobiSolver(SolverBackend):
         self._model.params.OutputFlag = 1 if verbose else 0
 
     def _solver_callback(self, model: gb.Model, where: int) -> None:
-        if data := _get_event_data(model, where):
-            self.emit_event_data(data)
-
-    def solve(self) -> Solution:
-        self._model.optimize(self._solver_callback)
-
-        native_status = self._model.Status
-        status = STATUS_MAP.get(native_status, SolverStatus.OTHER)
-
-        solcount = self._model.SolCount
-        if (
-            status
-            in (SolverStatus.OPTIMAL, SolverStatus.SUBOPTIMAL, SolverStatus.TIMELIMIT)
-            and solcount > 0
-        ):
-            solution = [var.X for var in self._vars.values()]
-            objective_value = self._model.ObjVal
-        elif status == SolverStatus.TIMELIMIT:
-            solution = [var.X for var in self._vars.values()]
-            objective_value = self._model.ObjVal
-        else:
-            solution = [0] * len(self._vars)
-            objective_value = 0
-
+        # Gurobi invokes the callback for every `where`; return before any
+        # `cbGet` for those that nothing is subscribed to.
+        if where not in self._callback_wheres:
+            return
+        if where == GRB.Callback.PRESOLVE:
+            # Gurobi has no presolve-time attribute: the runtime at the last
+            # presolve callback is the best available estimate.
+            self._presolve_time = model.cbGet(GRB.Callback.RUNTIME)
+        if self._event_recorder is not None:
+            _record_event(self._event_recorder, model, where)
+        if where in self._emit_wheres and self._wants_event(EVENT_NAMES[where]):
+            if data := _get_event_data(model, where):
+                self.emit_event_data(data)
+
+    def _update_callback_wheres(self) -> None:
+        """Determine which callback `where` codes need handling in this solve."""
+        self._emit_wheres = frozenset(
+            where
+            for where, name in EVENT_NAMES.items()
+            if where != GRB.Callback.POLLING and self._subscribed(name)
+        )
+        recorded: frozenset[int] = frozenset()
+        if (recorder := self._event_recorder) is not None:
+            recorded = frozenset(
+                where
+                for where in (GRB.Callback.PRESOLVE, *_MIP_PROGRESS_CODES)
+                if recorder.records(EVENT_NAMES[where])
+            )
+        # PRESOLVE is always handled, for `SolveTimings.presolve`
+        self._callback_wheres = self._emit_wheres | recorded | {GRB.Callback.PRESOLVE}
+
+    def solve(self, lazy: bool = False) -> Solution:
+        self._has_solution = False
+        self._presolve_time = 0.0
+        self._last_event_time.clear()
+        self._update_callback_wheres()
+        with self._tracer.start_span("ilpy.gurobi.optimize") as span:
+            if span.is_recording():
+                self._model.update()
+                span.set_attribute("rows", self._model.NumConstrs)
+                span.set_attribute("columns", self._model.NumVars)
+                span.set_attribute("nnz", self._model.NumNZs)
+            self._model.optimize(self._solver_callback)
+
+            native_status = self._model.Status
+            status = STATUS_MAP.get(native_status, SolverStatus.OTHER)
+            runtime = self._model.Runtime
+            if span.is_recording():
+                span.set_attribute("status", status.name)
+                span.set_attribute("native_status", native_status)
+
+        t0 = perf_counter()
+        with self._tracer.start_span("ilpy.gurobi.extract_solution") as span:
+            solcount = self._model.SolCount
+            self._has_solution = (
+                status
+                in (
+                    SolverStatus.OPTIMAL,
+                    SolverStatus.SUBOPTIMAL,
+                    SolverStatus.TIMELIMIT,
+                )
+                and solcount > 0
+            ) or status == SolverStatus.TIMELIMIT
+            objective_value = self._model.ObjVal if self._has_solution else 0
+            solution: Sequence[float]
+            if lazy:
+                solution = _LazyValues(self.get_values, len(self._var_list))
+            elif self._has_solution:
+                solution = self._model.getAttr("X", self._var_list)
+            else:
+                solution = [0] * len(self._vars)
+            if span.is_recording():
+                span.set_attribute("solution_count", solcount)
+
+        timings = SolveTimings(
+            presolve=self._presolve_time,
+            search=max(runtime - self._presolve_time, 0.0),
+            solution_extraction=perf_counter() - t0,
+        )
         return Solution(
             variable_values=solution,
             objective_value=objective_value,
-            time=self._model.Runtime,
+            time=runtime,
             status=status,
             native_status=native_status,
+            timings=timings,
         )
 
+    def get_values(self, indices: np.ndarray | None) -> np.ndarray:
+        if indices is None:
+            variables = self._var_list
+        else:
+            variables = [self._var_list[i] for i in indices.tolist()]
+        if not self._has_solution:
+            return np.zeros(len(variables))
+        return np.array(self._model.getAttr("X", variables), dtype=np.float64)
+
     def native_model(self) -> gb.Model:
         return self._model
 
 
+EVENT_NAMES: Mapping[int, str] = {
+    GRB.Callback.POLLING: "POLLING",
+    GRB.Callback.PRESOLVE: "PRESOLVE",
+    GRB.Callback.SIMPLEX: "SIMPLEX",
+    GRB.Callback.MIP: "MIP",
+    GRB.Callback.MIPSOL: "MIPSOL",
+    GRB.Callback.MIPNODE: "MIPNODE",
+    GRB.Callback.MESSAGE: "MESSAGE",
+    GRB.Callback.BARRIER: "BARRIER",
+    GRB.Callback.MULTIOBJ: "MULTIOBJ",
+    GRB.Callback.IIS: "IIS",
+}
+
+# (objbst, objbnd, nodcnt, solcnt) callback codes for each MIP callback
+_MIP_PROGRESS_CODES: Mapping[int, tuple[int, int, int, int]] = {
+    GRB.Callback.MIP: (
+        GRB.Callback.MIP_OBJBST,
+        GRB.Callback.MIP_OBJBND,
+        GRB.Callback.MIP_NODCNT,
+        GRB.Callback.MIP_SOLCNT,
+    ),
+    GRB.Callback.MIPSOL: (
+        GRB.Callback.MIPSOL_OBJBST,
+        GRB.Callback.MIPSOL_OBJBND,
+        GRB.Callback.MIPSOL_NODCNT,
+        GRB.Callback.MIPSOL_SOLCNT,
+    ),
+    GRB.Callback.MIPNODE: (
+        GRB.Callback.MIPNODE_OBJBST,
+        GRB.Callback.MIPNODE_OBJBND,
+        GRB.Callback.MIPNODE_NODCNT,
+        GRB.Callback.MIPNODE_SOLCNT,
+    ),
+}
+
+
 def get_event_type_name(where: int) -> str:
-    event_names = {
-        GRB.Callback.POLLING: "POLLING",
-        GRB.Callback.PRESOLVE: "PRESOLVE",
-        GRB.Callback.SIMPLEX: "SIMPLEX",
-        GRB.Callback.MIP: "MIP",
-        GRB.Callback.MIPSOL: "MIPSOL",
-        GRB.Callback.MIPNODE: "MIPNODE",
-        GRB.Callback.MESSAGE: "MESSAGE",
-        GRB.Callback.BARRIER: "BARRIER",
-        GRB.Callback.MULTIOBJ: "MULTIOBJ",
-        GRB.Callback.IIS: "IIS",
-    }
-    return event_names.get(where, "UNKNOWN")
+    return EVENT_NAMES.get(where, "UNKNOWN")
+
+
+def _bound(value: float) -> float:
+    # Gurobi reports missing bounds as +/- GRB.INFINITY (1e100)
+    if value >= GRB.INFINITY:
+        return INF
+    if value <= -GRB.INFINITY:
+        return -INF
+    return value
+
+
+def _record_event(recorder: EventRecorder, model: gb.Model, where: int) -> None:
+    """Write MIP progress (and presolve timestamps) into `recorder`."""
+    if where not in _MIP_PROGRESS_CODES and where != GRB.Callback.PRESOLVE:
+        return
+    event_name = EVENT_NAMES[where]
+    if not recorder.records(event_name):
+        return
+    runtime = model.cbGet(GRB.Callback.RUNTIME)
+    if where == GRB.Callback.PRESOLVE:
+        recorder.record(event_name, runtime)
+        return
+    objbst, objbnd, nodcnt, solcnt = _MIP_PROGRESS_CODES[where]
+    recorder.record(
+        event_name,
+        runtime,
+        _bound(model.cbGet(objbst)),
+        _bound(model.cbGet(objbnd)),
+        model.cbGet(nodcnt),
+        model.cbGet(solcnt),
+    )
 
 
 def _get_event_data(model: gb.Model, where: int) -> GurobiData | None:
@@ -1,20 +1,25 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Literal
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
+from ilpy._components import ConstraintBlock
 from ilpy._constants import Relation, Sense, SolverStatus, VariableType
-from ilpy._solver import Solution
+from ilpy._solver import Solution, SolveTimings, _LazyValues
 
 from ._base import SolverBackend
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Iterator, Mapping, Sequence
 
     from ilpy._components import Constraint, Constraints, Objective
 
 try:
     import pyscipopt as scip
     from pyscipopt import SCIP_EVENTTYPE
+    from pyscipopt.scip import Expr, Term
 except ImportError:
     raise ImportError(
         "pyscipopt not installed, but required for GurobiSolver. "
@@ -51,10 +56,17 @@ EVENT_NAME_MAP = {
     val: name for name, val in SCIP_EVENTTYPE.__dict__.items() if name.isupper()
 }
 
+# the SCIP events that the event handler can translate into event data
+SUPPORTED_EVENTS = ("PRESOLVEROUND", "BESTSOLFOUND")
+
 INF = float("inf")
+# no quadratic terms, as (rows, cols, values)
+_NO_TERMS = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0))
 
 
 class ScipSolver(SolverBackend):
+    name = "scip"
+
     def __init__(self) -> None:
         super().__init__()
         self._model = scip.Model(problemName="problem", defaultPlugins=True)
@@ -70,6 +82,12 @@ class ScipSolver(SolverBackend):
     ) -> None:
         self.set_verbose(False)
         self._vars: list[scip.Variable] = []
+        # all constraints added, in order (for adding columns to them)
+        self._rows: list[scip.Constraint] = []
+        # epigraph variable and constraint of a quadratic objective, reused by
+        # every quadratic objective so that the model does not grow
+        self._epigraph_var: scip.Variable | None = None
+        self._epigraph_cons: scip.Constraint | None = None
         for i in range(num_variables):
             # Use special type if provided, otherwise default.
             vt = variable_types.get(i, default_variable_type)
@@ -79,70 +97,195 @@ class ScipSolver(SolverBackend):
             var = self._model.addVar(vtype=vtype, lb=lb, ub=ub, name=f"x_{i}")
             self._vars.append(var)
 
-    def set_objective(self, objective: Objective) -> None:
-        # Create linear part of the objective
-        expr = scip.quicksum(coef * var for coef, var in zip(objective, self._vars))
-        expr = expr + objective.get_constant()
-        sense = "minimize" if objective.get_sense() == Sense.Minimize else "maximize"
-        if quad_coeffs := objective.get_quadratic_coefficients():
-            self._set_nonlinear_objective(expr, quad_coeffs, sense)  # type: ignore
-        else:
-            self._model.setObjective(expr, sense=sense)
+    def set_variable_types(self, indices: np.ndarray, types: np.ndarray) -> None:
+        for i, vt in zip(indices.tolist(), types.tolist()):
+            self._model.chgVarType(self._vars[i], VTYPE_MAP[vt])
 
-    def _set_nonlinear_objective(
+    def set_variable_bounds(
         self,
-        obj_expr: Any,  # linear scip expression object
-        quad_coeffs: Mapping[tuple[int, int], float],
-        sense: Literal["minimize", "maximize"],
+        indices: np.ndarray,
+        lower: np.ndarray | None,
+        upper: np.ndarray | None,
     ) -> None:
-        """Handles epigraph reformulation for nonlinear objectives."""
-
-        for (i, j), qcoef in quad_coeffs.items():
-            obj_expr += qcoef * self._vars[i] * self._vars[j]
+        # SCIP represents infinite bounds as None
+        variables = [self._vars[i] for i in indices.tolist()]
+        if lower is not None:
+            for var, lb in zip(variables, lower.tolist()):
+                self._model.chgVarLb(var, None if lb == -INF else lb)
+        if upper is not None:
+            for var, ub in zip(variables, upper.tolist()):
+                self._model.chgVarUb(var, None if ub == INF else ub)
+
+    def add_variables(
+        self,
+        types: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        obj: np.ndarray,
+        columns: Sequence[Mapping[int, float]] | None,
+    ) -> None:
+        # validate all columns before changing the model
+        rows = [[self._linear_row(row) for row in col] for col in columns or ()]
+        attributes = zip(types.tolist(), lower.tolist(), upper.tolist(), obj.tolist())
+        for n, (vt, lb, ub, coef) in enumerate(attributes):
+            var = self._model.addVar(
+                vtype=VTYPE_MAP[vt], lb=lb, ub=ub, obj=coef, name=f"x_{len(self._vars)}"
+            )
+            self._vars.append(var)
+            if columns is not None:
+                for cons, value in zip(rows[n], columns[n].values()):
+                    self._model.addConsCoeff(cons, var, value)
+
+    def _linear_row(self, row: int) -> scip.Constraint:
+        """Return the `row`-th constraint added, which must be linear."""
+        if not 0 <= row < len(self._rows):
+            raise IndexError(f"Constraint {row} does not exist")
+        cons = self._rows[row]
+        if not cons.isLinear():
+            raise ValueError(f"Constraint {row} is not linear")
+        return cons
 
-        new_obj = self._model.addVar(lb=-INF, obj=1)  # Surrogate objective variable
+    def set_objective(self, objective: Objective) -> None:
+        expr = self._expr(
+            dict(enumerate(objective.get_coefficients()[: len(self._vars)])),
+            *_NO_TERMS,
+        )
+        expr = expr + objective.get_constant()
+        sense = "minimize" if objective.get_sense() == Sense.Minimize else "maximize"
+        quadratic = None
+        if len((terms := objective.get_quadratic_terms())[0]):
+            quadratic = self._expr({}, *terms)
+        expr = self._set_epigraph(quadratic, sense, expr)
+        self._model.setObjective(expr, sense=sense)  # type: ignore
 
+    def _expr(
+        self,
+        linear: Mapping[int, float],
+        rows: np.ndarray,
+        cols: np.ndarray,
+        values: np.ndarray,
+    ) -> Expr:
+        """Build an Expr directly from its terms (linear, then quadratic COO).
+
+        This is much cheaper than adding up `coef * var` products.
+        """
+        variables = self._vars
+        terms = {Term(variables[i]): coef for i, coef in linear.items() if coef}
+        for i, j, coef in zip(rows.tolist(), cols.tolist(), values.tolist()):
+            terms[Term(variables[i], variables[j])] = coef
+        return Expr(terms)
+
+    def _set_epigraph(self, quadratic: Expr | None, sense: str, expr: Expr) -> Expr:
+        """Handles epigraph reformulation for quadratic objectives.
+
+        SCIP only supports linear objectives, so the quadratic part `q(x)` of
+        the objective is replaced by a variable `t` with `q(x) <= t` (`>=` when
+        maximizing), and `t` is added to the linear part `expr`.  The same
+        variable is used for every objective; its constraint is replaced, and
+        removed (fixing `t` to 0) when the objective is linear.
+        """
+        if self._epigraph_cons is not None:
+            self._model.delCons(self._epigraph_cons)
+            self._epigraph_cons = None
+        if quadratic is None:
+            if self._epigraph_var is not None:
+                self._model.chgVarLb(self._epigraph_var, 0.0)
+                self._model.chgVarUb(self._epigraph_var, 0.0)
+            return expr
+
+        if self._epigraph_var is None:
+            self._epigraph_var = self._model.addVar(lb=None, ub=None, name="epigraph")
+        else:
+            self._model.chgVarLb(self._epigraph_var, None)
+            self._model.chgVarUb(self._epigraph_var, None)
+        t = self._epigraph_var
         if sense == "minimize":
-            self._model.addCons(obj_expr <= new_obj)
-            self._model.setMinimize()
-        elif sense == "maximize":
-            self._model.addCons(obj_expr >= new_obj)
-            self._model.setMaximize()
-
-    def _add_quad_auxiliary_variables(
-        self, quad_coeffs: Mapping[tuple[int, int], float]
-    ) -> None:
-        for (i, j), value in quad_coeffs.items():
-            if value != 0:
-                # create z_ij and add val * z_ij to objective
-                # z_ij cand be unbounded and real, it inherits all other
-                # bounds/integrality from the x_i * x_j = z_ij constraint below
-                z_ij = self._model.addVar(
-                    name=f"z_{i},{j}", lb=-INF, ub=INF, obj=value, vtype="C"
-                )
-                # add the constraint x_i * x_j - z_ij = 0
-                self._model.addCons(self._vars[i] * self._vars[j] - z_ij == 0)
+            self._epigraph_cons = self._model.addCons(quadratic <= t)
+        else:
+            self._epigraph_cons = self._model.addCons(quadratic >= t)
+        return expr + t
 
     def set_constraints(self, constraints: Constraints) -> None:
-        for constraint in constraints:
-            self.add_constraint(constraint)
+        # clear existing constraints
+        for cons in self._rows:
+            self._model.delCons(cons)
+        self._rows = []
+
+        for item in constraints._constraints:
+            if isinstance(item, ConstraintBlock):
+                self.add_constraint_block(item)
+            else:
+                self.add_constraint(item)
+
+    def add_constraint_block(self, block: ConstraintBlock) -> None:
+        for expr, relation, value in self._block_rows(block):
+            if relation == Relation.LessEqual:
+                cons = self._model.addCons(expr <= value)
+            elif relation == Relation.GreaterEqual:
+                cons = self._model.addCons(expr >= value)
+            else:
+                cons = self._model.addCons(expr == value)
+            self._rows.append(cons)
+
+    def add_indicator_constraints(
+        self, binaries: np.ndarray, active_values: np.ndarray, block: ConstraintBlock
+    ) -> None:
+        rows = zip(binaries.tolist(), active_values.tolist(), self._block_rows(block))
+        for binary, active, (expr, relation, value) in rows:
+            # SCIP's indicator constraints are inequalities, so an equation
+            # becomes two of them
+            var = self._vars[binary]
+            if relation != Relation.GreaterEqual:
+                self._model.addConsIndicator(expr <= value, var, activeone=active)
+            if relation != Relation.LessEqual:
+                self._model.addConsIndicator(expr >= value, var, activeone=active)
+
+    def add_sos_constraints(
+        self,
+        sos_type: int,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: np.ndarray,
+    ) -> None:
+        add = self._model.addConsSOS1 if sos_type == 1 else self._model.addConsSOS2
+        bounds, idx, wts = indptr.tolist(), indices.tolist(), weights.tolist()
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            add([self._vars[i] for i in idx[start:stop]], wts[start:stop])
+
+    def _block_rows(self, block: ConstraintBlock) -> Iterator[tuple[Expr, int, float]]:
+        """Yield the expression, relation and value of every row of `block`."""
+        # build each row's Expr directly from its term dict (much cheaper than
+        # adding up `coef * var` products), with one Term per variable used
+        variables = self._vars
+        terms = {i: Term(variables[i]) for i in np.unique(block.indices).tolist()}
+        indptr = block.indptr.tolist()
+        indices, data = block.indices.tolist(), block.data.tolist()
+        relations, values = block.relations.tolist(), block.values.tolist()
+        for row in range(len(block)):
+            start, stop = indptr[row], indptr[row + 1]
+            expr = Expr(
+                {
+                    terms[i]: coef
+                    for i, coef in zip(indices[start:stop], data[start:stop])
+                }
+            )
+            yield expr, relations[row], values[row]
 
     def add_constraint(self, constraint: Constraint) -> None:
-        coefs = constraint.get_coefficients()
-        qcoefs = constraint.get_quadratic_coefficients()
+        left = self._expr(
+            constraint.get_coefficients(), *constraint.get_quadratic_terms()
+        )
         relation = constraint.get_relation()
         value = constraint.get_value()
-        left = scip.quicksum(lcoef * self._vars[idx] for idx, lcoef in coefs.items())
-        for (i, j), qcoef in qcoefs.items():
-            left = left + qcoef * self._vars[i] * self._vars[j]
         if relation == Relation.LessEqual:
-            self._model.addCons(left <= value)
+            cons = self._model.addCons(left <= value)
         elif relation == Relation.GreaterEqual:
-            self._model.addCons(left >= value)
+            cons = self._model.addCons(left >= value)
         elif relation == Relation.Equal:
-            self._model.addCons(left == value)
+            cons = self._model.addCons(left == value)
         else:
             raise ValueError(f"Unsupported relation: {relation}")  # pragma: no cover
+        self._rows.append(cons)
 
     def set_timeout(self, timeout: float) -> None:
         self._model.setParam("limits/time", timeout)
@@ -160,50 +303,100 @@ class ScipSolver(SolverBackend):
         level = 4 if verbose else 0
         self._model.setParam("display/verblevel", level)
 
-    def solve(self) -> Solution:
-        self._model.optimize()  # TODO: event callback
-
-        native_status = self._model.getStatus()
-        status = STATUS_MAP.get(native_status, SolverStatus.OTHER)
-
-        if not self._model.getNSols():
-            variable_values = [0] * len(self._vars)
-            objective_value = 0
-        else:
-            sol = self._model.getBestSol()
-            variable_values = [self._model.getSolVal(sol, v) for v in self._vars]
-            objective_value = self._model.getSolObjVal(sol)
+    def solve(self, lazy: bool = False) -> Solution:
+        self._last_event_time.clear()
+        with self._tracer.start_span("ilpy.scip.optimize") as span:
+            if span.is_recording():
+                span.set_attribute("rows", self._model.getNConss())
+                span.set_attribute("columns", self._model.getNVars())
+            self._model.optimize()
+
+            native_status = self._model.getStatus()
+            status = STATUS_MAP.get(native_status, SolverStatus.OTHER)
+            solving_time = self._model.getSolvingTime()
+            presolving_time = self._model.getPresolvingTime()
+            if span.is_recording():
+                span.set_attribute("status", status.name)
+                span.set_attribute("native_status", native_status)
+
+        t0 = perf_counter()
+        with self._tracer.start_span("ilpy.scip.extract_solution") as span:
+            nsols = self._model.getNSols()
+            objective_value = 0.0
+            if nsols:
+                sol = self._model.getBestSol()
+                objective_value = self._model.getSolObjVal(sol)
+            variable_values: Sequence[float]
+            if lazy:
+                variable_values = _LazyValues(self.get_values, len(self._vars))
+            elif not nsols:
+                variable_values = [0.0] * len(self._vars)
+            else:
+                variable_values = [self._model.getSolVal(sol, v) for v in self._vars]
+            if span.is_recording():
+                span.set_attribute("solution_count", nsols)
+        extraction_time = perf_counter() - t0
 
         # Reset SCIP to allow adding constraints for future solves
         self._model.freeTransform()
 
+        timings = SolveTimings(
+            presolve=presolving_time,
+            search=max(solving_time - presolving_time, 0.0),
+            solution_extraction=extraction_time,
+        )
         return Solution(
             variable_values=variable_values,
             objective_value=objective_value,
             status=status,
-            time=self._model.getSolvingTime(),
+            time=solving_time,
             native_status=native_status,
+            timings=timings,
         )
 
+    def get_values(self, indices: np.ndarray | None) -> np.ndarray:
+        if indices is None:
+            variables = self._vars
+        else:
+            variables = [self._vars[i] for i in indices.tolist()]
+        if not self._model.getNSols():
+            return np.zeros(len(variables))
+        # solutions survive freeTransform, but must be looked up again after it
+        sol = self._model.getBestSol()
+        return np.array([self._model.getSolVal(sol, v) for v in variables])
+
     def native_model(self) -> Any:
         return self._model
 
 
+def _bound(model: scip.Model, value: float) -> float:
+    # SCIP reports missing bounds as +/- its (finite) infinity value
+    return value if not model.isInfinity(abs(value)) else INF if value > 0 else -INF
+
+
 class EventHandler(scip.Eventhdlr):
     def __init__(self, backend: ScipSolver):
         """event handler to capture SCIP events and pass data to the backend."""
         self.backend = backend
+        self._caught: list[int] = []
 
     def eventinit(self) -> None:
-        """Initialize the event handler and register the desired events."""
-        # Register PRESOLVEROUND and BESTSOLFOUND events
-        self.model.catchEvent(SCIP_EVENTTYPE.PRESOLVEROUND, self)
-        self.model.catchEvent(SCIP_EVENTTYPE.BESTSOLFOUND, self)
+        """Register for the events needed by the backend's callback/recorder."""
+        recorder = self.backend._event_recorder
+        self._caught = [
+            getattr(SCIP_EVENTTYPE, name)
+            for name in SUPPORTED_EVENTS
+            if self.backend._subscribed(name)
+            or (recorder is not None and recorder.records(name))
+        ]
+        for eventtype in self._caught:
+            self.model.catchEvent(eventtype, self)
 
     def eventexit(self) -> None:
         """Unregister events when the handler exits."""
-        self.model.dropEvent(SCIP_EVENTTYPE.PRESOLVEROUND, self)
-        self.model.dropEvent(SCIP_EVENTTYPE.BESTSOLFOUND, self)
+        for eventtype in self._caught:
+            self.model.dropEvent(eventtype, self)
+        self._caught = []
 
     def eventexec(self, event: scip.Event) -> None:
         """Handle the event execution."""
@@ -212,6 +405,24 @@ class EventHandler(scip.Eventhdlr):
         m = self.model
         event_type: str = EVENT_NAME_MAP.get(eventtype, "UNKNOWN")
 
+        recorder = self.backend._event_recorder
+        if recorder is not None and recorder.records(event_type):
+            if eventtype == SCIP_EVENTTYPE.BESTSOLFOUND:
+                # the primal bound is only updated after this event is processed
+                primalbound = m.getSolObjVal(m.getBestSol())
+            else:
+                primalbound = m.getPrimalbound()
+            recorder.record(
+                event_type,
+                m.getSolvingTime(),
+                _bound(m, primalbound),
+                _bound(m, m.getDualbound()),
+                m.getNNodes(),
+                m.getNSolsFound(),
+            )
+        if not self.backend._wants_event(event_type):
+            return
+
         event_data = {
             "event_type": event_type,
             "backend": "scip",
@@ -0,0 +1,236 @@
+"""Structured tracing of solver operations.
+
+Every operation performed by an [`ilpy.Solver`][] (and the native calls made by
+its backend) is wrapped in a *span*: a named interval with a start, an end and
+a set of attributes such as the backend name, the number of rows or nonzeros
+transferred, or the final solver status.  Spans are handed to a `Tracer`,
+which can be any object implementing the small protocol below, so ilpy can be
+plugged into an existing tracing setup (e.g. with a thin OpenTelemetry adapter).
+
+By default a no-op tracer is used, whose spans are shared singletons that
+record nothing. Instrumented code checks `Span.is_recording()` before
+computing attributes, so the disabled path costs only a few method calls.
+
+```python
+from ilpy.tracing import JsonLinesTracer, set_tracer
+
+with JsonLinesTracer("ilpy-trace.jsonl") as tracer:
+    set_tracer(tracer)  # used by every Solver created afterwards
+    ilpy.solve(...)
+```
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+from contextvars import ContextVar
+from typing import IO, TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    import os
+    from types import TracebackType
+
+__all__ = [
+    "JsonLinesTracer",
+    "NoOpTracer",
+    "Span",
+    "Tracer",
+    "get_tracer",
+    "set_tracer",
+]
+
+
+class Span(Protocol):
+    """A single timed operation.
+
+    Spans are context managers: entering returns the span itself, and exiting
+    ends it (recording the exception, if one was raised).
+    """
+
+    def is_recording(self) -> bool:
+        """Return True if attributes set on this span are kept."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute (a JSON-serializable value) to this span."""
+
+    def end(self) -> None:
+        """End the span, if it was not ended already."""
+
+    def __enter__(self) -> Span: ...
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None: ...
+
+
+class Tracer(Protocol):
+    """Factory for spans. Implement this to forward ilpy spans elsewhere."""
+
+    def start_span(self, name: str) -> Span:
+        """Start (and return) a new span called `name`."""
+
+
+class _NoOpSpan:
+    __slots__ = ()
+
+    def is_recording(self) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> _NoOpSpan:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoOpSpan()
+
+
+class NoOpTracer:
+    """A tracer that records nothing. This is the default."""
+
+    def start_span(self, name: str) -> Span:
+        """Return the shared no-op span."""
+        return _NOOP_SPAN
+
+
+_current_span: ContextVar[_RecordedSpan | None] = ContextVar(
+    "ilpy_current_span", default=None
+)
+
+
+class _RecordedSpan:
+    def __init__(self, tracer: JsonLinesTracer, name: str, span_id: int) -> None:
+        self._tracer = tracer
+        self._parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.name = name
+        self.span_id = span_id
+        self.attributes: dict[str, Any] = {}
+        self.error: str | None = None
+        self.start_time = time.time()
+        self._t0 = time.perf_counter()
+        self._ended = False
+
+    def is_recording(self) -> bool:
+        return not self._ended
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        if self._ended:
+            return
+        self._ended = True
+        duration = time.perf_counter() - self._t0
+        try:
+            _current_span.reset(self._token)
+        except ValueError:  # pragma: no cover
+            # ended in a different context than it was started in
+            _current_span.set(self._parent)
+        record = {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self._parent.span_id if self._parent else None,
+            "start_time": self.start_time,
+            "duration": duration,
+            "status": "error" if self.error else "ok",
+            "attributes": self.attributes,
+        }
+        if self.error:
+            record["error"] = self.error
+        self._tracer._export(record)
+
+    def __enter__(self) -> _RecordedSpan:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc is not None:
+            self.error = f"{type(exc).__name__}: {exc}"
+        self.end()
+
+
+class JsonLinesTracer:
+    """A tracer that writes each finished span as one line of JSON.
+
+    Each line holds the span `name`, a `span_id` unique within this tracer,
+    the `parent_id` of the enclosing span (or null), the `start_time` (seconds
+    since the epoch), the `duration` (seconds), a `status` of "ok" or "error"
+    (with the exception in `error`), and the span's `attributes`.
+
+    Parameters
+    ----------
+    file : str | os.PathLike | IO[str]
+        A path (opened in append mode) or an already-open text stream.
+    """
+
+    def __init__(self, file: str | os.PathLike[str] | IO[str]) -> None:
+        if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+            self._stream: IO[str] = open(file, "a")
+            self._owns_stream = True
+        else:
+            self._stream = file
+            self._owns_stream = False
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str) -> Span:
+        """Start a recording span called `name`."""
+        return _RecordedSpan(self, name, next(self._ids))
+
+    def _export(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._stream.write(line + "\n")
+
+    def flush(self) -> None:
+        """Flush the underlying stream."""
+        with self._lock:
+            self._stream.flush()
+
+    def close(self) -> None:
+        """Flush, and close the stream if this tracer opened it."""
+        self.flush()
+        if self._owns_stream:
+            self._stream.close()
+
+    def __enter__(self) -> JsonLinesTracer:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+_NOOP_TRACER = NoOpTracer()
+_default_tracer: Tracer = _NOOP_TRACER
+
+
+def get_tracer() -> Tracer:
+    """Return the tracer used by newly created solvers."""
+    return _default_tracer
+
+
+def set_tracer(tracer: Tracer | None) -> None:
+    """Set the tracer used by newly created solvers (None restores the no-op).
+
+    Existing solvers keep their tracer; use `Solver.set_tracer` to change it.
+    """
+    global _default_tracer
+    _default_tracer = _NOOP_TRACER if tracer is None else tracer
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import operator
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+import ilpy
+
+
+def test_variable_array_indexing() -> None:
+    x = ilpy.VariableArray((2, 3), start=4)
+    assert x.shape == (2, 3)
+    assert len(x) == 2
+    assert x.size == 6
+    npt.assert_array_equal(x.indices, [[4, 5, 6], [7, 8, 9]])
+
+    v = x[1, 2]
+    assert isinstance(v, ilpy.Variable)
+    assert v.index == 9
+    assert x[0].shape == (3,)
+    npt.assert_array_equal(x[:, 1].indices, [5, 8])
+
+
+def test_linear_expression_array() -> None:
+    x = ilpy.VariableArray(3)
+    expr = 2 * x + 1
+    assert expr.shape == (3,)
+    assert expr[1].get_coefficients() == {1: 2.0}
+    assert expr[1].get_constant() == 1.0
+
+    expr = x - x[0]
+    assert expr[2].get_coefficients() == {2: 1.0, 0: -1.0}
+    # cancelled terms are dropped once the rows become constraints
+    assert (expr >= 0)[0].get_coefficients() == {}
+
+    c = np.array([1.0, 2.0, 3.0])
+    assert (c @ x).get_coefficients() == {0: 1.0, 1: 2.0, 2: 3.0}
+    assert (x @ c).get_coefficients() == {0: 1.0, 1: 2.0, 2: 3.0}
+    assert x.sum().get_coefficients() == {0: 1.0, 1: 1.0, 2: 1.0}
+
+    y = ilpy.VariableArray((2, 2))
+    cols = y.sum(axis=0)
+    assert cols.shape == (2,)
+    assert cols[1].get_coefficients() == {1: 1.0, 3: 1.0}
+
+
+@pytest.mark.parametrize("sparse", [False, True], ids=["dense", "sparse"])
+def test_matmul_constraint_block(sparse: bool) -> None:
+    A = np.array([[1.0, 2.0, 0.0], [0.0, 1.0, -1.0]])
+    if sparse:
+        scipy_sparse = pytest.importorskip("scipy.sparse")
+        A = scipy_sparse.csr_matrix(A)
+    x = ilpy.VariableArray(3)
+
+    block = A @ x <= [4, 1]
+    assert isinstance(block, ilpy.ConstraintBlock)
+    assert len(block) == 2
+    npt.assert_array_equal(block.indptr, [0, 2, 4])
+    npt.assert_array_equal(block.indices, [0, 1, 1, 2])
+    npt.assert_array_equal(block.values, [4, 1])
+    assert block.relations.tolist() == [ilpy.LessEqual] * 2
+
+    row = block[1]
+    assert isinstance(row, ilpy.Constraint)
+    assert row.get_coefficients() == {1: 1.0, 2: -1.0}
+    assert row.get_value() == 1
+
+    npt.assert_array_equal(block.is_violated([2, 2, 0]), [True, True])
+    npt.assert_array_equal(block.is_violated([0, 1, 1]), [False, False])
+
+
+def test_constraint_block_canonical() -> None:
+    block = ilpy.ConstraintBlock(
+        indptr=[0, 3, 4],
+        indices=[2, 0, 2, 1],
+        data=[1.0, 1.0, 2.0, 0.0],
+        relations=[ilpy.Equal, ilpy.GreaterEqual],
+        values=[1.0, 0.0],
+    )
+    npt.assert_array_equal(block.indptr, [0, 2, 2])
+    npt.assert_array_equal(block.indices, [0, 2])
+    npt.assert_array_equal(block.data, [1.0, 3.0])
+    assert block.nnz == 2
+
+
+def test_constraints_to_block() -> None:
+    x = [ilpy.Variable(f"x{i}", index=i) for i in range(3)]
+    constraints = ilpy.Constraints()
+    constraints.add(x[0] + x[1] <= 1)
+    constraints.add(x[2] - x[0] >= 0)
+    constraints.add(ilpy.ConstraintBlock.from_matrix(np.eye(3), ilpy.Equal, 1))
+    assert len(constraints) == 5
+    assert len(list(constraints)) == 5
+
+    block = constraints.to_block()
+    assert len(block) == 5
+    assert block.relations.tolist() == [
+        ilpy.LessEqual,
+        ilpy.GreaterEqual,
+        ilpy.Equal,
+        ilpy.Equal,
+        ilpy.Equal,
+    ]
+    npt.assert_array_equal(block.values, [1, 0, 1, 1, 1])
+
+    constraints.add(x[0] * x[1] <= 1)
+    with pytest.raises(ValueError):
+        constraints.to_block()
+
+
+def test_constraints_deduplicate() -> None:
+    x = [ilpy.Variable(f"x{i}", index=i) for i in range(3)]
+    constraints = ilpy.Constraints()
+    constraints.add(x[0] + x[1] <= 2)
+    constraints.add(x[0] + x[1] <= 1)  # duplicate, tighter
+    constraints.add(-2 * x[0] - 2 * x[1] >= -3)  # parallel, looser
+    constraints.add(0.3 * x[0] + 0.9 * x[2] == 0.3)
+    constraints.add(x[0] + 3 * x[2] == 1)  # parallel (up to rounding)
+    constraints.add(x[0] + 3 * x[2] == 2)  # not merged: a different equation
+    constraints.add(x[0] * x[1] <= 1)
+    constraints.add(x[0] + x[1] <= 1)
+
+    stats = constraints.deduplicate(normalize=False)
+    assert (stats.rows, stats.duplicate_rows, stats.parallel_rows) == (7, 2, 0)
+    assert len(constraints) == 6
+
+    stats = constraints.deduplicate()
+    assert (stats.rows, stats.duplicate_rows, stats.parallel_rows) == (5, 0, 2)
+    assert stats.removed_rows == 2
+    kept = list(constraints)
+    assert len(kept) == 4
+    # the tightest row of every group is kept, as it was given
+    assert dict(kept[0].get_coefficients()) == {0: 1, 1: 1}
+    assert kept[0].get_value() == 1
+    assert kept[1].get_value() == pytest.approx(0.3)
+    assert kept[2].get_value() == 2
+    assert kept[3].get_quadratic_coefficients()
+
+
+def test_deduplicate_parallel_equations() -> None:
+    # 0.3 / 3 is not exactly 0.1
+    x = ilpy.Variable("x", index=0)
+    for relation in (operator.eq, operator.le):
+        constraints = ilpy.Constraints()
+        constraints.add(relation(3 * x, 0.3))
+        constraints.add(relation(1 * x, 0.1))
+        stats = constraints.deduplicate()
+        assert (stats.duplicate_rows, stats.parallel_rows) == (0, 1)
+        assert len(constraints) == 1
+
+
+def test_constraints_stats() -> None:
+    x = [ilpy.Variable(f"x{i}", index=i) for i in range(3)]
+    constraints = ilpy.Constraints()
+    constraints.add(
+        ilpy.ConstraintBlock.from_matrix(
+            [[1, 2, 0], [0, 0, -1e-3], [0, 0, 0]],
+            [ilpy.LessEqual, ilpy.GreaterEqual, ilpy.Equal],
+            [4, 0, 0],
+        )
+    )
+    constraints.add(x[0] + 1e3 * x[1] + x[2] == 5)
+    constraints.add(x[0] * x[1] + x[1] * x[1] <= 1)
+
+    stats = constraints.stats()
+    assert (stats.rows, stats.columns, stats.nnz) == (5, 3, 6)
+    assert stats.relations == {
+        ilpy.LessEqual: 2,
+        ilpy.Equal: 2,
+        ilpy.GreaterEqual: 1,
+    }
+    assert (stats.quadratic_constraints, stats.quadratic_terms) == (1, 2)
+    npt.assert_array_equal(stats.row_lengths, [2, 1, 1, 1])
+    assert stats.max_row_length == 3
+    assert stats.matrix_range == (1e-3, 1e3)
+    assert stats.rhs_range == (1, 5)
+    assert stats.variable_types == {}
+    assert np.isnan(stats.objective_range).all()
+    assert constraints.stats(10).columns == 10
+
+    empty = ilpy.Constraints().stats()
+    assert (empty.rows, empty.columns, empty.max_row_length) == (0, 0, 0)
+    assert np.isnan(empty.matrix_range).all()
+
+
+def test_constraint_block_canonicalize() -> None:
+    block = ilpy.ConstraintBlock.from_matrix(
+        [[-2, 4], [0, 0], [3, -1]],
+        [ilpy.LessEqual, ilpy.GreaterEqual, ilpy.GreaterEqual],
+        [8, 1, 6],
+    ).canonicalize()
+    npt.assert_allclose(block.data, [0.5, -1, 1, -1 / 3])
+    npt.assert_array_equal(
+        block.relations, [ilpy.GreaterEqual, ilpy.GreaterEqual, ilpy.GreaterEqual]
+    )
+    npt.assert_allclose(block.values, [-2, 1, 2])
@@ -5,3 +5,19 @@ def test_constraint() -> None:
     constraint = ilpy.Constraint()
     constraint.set_coefficient(0, 1)
     constraint.set_quadratic_coefficient(1, 1, 1)
+    assert constraint.get_quadratic_coefficients() == {(1, 1): 1}
+
+
+def test_linear_constraint_quadratic_terms() -> None:
+    # linear constraints share one set of empty, read-only arrays
+    first = ilpy.Constraint.from_coefficients({0: 1})
+    second = ilpy.Constraint()
+    rows, cols, values = first.get_quadratic_terms()
+    assert len(rows) == len(cols) == len(values) == 0
+    assert not values.flags.writeable
+    assert second.get_quadratic_terms()[2] is values
+    assert first.get_quadratic_coefficients() == {}
+
+    second.set_quadratic_coefficient(0, 1, 2)
+    assert second.get_quadratic_coefficients() == {(0, 1): 2}
+    assert not len(first.get_quadratic_terms()[0])
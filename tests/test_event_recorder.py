@@ -0,0 +1,37 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+import ilpy
+
+
+def test_ring_buffer_wraps() -> None:
+    recorder = ilpy.EventRecorder(capacity=3)
+    for i in range(5):
+        recorder.record("MIP", time=float(i), primalbound=10.0, dualbound=float(i))
+    recorder.record("MIPSOL", time=2.5, primalbound=10.0, dualbound=2.0, solcount=1)
+
+    assert len(recorder) == 4
+    assert recorder.dropped() == 2
+    assert recorder.dropped("MIPSOL") == 0
+
+    mip = recorder.table("MIP")
+    npt.assert_array_equal(mip["time"], [2.0, 3.0, 4.0])
+    npt.assert_allclose(mip["gap"], [0.8, 0.7, 0.6])
+    assert np.isnan(mip["nodecount"]).all()
+
+    merged = recorder.table()
+    npt.assert_array_equal(merged["time"], [2.0, 2.5, 3.0, 4.0])
+    assert list(merged["event_type"]) == ["MIP", "MIPSOL", "MIP", "MIP"]
+
+    assert len(recorder.table("MIPNODE")["time"]) == 0
+    recorder.clear()
+    assert len(recorder) == 0
+
+
+def test_event_filter() -> None:
+    recorder = ilpy.EventRecorder(events={"MIPSOL"})
+    assert recorder.records("MIPSOL")
+    assert not recorder.records("MIP")
+    with pytest.raises(ValueError):
+        ilpy.EventRecorder(capacity=0)
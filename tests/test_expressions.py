@@ -1,18 +1,26 @@
+import ast
 import operator
 import sys
 
+import numpy as np
 import pytest
 
 from ilpy import (
     Constraint,
     Constraints,
+    ConstraintTemplate,
+    LinearExpression,
     Objective,
+    Parameter,
+    QuadraticExpression,
     Relation,
     Sense,
     Solver,
     VariableType,
+    dot,
+    quicksum,
 )
-from ilpy.expressions import Expression, Variable, _get_coefficients
+from ilpy.expressions import BinOp, Expression, Variable, _get_coefficients
 
 u = Variable("u")
 v = Variable("v")
@@ -263,3 +271,145 @@ def test_deeply_nested_parentheses() -> None:
     coeffs = constraint.get_coefficients()
     assert len(coeffs) == num_vars
     assert all(coeffs[i] == 1.0 for i in range(num_vars))
+
+
+def test_linear_expression() -> None:
+    """Test in-place accumulation into a flat LinearExpression."""
+    x = [Variable(f"x{i}", index=i) for i in range(4)]
+    expr = LinearExpression()
+    for i, coef in enumerate([2, 0, -3]):
+        expr += coef * x[i]
+    expr += x[0]
+    expr -= x[3] / 2
+    expr += 4
+    assert str(expr) == "3.0 * x0 - 3.0 * x2 - 0.5 * x3 + 4.0"
+    assert dict(expr.get_coefficients()) == {0: 3, 1: 0, 2: -3, 3: -0.5}
+
+    # conversion skips zero coefficients and moves the constant to the RHS
+    constraint = expr.as_constraint()
+    assert constraint.get_coefficients() == {0: 3, 2: -3, 3: -0.5}
+    assert constraint.get_value() == -4
+    objective = (2 * expr).as_objective(Sense.Maximize)
+    assert objective.get_coefficients() == [6, 0, -6, -1]
+    assert objective.get_constant() == 8
+
+    # interoperates with variables, AST expressions and comparisons
+    assert isinstance(x[1] + expr, LinearExpression)
+    assert isinstance(expr - 2 * (x[1] - 1), LinearExpression)
+    constraint = (x[1] + expr >= x[3] + 1).as_constraint()
+    assert constraint.get_relation() == Relation.GreaterEqual
+    assert constraint.get_coefficients() == {0: 3, 1: 1, 2: -3, 3: -1.5}
+    assert constraint.get_value() == -3
+
+
+def test_quadratic_expression() -> None:
+    x = [Variable(f"x{i}", index=i) for i in range(3)]
+    expr = LinearExpression([(x[0], 1.0)], constant=2)
+    expr += 3 * x[2] * x[1]
+    assert isinstance(expr, QuadraticExpression)
+    assert dict(expr.get_quadratic_coefficients()) == {(1, 2): 3}
+
+    product = LinearExpression({x[0]: 1, x[1]: -1}, constant=1) * x[2]
+    assert isinstance(product, QuadraticExpression)
+    objective = product.as_objective()
+    assert objective.get_quadratic_coefficients() == {(0, 2): 1, (1, 2): -1}
+    assert objective.get_coefficients() == [0, 0, 1]
+
+    with pytest.raises(TypeError, match="Cannot multiply by more than two"):
+        expr * x[0]
+    with pytest.raises(TypeError, match="Cannot add a comparison"):
+        expr += x[0] <= 1
+
+
+def test_quicksum_and_dot() -> None:
+    x = [Variable(f"x{i}", index=i) for i in range(4)]
+    expr = quicksum(2 * v for v in x[:3])
+    assert isinstance(expr, LinearExpression)
+    assert dict(expr.get_coefficients()) == {0: 2, 1: 2, 2: 2}
+    q = quicksum([x[0], 1, x[0] - x[1], x[1] * x[2]])
+    assert isinstance(q, QuadraticExpression)
+    assert dict(q.get_coefficients()) == {0: 2, 1: -1}
+    assert dict(q.get_quadratic_coefficients()) == {(1, 2): 1}
+    assert q.get_constant() == 1
+
+    expr = dot(np.array([1.0, 0.0, -2.5, 3.0]), x)
+    constraint = (expr >= 1).as_constraint()
+    assert constraint.get_coefficients() == {0: 1, 2: -2.5, 3: 3}
+    assert constraint.get_relation() == Relation.GreaterEqual
+    assert dot([1, 2], x[:2]).as_objective().get_coefficients() == [1, 2]
+
+    # NumPy scalars are numbers too
+    expr = quicksum([x[0], np.int64(2)])
+    assert expr.get_constant() == 2
+    expr = quicksum([x[0]]) * np.int64(3) + np.float32(0.5)
+    assert dict(expr.get_coefficients()) == {0: 3}
+    assert expr.get_constant() == 0.5
+    expr = quicksum([x[0]]) * np.float32(0.5)
+    assert dict(expr.get_coefficients()) == {0: 0.5}
+    assert type(expr.get_coefficients()[0]) is float
+
+    with pytest.raises(ValueError, match="different lengths"):
+        dot([1, 2, 3], x[:2])
+    with pytest.raises(ValueError, match="different lengths"):
+        dot([1, 2], x[:3])
+
+
+def test_shared_subexpression() -> None:
+    x = [Variable(f"x{i}", index=i) for i in range(4)]
+    shared = 2 * x[0] + x[1] - 1
+
+    for k in range(3):
+        constraint = (shared + k * x[2] <= k).as_constraint()
+        assert constraint.get_coefficients() == (
+            {0: 2, 1: 1, 2: k} if k else {0: 2, 1: 1}
+        )
+        assert constraint.get_value() == k + 1
+    assert (x[3] - 3 * shared >= 0).as_constraint().get_coefficients() == {
+        3: 1,
+        0: -6,
+        1: -3,
+    }
+    objective = (x[3] * shared).as_objective()
+    assert objective.get_coefficients()[3] == -1
+    assert objective.get_quadratic_coefficients() == {(0, 3): 2, (1, 3): 1}
+
+    # trees containing a (mutable) LinearExpression are never memoized
+    flat = LinearExpression([(x[0], 1)])
+    partial = BinOp(flat, ast.Add(), x[1])  # (operators would copy `flat`)
+    assert (partial <= 1).as_constraint().get_coefficients() == {0: 1, 1: 1}
+    flat += x[2]
+    assert (partial >= 1).as_constraint().get_coefficients() == {0: 1, 1: 1, 2: 1}
+
+
+def test_constraint_template() -> None:
+    i, j, w, cap = Variable("i"), Variable("j"), Parameter("w"), Parameter("cap")
+    fixed = Variable("z", index=9)
+    template = ConstraintTemplate(i + w * j - 2 * fixed + 1 <= cap)
+    assert set(template.slots) == {"i", "j"}
+    assert set(template.parameters) == {"w", "cap"}
+
+    block = template.instantiate(i=[0, 1, 2], j=[3, 4, 2], w=[1, 2, 3], cap=5)
+    assert len(block) == 3
+    assert [row.get_coefficients() for row in block] == [
+        {0: 1, 3: 1, 9: -2},
+        {1: 1, 4: 2, 9: -2},
+        {2: 4, 9: -2},  # i == j: coefficients are summed
+    ]
+    assert all(row.get_relation() == Relation.LessEqual for row in block)
+    np.testing.assert_array_equal(block.values, [4, 4, 4])
+
+    # rebinding the same template
+    block = template.instantiate(i=[[5], [6]], j=7, w=0, cap=[[1], [2]])
+    assert [row.get_coefficients() for row in block] == [{5: 1, 9: -2}, {6: 1, 9: -2}]
+    np.testing.assert_array_equal(block.values, [0, 1])
+
+    with pytest.raises(TypeError, match="Missing bindings"):
+        template.instantiate(i=[0], j=[1], w=1)
+    with pytest.raises(TypeError, match="variable indices"):
+        template.instantiate(i=[0.5], j=[1], w=1, cap=1)
+    with pytest.raises(ValueError, match="linear"):
+        ConstraintTemplate(i * j <= 1)
+    with pytest.raises(ValueError, match="comparison"):
+        ConstraintTemplate(i + j)
+    with pytest.raises(ValueError, match="template"):
+        (i + cap <= 1).as_constraint()
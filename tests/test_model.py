@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+import ilpy
+
+
+def test_model_registry() -> None:
+    model = ilpy.Model()
+    a = model.add_variable("a")
+    x = model.add_variables((2, 3), name="x", vtype=ilpy.Binary)
+    b = model.add_variable(vtype=ilpy.Integer, lb=0, ub=[10])
+    y = model.add_variables(2, name="y", lb=[0, 1], ub=5)
+
+    assert len(model) == model.num_variables == 10
+    assert a.index == 0
+    npt.assert_array_equal(x.indices, [[1, 2, 3], [4, 5, 6]])
+    assert b.index == 7
+    npt.assert_array_equal(y.indices, [8, 9])
+
+    assert model.variable_types.tolist() == [
+        ilpy.Continuous,
+        *[ilpy.Binary] * 6,
+        ilpy.Integer,
+        ilpy.Continuous,
+        ilpy.Continuous,
+    ]
+    npt.assert_array_equal(model.lower_bounds, [-np.inf] + [0] * 7 + [0, 1])
+    npt.assert_array_equal(model.upper_bounds, [np.inf] + [1] * 6 + [10, 5, 5])
+    with pytest.raises(ValueError):
+        model.variable_types[0] = ilpy.Binary
+
+    assert model.name_of(0) == "a"
+    assert model.name_of(7) == "x7"
+    assert model.name_of(5) == "x5"
+    assert model.index_of("a") == 0
+    assert model.index_of("y9") == 9
+    assert model.variable("x3").index == 3
+    assert model.variable(9).id == "y9"
+    with pytest.raises(KeyError):
+        model.index_of("y3")
+    with pytest.raises(IndexError):
+        model.name_of(10)
+    with pytest.raises(ValueError, match="already exists"):
+        model.add_variable("a")
+    with pytest.raises(ValueError, match="bounds"):
+        model.add_variable(lb=1, ub=0)
+
+
+def test_model_unique_names() -> None:
+    model = ilpy.Model()
+    first = model.add_variable()
+    assert model.name_of(0) == first.id == "x0"
+    assert model.index_of("x0") == 0
+    assert model.variable("x0").index == 0
+
+    # a name generated for a block is taken
+    model.add_variables(2, name="y")
+    with pytest.raises(ValueError, match="'y1' already exists"):
+        model.add_variable("y1")
+    model.add_variable("y01")
+    assert model.index_of("y01") == 3
+    assert model.index_of("y1") == 1
+
+    # ... and a block must not generate a name that is taken
+    model.add_variable("z5")
+    with pytest.raises(ValueError, match="'z5' already exists"):
+        model.add_variables(2, name="z")
+    with pytest.raises(ValueError, match="'z5' already exists"):
+        model.add_variables(200, name="z")
+    assert len(model) == 5
+
+    # unnamed variables are named after their index, which may be taken
+    model.add_variable("x6")
+    with pytest.raises(ValueError, match="'x6' already exists"):
+        model.add_variable()
+
+
+def test_model_growth() -> None:
+    model = ilpy.Model(ilpy.Integer)
+    for i in range(100):
+        assert model.add_variable(lb=i).index == i
+    npt.assert_array_equal(model.lower_bounds, np.arange(100))
+    assert (model.variable_types == ilpy.Integer).all()
@@ -1,3 +1,5 @@
+import numpy as np
+
 import ilpy
 
 
@@ -14,3 +16,28 @@ def test_resize() -> None:
     obj2 = ilpy.Objective()
     obj2.set_quadratic_coefficient(0, 0, 1)  # quadratic term (x^2)
     assert len(obj2) == 1
+
+
+def test_quadratic_terms() -> None:
+    obj = ilpy.Objective()
+    # duplicates and mirrored pairs are summed, zeros dropped
+    obj.set_quadratic_terms([2, 0, 1, 0, 1], [0, 2, 1, 1, 1], [1, 2, 3, 0, -1])
+    assert len(obj) == 3
+    rows, cols, values = obj.get_quadratic_terms()
+    assert rows.tolist() == [0, 1]
+    assert cols.tolist() == [2, 1]
+    assert values.tolist() == [3, 2]
+    assert obj.get_quadratic_coefficients() == {(0, 2): 3, (1, 1): 2}
+
+    # single updates replace the coefficient of the ordered pair, and are
+    # summed with that of the mirrored pair
+    obj.set_quadratic_coefficient(2, 0, 5)
+    obj.set_quadratic_coefficient(1, 1, 0)
+    obj.set_quadratic_coefficient(0, 0, 1)
+    assert obj.get_quadratic_coefficients() == {(0, 0): 1, (0, 2): 7}
+    assert obj.get_quadratic_terms()[2].tolist() == [1, 7]
+    obj.set_quadratic_coefficient(0, 2, 0)
+    assert obj.get_quadratic_coefficients() == {(0, 0): 1, (0, 2): 5}
+
+    obj.set_quadratic_matrix(np.array([[1.0, 2.0], [0.0, 4.0]]))
+    assert obj.get_quadratic_coefficients() == {(0, 0): 1, (0, 1): 2, (1, 1): 4}
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.testing as npt
+
+import ilpy
+from ilpy._presolve import PresolveResult, presolve
+
+LE, GE, EQ = ilpy.LessEqual, ilpy.GreaterEqual, ilpy.Equal
+
+
+def _presolve(
+    block: ilpy.ConstraintBlock,
+    num_variables: int,
+    vtype: ilpy.VariableType = ilpy.Continuous,
+) -> PresolveResult:
+    types = np.full(num_variables, vtype, dtype=np.int8)
+    lower, upper = np.full(num_variables, -np.inf), np.full(num_variables, np.inf)
+    return presolve(block, types, lower, upper)
+
+
+def test_duplicate_rows() -> None:
+    block = ilpy.ConstraintBlock.from_matrix(
+        [[1, 2], [1, 2], [1, 3], [1, 2], [1, 2], [1, 2], [2, 1]],
+        [LE, LE, LE, GE, GE, EQ, LE],
+        [5, 3, 1, -1, 2, 4, 3],
+    )
+    result = _presolve(block, 2)
+    assert not result.infeasible
+    assert result.stats.duplicate_rows == 2
+    # the tightest row of each group is kept, in the original order
+    npt.assert_array_equal(result.block.values, [3, 1, 2, 4, 3])
+    npt.assert_array_equal(result.block.relations, [LE, LE, GE, EQ, LE])
+
+
+def test_singleton_rows_and_fixed_variables() -> None:
+    # 2 x0 == 3 fixes x0; then x0 + x1 <= 4 is a bound, and x0 - x2 >= 0 too
+    block = ilpy.ConstraintBlock.from_matrix(
+        [[2, 0, 0], [1, 1, 0], [1, 0, -1], [-1, 0, 0], [0, 0, 0]],
+        [EQ, LE, GE, GE, LE],
+        [3, 4, 0, -9, 1],
+    )
+    result = _presolve(block, 3)
+    assert not result.infeasible
+    assert len(result.block) == 0
+    npt.assert_allclose(result.lower, [1.5, -np.inf, -np.inf])
+    npt.assert_allclose(result.upper, [1.5, 2.5, 1.5])
+    npt.assert_array_equal(result.substituted, [True, False, False])
+    stats = result.stats
+    assert (stats.singleton_rows, stats.empty_rows, stats.fixed_variables) == (4, 1, 1)
+
+    # integer bounds are rounded, which here leaves no feasible value for x0
+    assert _presolve(block, 3, ilpy.Integer).infeasible
+
+
+def test_infeasible_empty_row() -> None:
+    block = ilpy.ConstraintBlock([0, 0, 1], [0], [1.0], [GE, LE], [1, 0])
+    assert _presolve(block, 1).infeasible
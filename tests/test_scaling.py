@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+import ilpy
+from ilpy._scaling import scale_model, scaling_factors
+
+LE, GE, EQ = ilpy.LessEqual, ilpy.GreaterEqual, ilpy.Equal
+
+
+def test_analyze_numerics() -> None:
+    block = ilpy.ConstraintBlock.from_matrix(
+        [[1e4, -2e4, 0], [1e-3, 0, 0], [0, 0, 0]], [LE, GE, EQ], [3e4, 0, -5]
+    )
+    objective = ilpy.Objective.from_coefficients([0, 2, -0.5])
+    report = ilpy.analyze_numerics(
+        block, 4, objective, lower=[0, -1, -np.inf, 3], upper=[np.inf, 10, 1, 3]
+    )
+    npt.assert_array_equal(report.row_min, [1e4, 1e-3, np.nan])
+    npt.assert_array_equal(report.row_max, [2e4, 1e-3, np.nan])
+    npt.assert_array_equal(report.column_min, [1e-3, 2e4, np.nan, np.nan])
+    npt.assert_array_equal(report.column_max, [1e4, 2e4, np.nan, np.nan])
+    assert report.matrix_range == (1e-3, 2e4)
+    assert report.matrix_ratio == pytest.approx(2e7)
+    assert report.rhs_range == (5, 3e4)
+    assert report.objective_range == (0.5, 2)
+    assert report.bounds_range == (1, 10)
+    assert "matrix     [1e-03, 2e+04]" in str(report)
+
+    constraints = ilpy.Constraints()
+    constraints.add(block)
+    report = ilpy.analyze_numerics(constraints)
+    assert len(report.column_min) == 2
+    assert np.isnan(report.objective_range).all()
+
+
+def test_scaling_factors() -> None:
+    block = ilpy.ConstraintBlock.from_matrix(
+        [[1e3, 1e-3, 1], [2e3, 0, 4]], [LE, LE], [1, 1]
+    )
+    types = np.array([ilpy.Continuous, ilpy.Continuous, ilpy.Integer])
+    for method in ("geometric", "equilibration"):
+        rows, cols = scaling_factors(block, types, method)  # type: ignore
+        # factors are powers of two, and integer columns are left alone
+        for factors in (rows, cols):
+            npt.assert_array_equal(np.exp2(np.round(np.log2(factors))), factors)
+        assert cols[2] == 1
+        scaled = block.data * rows[[0, 0, 0, 1, 1]] * cols[block.indices]
+        assert np.abs(scaled).max() / np.abs(scaled).min() < 1e6 / 2
+
+    with pytest.raises(ValueError, match="Unknown scaling method"):
+        scaling_factors(block, types, "none")  # type: ignore
+
+
+def test_scale_model_quadratic() -> None:
+    # x0 = 1000 * y0 in the scaled model, so quadratic terms scale twice
+    constraint = ilpy.Constraint.from_coefficients(
+        {0: 1e-3, 1: 1}, {(0, 0): 1e-6, (0, 1): 1e-3}, LE, 1
+    )
+    objective = ilpy.Objective.from_coefficients([1e-3, 1], {(0, 0): 1e-6})
+    linear = ilpy.ConstraintBlock.from_matrix([[1e-3, 1], [2e-3, -1]], [GE, LE], [1, 2])
+    types = np.full(2, ilpy.Continuous)
+    lower, upper = np.array([0.0, -np.inf]), np.array([4e3, 1.0])
+    scaled_obj, scaled, s_lower, s_upper, cols = scale_model(
+        objective, [linear, constraint], types, lower, upper
+    )
+    assert cols[0] > 1
+    npt.assert_allclose(s_lower * cols, lower)
+    npt.assert_allclose(s_upper * cols, upper)
+    x = np.array([2e3, 0.5])
+    y = x / cols
+    quad = scaled[1]
+    assert isinstance(quad, ilpy.Constraint)
+    rows, qcols, values = quad.get_quadratic_terms()
+    lhs = sum(v * y[i] for i, v in quad.get_coefficients().items())
+    lhs += (values * y[rows] * y[qcols]).sum()
+    assert lhs == pytest.approx(2 + 0.5 + 4 + 1)
+    rows, qcols, values = scaled_obj.get_quadratic_terms()
+    value = np.dot(scaled_obj.get_coefficients(), y)
+    value += (values * y[rows] * y[qcols]).sum()
+    assert value == pytest.approx(2 + 0.5 + 4)
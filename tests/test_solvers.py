@@ -5,6 +5,7 @@ import os
 from typing import TYPE_CHECKING, NamedTuple
 from unittest.mock import Mock
 
+import numpy as np
 import numpy.testing as npt
 import pytest
 
@@ -213,6 +214,67 @@ def test_non_convex_quadratic(preference: ilpy.Preference) -> None:
     assert solver.solve() is not None
 
 
+@pytest.mark.parametrize("preference", PREFS)
+def test_solution_timings(preference: ilpy.Preference) -> None:
+    solver = ilpy.Solver(2, ilpy.VariableType.Integer, preference=preference)
+    solver.set_objective((X[0] + X[1]).as_objective(ilpy.Maximize))
+    solver.add_constraint(X[0] + 2 * X[1] <= 10)
+    solver.add_constraint(3 * X[0] + X[1] <= 12)
+    solution = solver.solve()
+
+    timings = solution.timings
+    assert timings.backend_creation > 0
+    assert timings.variable_creation > 0
+    assert timings.objective_transfer > 0
+    assert timings.constraint_transfer > 0
+    assert timings.solution_extraction > 0
+    assert timings.presolve >= 0 and timings.search >= 0
+    assert timings.presolve + timings.search == pytest.approx(solution.time)
+    assert timings.total >= solution.time
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_event_recorder(preference: ilpy.Preference) -> None:
+    kwargs = CASES[0]._asdict()
+    kwargs.pop("expectation")
+    solver = ilpy.Solver(10, ilpy.VariableType.Binary, preference=preference)
+    solver.set_objective(ilpy.Objective.from_coefficients(kwargs["objective"]))
+    solver.add_constraint(X[0] + X[1] + X[2] >= 1)
+    recorder = ilpy.EventRecorder(capacity=16)
+    solver.set_event_recorder(recorder)
+    solution = solver.solve()
+
+    table = recorder.table()
+    assert len(table["time"]) == len(recorder) > 0
+    assert (np.diff(table["time"]) >= 0).all()
+    # if the solver reported a primal bound (i.e. the model wasn't solved
+    # entirely in presolve), the last one is the optimal objective
+    primal = table["primalbound"][np.isfinite(table["primalbound"])]
+    if len(primal):
+        assert primal[-1] == pytest.approx(solution.get_value())
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_event_subscription(preference: ilpy.Preference) -> None:
+    solver = ilpy.Solver(10, ilpy.VariableType.Binary, preference=preference)
+    solver.set_objective(ilpy.Objective.from_coefficients(CASES[0].objective))
+    solver.add_constraint(X[0] + X[1] + X[2] >= 1)
+
+    mock = Mock()
+    solver.set_event_callback(
+        mock, events={"PRESOLVE", "PRESOLVEROUND"}, min_interval=60
+    )
+    solver.solve()
+    # only the subscribed event type, and at most once per minute
+    assert mock.call_count == 1
+    assert mock.call_args.args[0]["event_type"] in {"PRESOLVE", "PRESOLVEROUND"}
+
+    mock.reset_mock()
+    solver.set_event_callback(mock, events=())
+    solver.solve()
+    mock.assert_not_called()
+
+
 def test_solution_indexing() -> None:
     """Test that we can use a Variable instance to index into a solution."""
     solver = ilpy.Solver(5, ilpy.VariableType.Continuous)
@@ -251,3 +313,559 @@ def test_solve_twice(preference: ilpy.Preference) -> None:
     solver.set_constraints(c1)
     solution = solver.solve()
     assert list(solution) != [7, 3]
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_constraint_block(preference: ilpy.Preference) -> None:
+    x = ilpy.VariableArray(3)
+    A = np.array([[1, 1, 0], [0, 1, 1], [1, 0, 1]])
+
+    solver = ilpy.Solver(3, ilpy.Continuous, preference=preference)
+    solver.set_objective(x.sum().as_objective(ilpy.Minimize))
+    solver.add_constraint(A @ x >= [2, 3, 4])
+    solution = solver.solve()
+    npt.assert_allclose(list(solution), [1.5, 0.5, 2.5], atol=1e-6)
+
+    # a block inside Constraints is transferred as a whole too
+    constraints = ilpy.Constraints()
+    constraints.add(x <= 2)
+    solver.set_constraints(constraints)
+    solution = solver.solve()
+    assert max(solution) <= 2 + 1e-6
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_solver_from_model(preference: ilpy.Preference) -> None:
+    model = ilpy.Model()
+    x = model.add_variables(3, lb=[0, 1, -1], ub=[2, 1.5, 5])
+    budget = model.add_variable("budget", lb=0, ub=4)
+
+    solver = ilpy.Solver.from_model(model, preference=preference)
+    solver.set_objective((x[0] + 2 * x[1] + 3 * x[2] - budget).as_objective())
+    solution = solver.solve()
+    npt.assert_allclose(list(solution), [0, 1, -1, 4])
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_add_variables(preference: ilpy.Preference) -> None:
+    solver = ilpy.Solver(2, ilpy.Continuous, preference=preference)
+    x = [Variable(f"x{i}", index=i) for i in range(2)]
+    solver.set_objective((-x[0] - x[1]).as_objective())
+    solver.add_constraint(x[0] + x[1] <= 4)
+    solver.add_constraint(x[0] >= 0)
+    solver.add_constraint(x[1] >= 0)
+    assert sum(solver.solve()) == pytest.approx(4)
+
+    # new columns: one enters the first constraint, one is only bounded
+    new = solver.add_variables(2, lb=0, ub=[1, 10], obj=[-5, -1], columns=[{0: 1}, {}])
+    assert new == range(2, 4)
+    assert solver.num_variables == 4
+    solution = solver.solve()
+    npt.assert_allclose(list(solution), [3, 0, 1, 10], atol=1e-6)
+    assert solution.get_value() == pytest.approx(-18)
+
+    with pytest.raises(ValueError, match="one mapping per"):
+        solver.add_variables(1, columns=[])
+    with pytest.raises(IndexError):
+        solver.add_variables(1, columns=[{5: 1}])
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_add_variables_after_set_constraints(preference: ilpy.Preference) -> None:
+    solver = ilpy.Solver(
+        2, ilpy.Continuous, preference=preference, lower_bounds=0, upper_bounds=10
+    )
+    x = [Variable(f"x{i}", index=i) for i in range(2)]
+    solver.set_objective((x[0] + x[1]).as_objective(ilpy.Maximize))
+    for bound in (1, 4):
+        constraints = ilpy.Constraints()
+        constraints.add(x[0] + x[1] <= bound)
+        solver.set_constraints(constraints)
+    assert solver.solve().get_value() == pytest.approx(4)
+
+    # columns refer to the rows of the current constraint set only
+    solver.add_variables(1, lb=0, ub=10, obj=[2], columns=[{0: 1}])
+    assert solver.solve().get_value() == pytest.approx(8)
+    with pytest.raises(IndexError):
+        solver.add_variables(1, columns=[{1: 1}])
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_variable_types_and_bounds(preference: ilpy.Preference) -> None:
+    x = [Variable(f"x{i}", index=i) for i in range(3)]
+    objective = (-x[0] - x[1] - x[2]).as_objective()
+
+    solver = ilpy.Solver(
+        3,
+        ilpy.Continuous,
+        [ilpy.Integer, ilpy.Binary, ilpy.Continuous],
+        preference=preference,
+        lower_bounds=0,
+        upper_bounds=[2.5, 1, 3.5],
+    )
+    solver.set_objective(objective)
+    npt.assert_allclose(list(solver.solve()), [2, 1, 3.5], atol=1e-6)
+
+    solver.set_variable_bounds(upper=[1.5, 2.5], indices=[2, 0])
+    npt.assert_allclose(list(solver.solve()), [2, 1, 1.5], atol=1e-6)
+    solver.set_variable_types(ilpy.Integer, indices=[2])
+    solver.set_variable_types(ilpy.Binary, indices=[0])
+    npt.assert_allclose(list(solver.solve()), [1, 1, 1], atol=1e-6)
+
+    # per-variable overrides are honored by every backend
+    solver = ilpy.Solver(2, ilpy.Continuous, {0: ilpy.Integer}, preference=preference)
+    solver.set_objective((-x[0] - x[1]).as_objective())
+    solver.set_variable_bounds(lower=0, upper=1.5)
+    npt.assert_allclose(list(solver.solve()), [1, 1.5], atol=1e-6)
+
+    with pytest.raises(ValueError, match="must not exceed"):
+        solver.set_variable_bounds(lower=2, upper=1)
+    with pytest.raises(IndexError):
+        solver.set_variable_bounds(lower=0, indices=[2])
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_solve_matrix_form(preference: ilpy.Preference) -> None:
+    sparse = pytest.importorskip("scipy.sparse")
+    c = np.array([-1.0, -2.0])
+    kwargs = {
+        "A_ub": sparse.csr_matrix([[1.0, 1.0]]),
+        "b_ub": [3.5],
+        "A_eq": np.array([[1.0, -1.0]]),
+        "b_eq": 0,
+        "bounds": (0, None),
+        "preference": preference,
+    }
+    solution = ilpy.solve(c, **kwargs)
+    npt.assert_allclose(list(solution), [1.75, 1.75], atol=1e-6)
+    solution = ilpy.solve(c, integrality=[1, 1], **kwargs)
+    npt.assert_allclose(list(solution), [1, 1], atol=1e-6)
+    assert solution.get_value() == pytest.approx(-3)
+
+    # per-variable bounds, mixed with regular constraints
+    solution = ilpy.solve(
+        c,
+        [([1, 0], ">=", 0.5)],
+        A_ub=[[1, 1]],
+        b_ub=[3],
+        bounds=[(None, None), (0, 1)],
+        preference=preference,
+    )
+    npt.assert_allclose(list(solution), [2, 1], atol=1e-6)
+
+    with pytest.raises(ValueError, match="one value per row"):
+        ilpy.solve(c, A_ub=[[1, 1]], b_ub=[1, 2], preference=preference)
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_solve_decomposed(
+    preference: ilpy.Preference, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from concurrent.futures import ProcessPoolExecutor
+
+    # solve every component on its own
+    monkeypatch.setattr("ilpy._decomposition.MIN_GROUP_SIZE", 1)
+
+    # four independent chains of three variables, and two free variables
+    rng = np.random.default_rng(0)
+    costs = rng.uniform(-2, -1, 14)
+    chains = [[(1, 1, 0), "<=", 1], [(0, 1, 1), "<=", 1]]
+    constraints = [
+        ([0] * (3 * k) + list(coeffs), relation, value)
+        for k in range(4)
+        for coeffs, relation, value in chains
+    ]
+    kwargs = {
+        "integrality": 1,
+        "bounds": [(0, 1)] * 12 + [(0, 2), (0, 3)],
+        "preference": preference,
+    }
+    expected = ilpy.solve(costs, constraints, **kwargs)
+    solution = ilpy.solve(costs, constraints, decompose=True, **kwargs)
+    assert solution.status == ilpy.SolverStatus.OPTIMAL
+    npt.assert_allclose(list(solution), list(expected), atol=1e-6)
+    assert solution.get_value() == pytest.approx(expected.get_value())
+    assert len(solution.native_status) == 5
+
+    with ProcessPoolExecutor(2) as executor:
+        solution = ilpy.solve(
+            costs, constraints, decompose=True, executor=executor, **kwargs
+        )
+    npt.assert_allclose(list(solution), list(expected), atol=1e-6)
+
+    # one infeasible component makes the whole problem infeasible
+    infeasible = [*constraints, ([0] * 12 + [1], ">=", 3)]
+    solution = ilpy.solve(costs, infeasible, decompose=True, **kwargs)
+    assert solution.status == ilpy.SolverStatus.INFEASIBLE
+
+    with pytest.raises(ValueError, match="on_event"):
+        ilpy.solve(costs, decompose=True, on_event=print, **kwargs)
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_indicator_constraints(preference: ilpy.Preference) -> None:
+    # x0..x2 continuous in [0, 10], b3..b5 binary
+    solver = ilpy.Solver(
+        6,
+        ilpy.Continuous,
+        {3: ilpy.Binary, 4: ilpy.Binary, 5: ilpy.Binary},
+        preference=preference,
+        lower_bounds=0,
+        upper_bounds=[10, 10, 10, 1, 1, 1],
+    )
+    # b3 == 0 -> x0 <= 2: turning b3 on costs 5, but frees x0 to reach 10
+    solver.add_indicator_constraint(3, False, X[0] <= 2)
+    # b4 == 1 -> x1 == 4: b4 earns 7, but pins x1 to 4
+    solver.add_indicator_constraint(X[4], True, X[1] == 4)
+    # b5 == 1 -> x2 >= 3 and x0 + x2 <= 12, with b5 forced on
+    block = ilpy.ConstraintBlock.from_matrix(
+        [[0, 0, 1], [1, 0, 1]], [ilpy.GreaterEqual, ilpy.LessEqual], [3, 12]
+    )
+    solver.add_indicator_constraints([5, 5], True, block)
+    solver.add_constraint(X[5] >= 1)
+    solver.set_objective(
+        (X[0] - 5 * X[3] + X[1] + 7 * X[4] - 0.5 * X[2]).as_objective(ilpy.Maximize)
+    )
+    solution = solver.solve()
+    assert solution.status == ilpy.SolverStatus.OPTIMAL
+    npt.assert_allclose(list(solution), [9, 4, 3, 1, 1, 1], atol=1e-6)
+    assert solver.stats().indicator_constraints == 4
+    assert solver.stats().rows == 1
+
+    with pytest.raises(ValueError, match="must be binary"):
+        solver.add_indicator_constraint(0, True, X[1] <= 1)
+    with pytest.raises(ValueError, match="must be linear"):
+        solver.add_indicator_constraint(3, True, X[1] * X[1] <= 1)
+    with pytest.raises(ValueError, match="one binary variable per constraint"):
+        solver.add_indicator_constraints([3], True, block)
+    with pytest.raises(ValueError, match="Active values"):
+        solver.add_indicator_constraints([3, 4], 2, block)
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_sos_constraints(preference: ilpy.Preference) -> None:
+    # SOS1: at most one of x0..x2 is nonzero
+    solver = ilpy.Solver(
+        3, ilpy.Continuous, preference=preference, lower_bounds=0, upper_bounds=1
+    )
+    solver.set_objective((X[0] + 2 * X[1] + 3 * X[2]).as_objective(ilpy.Maximize))
+    solver.add_sos(1, [0, 1, 2])
+    npt.assert_allclose(list(solver.solve()), [0, 0, 1], atol=1e-6)
+
+    # SOS2: a piecewise-linear function through (0, 0), (1, 3), (2, 1), (3, 4),
+    # maximized for x <= 2.5; without SOS2, mixing (1, 3) and (3, 4) gives 3.75
+    points, values = [0, 1, 2, 3], [0, 3, 1, 4]
+    solver = ilpy.Solver(
+        4, ilpy.Continuous, preference=preference, lower_bounds=0, upper_bounds=1
+    )
+    solver.set_objective(ilpy.Objective.from_coefficients(values, sense=ilpy.Maximize))
+    solver.add_constraint(ilpy.ConstraintBlock.from_matrix([[1] * 4], ilpy.Equal, 1))
+    solver.add_constraint(ilpy.ConstraintBlock.from_matrix([points], values=2.5))
+    solver.add_sos_constraints(2, [0, 4], [0, 1, 2, 3], weights=points)
+    solution = solver.solve()
+    assert solution.get_value() == pytest.approx(3)
+    npt.assert_allclose(list(solution), [0, 1, 0, 0], atol=1e-6)
+    assert solver.stats().sos_constraints == 1
+
+    with pytest.raises(ValueError, match="SOS type"):
+        solver.add_sos(3, [0, 1])  # type: ignore
+    with pytest.raises(ValueError, match="indptr"):
+        solver.add_sos_constraints(1, [0, 1], [0, 1])
+    with pytest.raises(ValueError, match="distinct"):
+        solver.add_sos_constraints(1, [0, 2, 4], [0, 1, 2, 3], [1, 2, 3, 3])
+    with pytest.raises(ValueError, match="one weight per index"):
+        solver.add_sos(2, [0, 1], [1])
+    with pytest.raises(IndexError):
+        solver.add_sos(1, [0, 4])
+
+
+@pytest.mark.parametrize("preference", PREFS)
+@pytest.mark.parametrize("presolve", [False, True])
+def test_solver_stats(preference: ilpy.Preference, presolve: bool) -> None:
+    solver = ilpy.Solver(
+        4,
+        ilpy.Continuous,
+        {3: ilpy.Binary},
+        preference=preference,
+        lower_bounds=0,
+        upper_bounds=[10, 1e3, np.inf, 1],
+        presolve=presolve,
+    )
+    stats = solver.stats()
+    assert (stats.rows, stats.columns, stats.nnz) == (0, 4, 0)
+    assert stats.variable_types == {
+        ilpy.Continuous: 3,
+        ilpy.Integer: 0,
+        ilpy.Binary: 1,
+    }
+    assert stats.bounds_range == (1, 1e3)
+
+    solver.set_objective(2 * X[0] - 0.5 * X[2] + X[1] * X[1])
+    solver.add_constraint(X[0] + X[1] <= 5)
+    solver.add_constraint(X[2] >= 1e-2)
+    solver.add_constraint(ilpy.ConstraintBlock.from_matrix([[1, 1, 1, 1]], values=8))
+    solver.set_variable_types(ilpy.Integer, [1])
+    stats = solver.stats()
+    assert (stats.rows, stats.nnz) == (3, 7)
+    assert stats.relations[ilpy.LessEqual] == 2
+    assert stats.variable_types[ilpy.Integer] == 1
+    assert (stats.objective_nnz, stats.objective_quadratic_terms) == (2, 1)
+    assert stats.objective_range == (0.5, 2)
+    assert stats.rhs_range == (1e-2, 8)
+    npt.assert_array_equal(stats.row_lengths, [0, 1, 1, 0, 1])
+    assert "3 rows, 4 columns, 7 nonzeros" in str(stats)
+
+    # the model as it was given, not as presolve reduced it
+    assert solver.solve().status == ilpy.SolverStatus.OPTIMAL
+    assert solver.stats().rows == 3
+
+    # rows added after stats() are counted on the next call
+    solver.add_constraint(X[0] - 3 * X[2] == 2)
+    stats = solver.stats()
+    assert (stats.rows, stats.nnz, stats.relations[ilpy.Equal]) == (4, 9, 1)
+    npt.assert_array_equal(stats.row_lengths, [0, 1, 2, 0, 1])
+
+    constraints = ilpy.Constraints()
+    constraints.add(X[0] >= 1)
+    solver.set_constraints(constraints)
+    assert (solver.stats().rows, solver.stats().nnz) == (1, 1)
+
+
+@pytest.mark.parametrize("preference", PREFS)
+@pytest.mark.parametrize("scaling", ["geometric", "equilibration"])
+def test_solve_scaled(preference: ilpy.Preference, scaling: str) -> None:
+    # x0 is measured in thousandths and x1 in thousands of their natural units
+    c = [-1e-3, -2e3, -1.5]
+    A_ub = [[1e-3, 1e3, 0], [-1e-3, 1e3, 0], [0, 1e3, 1]]
+    b_ub = [4, 2, 3.5]
+    kwargs = {
+        "A_ub": A_ub,
+        "b_ub": b_ub,
+        "bounds": (0, None),
+        "integrality": [0, 0, 1],
+        "preference": preference,
+    }
+    expected = ilpy.solve(c, **kwargs)
+    solution = ilpy.solve(c, scaling=scaling, **kwargs)  # type: ignore
+    assert solution.status == ilpy.SolverStatus.OPTIMAL
+    npt.assert_allclose(list(solution), [3500, 5e-4, 3], rtol=1e-6)
+    npt.assert_allclose(list(solution), list(expected), rtol=1e-6)
+    assert solution.get_value() == pytest.approx(-9)
+
+    solution = ilpy.solve(c, scaling=scaling, decompose=True, **kwargs)  # type: ignore
+    npt.assert_allclose(list(solution), [3500, 5e-4, 3], rtol=1e-6)
+
+
+def test_connected_components() -> None:
+    from ilpy._decomposition import connected_components
+
+    # 0-3-5 and 1-4, 2 on its own
+    labels = connected_components(6, np.array([5, 4, 0]), np.array([3, 1, 3]))
+    npt.assert_array_equal(labels, [0, 1, 2, 0, 1, 0])
+    # a long chain, given in reverse order
+    labels = connected_components(1000, np.arange(999, 0, -1), np.arange(998, -1, -1))
+    assert not labels.any()
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_presolve(preference: ilpy.Preference) -> None:
+    x = [Variable(f"x{i}", index=i) for i in range(5)]
+    constraints = [
+        x[0] <= 3.5,  # a bound, rounded to 3
+        2 * x[1] == 4,  # fixes x1
+        x[1] + x[2] <= 5,  # a bound on x2, once x1 is substituted
+        x[2] + x[3] <= 6,
+        x[2] + x[3] <= 4,  # the tightest of three duplicates
+        x[2] + x[3] <= 4,
+        ilpy.Constraint.from_coefficients(relation=ilpy.LessEqual, value=1),  # empty
+        x[3] - x[4] >= -2,
+    ]
+    objective = ilpy.quicksum(x).as_objective(ilpy.Maximize)
+    solutions = []
+    for presolve in (False, True):
+        solver = ilpy.Solver(
+            5,
+            ilpy.Integer,
+            preference=preference,
+            lower_bounds=0,
+            upper_bounds=10,
+            presolve=presolve,
+        )
+        solver.set_objective(objective)
+        for constraint in constraints:
+            solver.add_constraint(constraint)
+        solutions.append(solver.solve())
+    expected, solution = solutions
+    assert solution.status == ilpy.SolverStatus.OPTIMAL
+    assert solution.get_value() == pytest.approx(expected.get_value())
+    npt.assert_allclose(list(solution), [3, 2, 0, 4, 6], atol=1e-6)
+
+    stats = solver.presolve_stats
+    assert stats.rows == 8
+    assert (stats.singleton_rows, stats.empty_rows, stats.duplicate_rows) == (3, 1, 2)
+    assert stats.fixed_variables == 1
+    assert solver.native_model() is not None
+
+    # bounds implied by removed rows still apply
+    solver.set_variable_bounds(upper=20, indices=[0])
+    assert solver.solve()[0] == pytest.approx(3)
+    with pytest.raises(ValueError, match="presolve fixed"):
+        solver.set_variable_bounds(upper=1, indices=[1])
+
+    # presolve leaves infeasible rows to the backend
+    solver.add_constraint(x[0] >= 5)
+    assert solver.solve().status in (
+        ilpy.SolverStatus.INFEASIBLE,
+        ilpy.SolverStatus.INF_OR_UNBOUNDED,
+    )
+
+    # replacing the constraints drops what presolve derived from them
+    replacement = ilpy.Constraints()
+    replacement.add(x[0] - x[1] == 0)
+    solver.set_constraints(replacement)
+    npt.assert_allclose(list(solver.solve())[:2], [10, 10], atol=1e-6)
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_lazy_solution(preference: ilpy.Preference) -> None:
+    solver = ilpy.Solver(4, ilpy.Binary, preference=preference)
+    x = [Variable(f"x{i}", index=i) for i in range(4)]
+    solver.set_objective((x[0] - x[1] + x[2] - x[3]).as_objective())
+
+    solution = solver.solve(lazy=True)
+    assert len(solution.variable_values) == 4
+    assert solution[3] == pytest.approx(1)
+    npt.assert_allclose(solution.values([3, 0]), [1, 0], atol=1e-6)
+    indices, values = solution.nonzero(tol=0.5)
+    npt.assert_array_equal(indices, [1, 3])
+    npt.assert_allclose(values, [1, 1], atol=1e-6)
+
+    detached = solver.solve(lazy=True).detach()
+    stale = solver.solve(lazy=True)
+    solver.add_constraint(x[1] + x[3] <= 1)
+    with pytest.raises(RuntimeError, match="detach"):
+        stale.values()
+    npt.assert_allclose(list(detached), [0, 1, 0, 1], atol=1e-6)
+    # values fetched in full before the change remain available
+    npt.assert_allclose(np.asarray(solution), [0, 1, 0, 1], atol=1e-6)
+    assert solver.solve(lazy=True).nonzero(tol=0.5)[0].size == 1
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_compact_solution(preference: ilpy.Preference) -> None:
+    solver = ilpy.Solver(10, ilpy.Binary, preference=preference)
+    x = [Variable(f"x{i}", index=i) for i in range(10)]
+    solver.set_objective(ilpy.quicksum(x[i] if i % 3 else -x[i] for i in range(10)))
+
+    solution = solver.solve(compact=True)
+    assert isinstance(solution.variable_values, np.ndarray)
+    assert solution.variable_values.dtype == np.uint8
+    npt.assert_array_equal(solution.selected(), [0, 3, 6, 9])
+    packed = solution.as_binary(packed=True)
+    assert packed.nbytes == 2
+    npt.assert_array_equal(np.unpackbits(packed, count=10), solution.variable_values)
+
+    solver.set_variable_types(ilpy.Integer, indices=[0])
+    solver.set_variable_bounds(lower=-1, upper=2, indices=[0])
+    solution = solver.solve(compact=True)
+    assert solution.variable_values.dtype == np.int64
+    assert solution[0] == 2
+
+    # float solutions can be converted, with a tolerance check
+    solution = solver.solve()
+    npt.assert_array_equal(solution.as_integer(), [2, 0, 0, 1, 0, 0, 1, 0, 0, 1])
+    solution[1] = 0.4
+    with pytest.raises(ValueError, match="not integral"):
+        solution.as_integer()
+    with pytest.raises(ValueError, match="not binary"):
+        solver.solve().as_binary()
+
+    solver.set_variable_types(ilpy.Continuous, indices=[0])
+    with pytest.raises(ValueError, match="continuous"):
+        solver.solve(compact=True)
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_quadratic_matrix(preference: ilpy.Preference) -> None:
+    # minimize (x0 - 1)^2 + (x0 - x1)^2 = x @ Q @ x - 2 x0 + 1
+    obj = ilpy.Objective()
+    obj.set_quadratic_matrix(np.array([[2.0, -1.0], [-1.0, 1.0]]))
+    obj.set_coefficient(0, -2)
+    obj.set_constant(1)
+
+    solver = ilpy.Solver(
+        2, ilpy.Continuous, preference=preference, lower_bounds=0, upper_bounds=10
+    )
+    solver.set_objective(obj)
+    # x0 + x1 >= 3 given as a quadratic constraint with a zero-sum pair
+    constraint = ilpy.Constraint.from_coefficients(
+        {0: 1, 1: 1}, {(0, 1): 1.0, (1, 0): -1.0}, ilpy.GreaterEqual, 3
+    )
+    solver.add_constraint(constraint)
+    solution = solver.solve()
+    npt.assert_allclose(list(solution), [1.4, 1.6], atol=1e-3)
+    assert solution.get_value() == pytest.approx(0.2, abs=1e-4)
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_mirrored_quadratic_coefficients(preference: ilpy.Preference) -> None:
+    # a symmetric Q filled one entry at a time: x0 * x1 appears twice
+    objective = ilpy.Objective()
+    objective.set_quadratic_coefficient(0, 1, 1)
+    objective.set_quadratic_coefficient(1, 0, 1)
+    assert objective.get_quadratic_coefficients() == {(0, 1): 2}
+    solver = ilpy.Solver(
+        2, ilpy.Continuous, preference=preference, lower_bounds=1, upper_bounds=1
+    )
+    solver.set_objective(objective)
+    assert solver.solve().get_value() == pytest.approx(2)
+
+    # max x0 + x1 subject to 2 * x0 * x1 <= 1, in [0, 1]
+    constraint = ilpy.Constraint()
+    constraint.set_quadratic_coefficient(0, 1, 1)
+    constraint.set_quadratic_coefficient(1, 0, 1)
+    constraint.set_value(1)
+    solver = ilpy.Solver(
+        2, ilpy.Continuous, preference=preference, lower_bounds=0, upper_bounds=1
+    )
+    solver.set_objective((X[0] + X[1]).as_objective(ilpy.Maximize))
+    solver.add_constraint(constraint)
+    assert solver.solve().get_value() == pytest.approx(1.5, abs=1e-4)
+
+
+@pytest.mark.parametrize("preference", PREFS)
+def test_replace_quadratic_objective(preference: ilpy.Preference) -> None:
+    x = [Variable(f"x{i}", index=i) for i in range(2)]
+    solver = ilpy.Solver(
+        2, ilpy.Continuous, preference=preference, lower_bounds=-5, upper_bounds=5
+    )
+    solver.add_constraint(x[0] + x[1] == 2)
+
+    def squared_distance(target: float) -> Expression:
+        # (x0 - target)^2 + x1^2
+        return x[0] * x[0] - 2 * target * x[0] + target**2 + x[1] * x[1]
+
+    def sizes() -> tuple[int, int] | None:
+        if preference != ilpy.Preference.Scip:
+            return None
+        model = solver.native_model()
+        return model.getNVars(), model.getNConss()
+
+    solver.set_objective(squared_distance(3))
+    npt.assert_allclose(list(solver.solve()), [2.5, -0.5], atol=1e-3)
+    expected = sizes()
+    for target in range(3):
+        solver.set_objective(squared_distance(target))
+        npt.assert_allclose(
+            list(solver.solve()), [1 + target / 2, 1 - target / 2], atol=1e-3
+        )
+    assert sizes() == expected
+
+    # a linear objective drops the quadratic part, and can be replaced again
+    solver.set_objective(x[0] - x[1])
+    assert solver.solve().get_value() == pytest.approx(-8)
+    solver.set_objective(squared_distance(-1) + 1)
+    solution = solver.solve()
+    npt.assert_allclose(list(solution), [0.5, 1.5], atol=1e-3)
+    assert solution.get_value() == pytest.approx(5.5, abs=1e-3)
+    assert sizes() == expected
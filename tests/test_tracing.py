@@ -0,0 +1,64 @@
+import io
+import json
+
+import pytest
+
+import ilpy
+from ilpy.tracing import JsonLinesTracer, NoOpTracer, get_tracer, set_tracer
+
+
+def _records(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_lines_tracer() -> None:
+    stream = io.StringIO()
+    x = ilpy.Variable("x", index=0)
+    y = ilpy.Variable("y", index=1)
+
+    set_tracer(JsonLinesTracer(stream))
+    try:
+        solver = ilpy.Solver(2, ilpy.Integer, preference=ilpy.Scip)
+    finally:
+        set_tracer(None)
+    assert isinstance(get_tracer(), NoOpTracer)
+
+    solver.set_objective((x + y).as_objective(ilpy.Maximize))
+    solver.add_constraint(x + 2 * y <= 4)
+    solution = solver.solve()
+
+    records = {r["name"]: r for r in _records(stream)}
+    assert set(records) == {
+        "ilpy.Solver.__init__",
+        "ilpy.Solver.set_objective",
+        "ilpy.Solver.add_constraint",
+        "ilpy.Solver.solve",
+        "ilpy.scip.optimize",
+        "ilpy.scip.extract_solution",
+    }
+    assert records["ilpy.Solver.__init__"]["attributes"] == {
+        "backend": "scip",
+        "columns": 2,
+    }
+    assert records["ilpy.Solver.add_constraint"]["attributes"]["nnz"] == 2
+    solve = records["ilpy.Solver.solve"]
+    assert solve["attributes"]["status"] == solution.status.name
+    assert records["ilpy.scip.optimize"]["parent_id"] == solve["span_id"]
+    assert all(r["status"] == "ok" and r["duration"] >= 0 for r in records.values())
+
+    # disabling the tracer on the solver stops recording
+    solver.set_tracer(None)
+    solver.solve()
+    assert len(_records(stream)) == len(records)
+
+
+def test_span_records_errors() -> None:
+    stream = io.StringIO()
+    solver = ilpy.Solver(1, ilpy.Continuous, preference=ilpy.Scip)
+    solver.set_tracer(JsonLinesTracer(stream))
+    with pytest.raises(ValueError):
+        solver.add_constraint(ilpy.Variable("x") <= 1)  # no index
+
+    (record,) = _records(stream)
+    assert record["status"] == "error"
+    assert "must have an index" in record["error"]